@@ -6,13 +6,12 @@ from fastapi import Depends, HTTPException, status, Request, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from backend.fastapi_app.core.security import decode_jwt_token
-from backend.fastapi_app.db.postgres_db import PostgresDB
-from backend.fastapi_app.db.mongo_db import MongoDB
-from backend.fastapi_app.db.repos.device_repo import DeviceRepository
-from backend.fastapi_app.db.repos.assignment_repo import AssignmentRepository
-from backend.fastapi_app.services.device_service import DeviceService
-from backend.fastapi_app.services.admin_service import AdminService
-from backend.fastapi_app.services.auth_service import AuthService
+from backend.fastapi_app.db.repos.device_repo import AsyncDeviceRepository
+from backend.fastapi_app.services.device_service import AsyncDeviceService
+from backend.fastapi_app.services.admin_service import AsyncAdminService
+from backend.fastapi_app.services.auth_service import AsyncAuthService
+from backend.fastapi_app.services.attendance_service import AsyncAttendanceService
+from backend.fastapi_app.services.gallery_service import AsyncGalleryService
 
 bearer_scheme = HTTPBearer(auto_error=False)
 logger = logging.getLogger(__name__)
@@ -42,25 +41,37 @@ def get_device_service(
     pg = Depends(get_postgres),
     mg = Depends(get_mongo),
 ):
-    return DeviceService(pg, mg)
+    return AsyncDeviceService(pg, mg)
 
 
 def get_admin_service(
     pg = Depends(get_postgres),
     mg = Depends(get_mongo),
 ):
-    return AdminService(pg, mg)
+    return AsyncAdminService(pg, mg)
 
 
 def get_auth_service(
     pg = Depends(get_postgres),
     mg = Depends(get_mongo),
 ):
-    return AuthService(pg, mg)
+    return AsyncAuthService(pg, mg)
 
 
-def admin_required(creds: HTTPAuthorizationCredentials = 
-                   Depends(bearer_scheme)) -> Dict[str, Any]:
+def get_attendance_service(
+    mg = Depends(get_mongo),
+):
+    return AsyncAttendanceService(mg)
+
+
+def get_gallery_service(
+    pg = Depends(get_postgres),
+):
+    return AsyncGalleryService(pg)
+
+
+async def admin_required(creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+                         pg = Depends(get_postgres)) -> Dict[str, Any]:
     """
     FastAPI dependency that:
       1) extracts Bearer token
@@ -104,28 +115,14 @@ def admin_required(creds: HTTPAuthorizationCredentials =
             detail="Invalid token: missing employee id"
         )
     
-    # validate admin in Postgres
-    pg = PostgresDB()
-
+    # validate admin in Postgres (pooled connection, returned automatically)
     try:
-        row = pg.get_user_status(employee_id)
+        row = await pg.get_user_status(employee_id)
     except Exception:
-        # close connection and re-raise as 500
-        try:
-            pg.cursor.close()
-            pg.conn.close()
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-                detail="Database error while verifying admin"
-            )
-    finally:
-        # cleanup connection
-        try:
-            pg.cursor.close()
-            pg.conn.close()
-        except Exception:
-            pass
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail="Database error while verifying admin"
+        )
 
     if not row:
         raise HTTPException(
@@ -145,9 +142,66 @@ def admin_required(creds: HTTPAuthorizationCredentials =
     return claims
 
 
-def operator_required(
+async def device_required(
+    pg = Depends(get_postgres),
+    mg = Depends(get_mongo),
+    x_device_uuid: Optional[str] = Header(None, alias="X-Device-UUID"),
+    x_device_token: Optional[str] = Header(None, alias="X-Device-Token")
+) -> Dict[str, Any]:
+    """
+    Device-only authentication (no operator session), for calls a kiosk makes
+    before anyone logs in, e.g. downloading the face gallery.
+
+    Returns {"device_id", "device_uuid", "assigned_site"}.
+    """
+    if not x_device_uuid or not x_device_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Device headers missing (X-device_UUID '/ X-Device_Token)"
+        )
+
+    device_repo = AsyncDeviceRepository(pg)
+    device_service = AsyncDeviceService(pg, mg)
+
+    try:
+        device_row = await device_repo.get_auth_by_uuid(x_device_uuid)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error while validating device"
+        )
+
+    if not device_row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Device not found"
+        )
+
+    if device_row.status != "active":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Device not active"
+        )
+
+    ok = await device_service.verify_device_credential(device_row.device_id, x_device_uuid,
+                                                       device_row.credential_hash, x_device_token)
+    if not ok:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid device token"
+        )
+
+    return {
+        "device_id": device_row.device_id,
+        "device_uuid": x_device_uuid,
+        "assigned_site": device_row.assigned_site
+    }
+
+
+async def operator_required(
     creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    request: Request = None,
+    pg = Depends(get_postgres),
+    mg = Depends(get_mongo),
     x_device_uuid: Optional[str] = Header(None, alias="X-Device-UUID"),
     x_device_token: Optional[str] = Header(None, alias="X-Device-Token")
 ) -> Dict[str, Any]:
@@ -209,55 +263,48 @@ def operator_required(
             detail="Invalid session token: missing employee_id"
         )
     
-    # 3) Validate device row and status
-    device_repo = DeviceRepository()
-    device_service = DeviceService()
-    assignment_repo = AssignmentRepository()
-    pg = PostgresDB()
+    # 3) One query for device status + credential hash, operator state and assignment
+    device_repo = AsyncDeviceRepository(pg)
+    device_service = AsyncDeviceService(pg, mg)
 
-    device_row = device_repo.get_by_uuid(x_device_uuid)
-    if not device_row:
+    try:
+        auth_row = await device_repo.get_operator_auth_context(x_device_uuid, employee_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error while validating operator"
+        )
+
+    if not auth_row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Device not found"
         )
     
-    if device_row.get("status") != "active":
+    if auth_row.get("device_status") != "active":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Device not active"
         )
     
-    # validate device token (bcrypt compare). DeviceService handles logging.
-    ok = device_service.validate_device_token(x_device_uuid, x_device_token)
+    # validate device token (bcrypt compare) against the hash we already hold
+    device_id = auth_row.get("device_id")
+    ok = await device_service.verify_device_credential(device_id, x_device_uuid,
+                                                       auth_row.get("credential_hash"), x_device_token)
     if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid device token"
         )
     
-    # 4) Validate operator exists & is active in Postgres
-    try:
-        user_row = pg.get_user_status(employee_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error while validating operator"
-        )
-    finally:
-        try:
-            pg.cursor.close()
-            pg.conn.close()
-        except Exception as e:
-            logger.exception(f"Failed to close the postgres connection: {e}")
-
-    if not user_row:
+    # 4) Validate operator exists & is active
+    if auth_row.get("user_active") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Operator user not found"
         )
     
-    if not user_row.get("is_active", False):
+    if not auth_row.get("user_active"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Operator account is not active"
@@ -265,7 +312,6 @@ def operator_required(
         
     # 5) Ensure the session tokens's device_id (if present) matches this device_id
     session_device_id = session_claims.get("device_id")
-    device_id = device_row.get("device_id")
     if session_device_id is not None and int(session_device_id) != int(device_id):
         # possible token misuse / bound-to-different-device
         raise HTTPException(
@@ -274,16 +320,16 @@ def operator_required(
         )
     
     # 6) Check assingment: employee must be assigned to device
-    assigned = assignment_repo.is_user_assigned_to_device(employee_id, device_id)
-    if not assigned:
+    if not auth_row.get("is_assigned"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Operator not assigned to this device"
         )
     
     # 7) All checks passed: rerun consolidated claims (attach username too)
-    session_claims["username"] = user_row.get("username")
+    session_claims["username"] = auth_row.get("username")
     session_claims["device_id"] = device_id
     session_claims["device_uuid"] = x_device_uuid
+    session_claims["assigned_site"] = auth_row.get("assigned_site")
 
     return SimpleNamespace(**session_claims)
@@ -1,50 +1,132 @@
 # fastapi_app/api/v1/admin_devices.py
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Response
+from typing import List, Dict, Any, Optional
 from backend.fastapi_app.api.deps import admin_required
-from backend.fastapi_app.services.admin_service import AdminService
-from backend.fastapi_app.schemas.provisioning import PendingDeviceDTO, AssignRequestDTO
+from backend.fastapi_app.services.admin_service import AsyncAdminService
+from backend.fastapi_app.schemas.provisioning import (
+    PendingDeviceDTO, AssignRequestDTO, BulkDeviceActionDTO, BulkAssignRequestDTO, BulkResultDTO
+)
 from backend.fastapi_app.api.deps import get_admin_service
 
 router = APIRouter(prefix="/api/v1/admin/devices", tags=["admin_devices"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @router.get("/pending", response_model=List[PendingDeviceDTO], dependencies=[Depends(admin_required)])
-def list_pending_devices(svc: AdminService = Depends(get_admin_service)):
+async def list_pending_devices(response: Response,
+                               limit: int = Query(100, ge=1, le=500),
+                               cursor: Optional[str] = Query(None, description="opaque token from X-Next-Cursor"),
+                               site: Optional[str] = None,
+                               svc: AsyncAdminService = Depends(get_admin_service)):
     """
-    Return a list of devices with status = 'pending'
+    Return one page of devices with status = 'pending', newest first.
+    When more rows exist the next-page token is returned in the X-Next-Cursor header.
     """
     try:
-        rows = svc.list_pending_devices(limit=100)
-        return rows
+        rows, next_cursor = await svc.list_pending_devices(limit=limit, cursor=cursor, site=site)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch pending devices"
         )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
 
 
 @router.get("/list", dependencies=[Depends(admin_required)])
-def get_all_devices(svc: AdminService = Depends(get_admin_service)):
+async def get_all_devices(response: Response,
+                          limit: int = Query(100, ge=1, le=500),
+                          cursor: Optional[str] = Query(None, description="opaque token from X-Next-Cursor"),
+                          device_status: Optional[str] = Query(None, alias="status"),
+                          site: Optional[str] = None,
+                          svc: AsyncAdminService = Depends(get_admin_service)):
     try:
-        device_list = svc.list_all_devices(limit=100)
-        if not device_list:
+        device_list, next_cursor = await svc.list_all_devices(limit=limit, cursor=cursor,
+                                                              status=device_status, site=site)
+        if not device_list and not cursor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Devices not found"
             )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return device_list
     except HTTPException:
         raise
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch devices")
     
 
+# Bulk routes are declared before the /{device_id} routes so "bulk" is never parsed as an id.
+
+@router.post("/bulk/approve", response_model=BulkResultDTO)
+async def bulk_approve_devices(payload: BulkDeviceActionDTO, claims: Dict[str, Any] = Depends(admin_required),
+                               svc: AsyncAdminService = Depends(get_admin_service)):
+    """
+    Approve many devices in one transaction. Reports an outcome per device:
+    approved | already_active | not_found.
+    """
+    try:
+        return await svc.bulk_approve_devices(payload.device_ids, claims.get("employee_id"))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to approve devices"
+        )
+
+
+@router.post("/bulk/reject", response_model=BulkResultDTO)
+async def bulk_reject_devices(payload: BulkDeviceActionDTO, claims: Dict[str, Any] = Depends(admin_required),
+                              svc: AsyncAdminService = Depends(get_admin_service)):
+    """
+    Reject pending / revoke active devices in one transaction. Outcome per device:
+    rejected | revoked | invalid_state | not_found.
+    """
+    try:
+        return await svc.bulk_reject_devices(payload.device_ids, claims.get("employee_id"))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to reject devices"
+        )
+
+
+@router.post("/bulk/assign", response_model=BulkResultDTO)
+async def bulk_assign_users(payload: BulkAssignRequestDTO, claims: Dict[str, Any] = Depends(admin_required),
+                            svc: AsyncAdminService = Depends(get_admin_service)):
+    """
+    Assign employees to many devices in one statement.
+    Payload: { "assignments": [ {"device_id": 1, "employee_ids": [2, 3]}, ... ] }
+    Outcome per pair: assigned | already_assigned | device_not_found | employee_not_found.
+    """
+    try:
+        return await svc.bulk_assign_users([a.model_dump() for a in payload.assignments],
+                                           assigned_by=claims.get("employee_id"))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to assign employees to devices"
+        )
+
+
 @router.get("/{device_id}", dependencies=[Depends(admin_required)])
-def get_device_details(device_id: int = Path(..., gt=0), svc: AdminService = Depends(get_admin_service)):
+async def get_device_details(device_id: int = Path(..., gt=0), svc: AsyncAdminService = Depends(get_admin_service)):
     try:
-        details = svc.get_device_details(device_id)
+        details = await svc.get_device_details(device_id)
         if not details:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -60,15 +142,15 @@ def get_device_details(device_id: int = Path(..., gt=0), svc: AdminService = Dep
     
 
 @router.post("/{device_id}/approve", dependencies=[Depends(admin_required)])
-def approve_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required), 
-                   svc: AdminService = Depends(get_admin_service)):
+async def approve_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required), 
+                   svc: AsyncAdminService = Depends(get_admin_service)):
     """
     Admin approves device. Approval sets status = 'active'.
     Token issuance is deferred to device fetch (DeviceService.fetch_credential will create token once).
     """
     approver_employee_id = claims.get("employee_id")
     try:
-        ok = svc.approve_device(device_id, approver_employee_id)
+        ok = await svc.approve_device(device_id, approver_employee_id)
         if not ok:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -84,10 +166,10 @@ def approve_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = De
     
 
 @router.post("/{device_id}/reject", dependencies=[Depends(admin_required)])
-def reject_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required),
-                  svc: AdminService = Depends(get_admin_service)):
+async def reject_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required),
+                  svc: AsyncAdminService = Depends(get_admin_service)):
     try:
-        device_status = svc.reject_device(device_id, claims.get("employee_id"))
+        device_status = await svc.reject_device(device_id, claims.get("employee_id"))
         if not device_status:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -107,10 +189,10 @@ def reject_device(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Dep
     
 
 @router.post("/{device_id}/force-reset-token", dependencies=[Depends(admin_required)])
-def force_reset_token(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required),
-                      svc: AdminService = Depends(get_admin_service)):
+async def force_reset_token(device_id: int = Path(..., gt=0), claims: Dict[str, Any] = Depends(admin_required),
+                      svc: AsyncAdminService = Depends(get_admin_service)):
     try:
-        ok = svc.force_reset_token(device_id, claims.get("employee_id"))
+        ok = await svc.force_reset_token(device_id, claims.get("employee_id"))
         if not ok:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -130,9 +212,9 @@ def force_reset_token(device_id: int = Path(..., gt=0), claims: Dict[str, Any] =
     
 
 @router.post("/{device_id}/assign", dependencies=[Depends(admin_required)])
-def assign_users(device_id: int = Path(..., gt=0), payload: AssignRequestDTO = None,
+async def assign_users(device_id: int = Path(..., gt=0), payload: AssignRequestDTO = None,
                  claims: Dict[str, Any] = Depends(admin_required), 
-                 svc: AdminService = Depends(get_admin_service)):
+                 svc: AsyncAdminService = Depends(get_admin_service)):
     """
     Assign one or more operator employees to a device.
     Payload: { "employee_ids": [1,2,3] }
@@ -144,7 +226,7 @@ def assign_users(device_id: int = Path(..., gt=0), payload: AssignRequestDTO = N
         )
     
     try:
-        res = svc.assign_users(device_id, payload.employee_ids, assigned_by=claims.get("employee_id"))
+        res = await svc.assign_users(device_id, payload.employee_ids, assigned_by=claims.get("employee_id"))
         return res
     except Exception:
         raise
@@ -0,0 +1,47 @@
+# backend/fastapi_app/api/v1/admin_employees.py
+from fastapi import APIRouter, Depends, HTTPException, status, Path
+from backend.fastapi_app.api.deps import admin_required, get_gallery_service
+from backend.fastapi_app.services.gallery_service import AsyncGalleryService
+from backend.fastapi_app.schemas.employees import EmployeeSitesDTO, EmployeeSitesResponseDTO
+
+router = APIRouter(prefix="/api/v1/admin/employees", tags=["admin_employees"])
+
+
+@router.get("/{employee_id}/sites", response_model=EmployeeSitesResponseDTO,
+            dependencies=[Depends(admin_required)])
+async def get_employee_sites(employee_id: int = Path(..., ge=1),
+                             svc: AsyncGalleryService = Depends(get_gallery_service)):
+    """
+    Sites whose kiosks include this employee in their gallery (empty = all sites).
+    """
+    try:
+        sites = await svc.get_employee_sites(employee_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch employee sites"
+        )
+    return EmployeeSitesResponseDTO(employee_id=employee_id, sites=sites)
+
+
+@router.put("/{employee_id}/sites", response_model=EmployeeSitesResponseDTO,
+            dependencies=[Depends(admin_required)])
+async def set_employee_sites(payload: EmployeeSitesDTO, employee_id: int = Path(..., ge=1),
+                             svc: AsyncGalleryService = Depends(get_gallery_service)):
+    """
+    Replace the employee's site list. Kiosks pick the change up on their next
+    gallery sync (the employee's gallery revision is bumped by a trigger).
+    """
+    try:
+        sites = await svc.set_employee_sites(employee_id, payload.sites)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update employee sites"
+        )
+    if sites is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    return EmployeeSitesResponseDTO(employee_id=employee_id, sites=sites)
@@ -0,0 +1,26 @@
+# backend/fastapi_app/api/v1/attendance.py
+from fastapi import Depends, APIRouter, HTTPException, status
+from backend.fastapi_app.schemas.attendance import AttendanceBatchRequestDTO, AttendanceBatchResultDTO
+from backend.fastapi_app.services.attendance_service import AsyncAttendanceService
+from backend.fastapi_app.api.deps import get_attendance_service, operator_required
+
+router = APIRouter(prefix="/api/v1/attendance", tags=["attendance"])
+
+
+@router.post("/batch", response_model=AttendanceBatchResultDTO)
+async def ingest_attendance_batch(payload: AttendanceBatchRequestDTO, claims = Depends(operator_required),
+                                  svc: AsyncAttendanceService = Depends(get_attendance_service)):
+    """
+    Kiosks flush buffered punches here (one request per flush).
+    Punches already recorded for (employee, date) are counted as duplicates, not errors,
+    so a kiosk can safely resend a batch after a timeout.
+    """
+    try:
+        return await svc.ingest_batch(payload.records, device_id=claims.device_id,
+                                      device_uuid=claims.device_uuid, operator_id=claims.employee_id,
+                                      site=claims.assigned_site)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to record attendance batch"
+        )
@@ -4,14 +4,14 @@ from backend.fastapi_app.schemas.auth import (
     AdminLoginRequest, AdminLoginResponse, OperatorLoginRequest,
     OperatorLoginResponse
 )
-from backend.fastapi_app.services.auth_service import AuthService
+from backend.fastapi_app.services.auth_service import AsyncAuthService
 from backend.fastapi_app.api.deps import get_auth_service
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
 @router.post("/admin/login", response_model=AdminLoginResponse)
-def admin_login(req: AdminLoginRequest, svc: AuthService = Depends(get_auth_service)):
-    token = svc.admin_login(req.username, req.password)
+async def admin_login(req: AdminLoginRequest, svc: AsyncAuthService = Depends(get_auth_service)):
+    token = await svc.admin_login(req.username, req.password)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
                             detail="Invalid credentials")
@@ -19,8 +19,8 @@ def admin_login(req: AdminLoginRequest, svc: AuthService = Depends(get_auth_serv
 
 
 @router.post("/operator/login", response_model=OperatorLoginResponse)
-def operator_login(req: OperatorLoginRequest, svc: AuthService = Depends(get_auth_service)):
-    res = svc.operator_login(req.device_uuid, req.device_token, 
+async def operator_login(req: OperatorLoginRequest, svc: AsyncAuthService = Depends(get_auth_service)):
+    res = await svc.operator_login(req.device_uuid, req.device_token, 
                                    req.username, req.password)
     if not res:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
@@ -1,22 +1,26 @@
 # fastapi_app/api/v1/devices.py
-from fastapi import Depends, APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import Depends, APIRouter, HTTPException, Header, Query, Response, status
 from backend.fastapi_app.schemas.provisioning import (
     RegisterRequestDTO, DeviceStatusDTO, FetchCredentialRequestDTO, TokenDTO
 )
-from backend.fastapi_app.services.device_service import DeviceService
+from backend.fastapi_app.services.device_service import AsyncDeviceService, status_etag
 from backend.fastapi_app.api.deps import get_device_service
 
 router = APIRouter(prefix="/api/v1/devices", tags=["devices"])
 
+# Kept below common proxy/load-balancer idle timeouts (60s).
+LONG_POLL_MAX_SECONDS = 55
+
 
 @router.post("/register-request", status_code=status.HTTP_201_CREATED)
-def register_request(payload: RegisterRequestDTO, svc: DeviceService = Depends(get_device_service)):
+async def register_request(payload: RegisterRequestDTO, svc: AsyncDeviceService = Depends(get_device_service)):
     """
     Device first-run: create or update a pending register-request.
     Returns a minimal acknowledgment; device should poll /status.
     """
     try:
-        device_record = svc.register_request(payload)
+        device_record = await svc.register_request(payload)
         return {
             "status": device_record.get("status", "pending"),
             "device_uuid": device_record.get("device_uuid"),
@@ -30,29 +34,72 @@ def register_request(payload: RegisterRequestDTO, svc: DeviceService = Depends(g
         )
     
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _conditional_status(dto: DeviceStatusDTO, if_none_match: Optional[str]):
+    """
+    Attach the ETag; answer 304 with no body if the device already has this version.
+    """
+    etag = status_etag(dto)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=dto.model_dump_json(), media_type="application/json", headers=headers)
+
+
 @router.get("/status/{device_uuid}", response_model=DeviceStatusDTO)
-def get_status(device_uuid: str, svc: DeviceService = Depends(get_device_service)):
+async def get_status(device_uuid: str,
+                     if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+                     svc: AsyncDeviceService = Depends(get_device_service)):
     """
     Device polls this endpoint to check approval status.
+    Send the last ETag in If-None-Match to get an empty 304 while nothing changed.
     """
     try:
-        status_dto = svc.get_status(device_uuid)
-        return status_dto
+        status_dto = await svc.get_status(device_uuid)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch device status"
         )
-    
+    return _conditional_status(status_dto, if_none_match)
+
+
+@router.get("/status/{device_uuid}/wait", response_model=DeviceStatusDTO)
+async def wait_for_status(device_uuid: str,
+                          since: Optional[str] = Query(None, description="last status the device saw"),
+                          timeout: float = Query(30, gt=0, le=LONG_POLL_MAX_SECONDS),
+                          if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+                          svc: AsyncDeviceService = Depends(get_device_service)):
+    """
+    Long-poll variant of /status. Returns immediately if the status differs from
+    `since`, otherwise holds the request until an admin changes it or `timeout`
+    elapses, then returns the current status. Devices loop on this instead of
+    polling /status on a fixed interval. Honors If-None-Match like /status.
+    """
+    try:
+        status_dto = await svc.wait_for_status_change(device_uuid, since, timeout)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch device status"
+        )
+    return _conditional_status(status_dto, if_none_match)
+
 
 @router.post("/fetch-credential", response_model=TokenDTO)
-def fetch_credential(payload: FetchCredentialRequestDTO, svc: DeviceService = Depends(get_device_service)):
+async def fetch_credential(payload: FetchCredentialRequestDTO, svc: AsyncDeviceService = Depends(get_device_service)):
     """
     Device calls this once /status returns active. This returns a plaintext token once,
     and subsequent calls are rejected. Service handles token generation/storage.
     """
     try:
-        token_dto = svc.fetch_credential(str(payload.device_uuid))
+        token_dto = await svc.fetch_credential(str(payload.device_uuid))
         if not token_dto:
             # fetch failed (not active, or already delivered or device missing)
             raise HTTPException(
@@ -0,0 +1,83 @@
+# backend/fastapi_app/api/v1/gallery.py
+import hashlib
+from typing import Any, Dict, Optional
+from fastapi import Depends, APIRouter, HTTPException, Header, Query, Response, status
+from backend.fastapi_app.services.gallery_service import AsyncGalleryService
+from backend.fastapi_app.api.deps import get_gallery_service, device_required
+from desktop_app.utils.gallery_codec import MEDIA_TYPE, DTYPES, compress
+
+router = APIRouter(prefix="/api/v1/gallery", tags=["gallery"])
+
+GALLERY_REVISION_HEADER = "X-Gallery-Revision"
+GALLERY_ENCODING_HEADER = "X-Gallery-Encoding"
+GALLERY_SCOPE_HEADER = "X-Gallery-Scope"
+
+
+def _scope_token(site: Optional[str]) -> str:
+    # opaque per-site token; "*" = unscoped kiosk
+    if site is None:
+        return "*"
+    return hashlib.sha1(site.encode("utf-8")).hexdigest()[:12]
+
+
+def _gallery_etag(revision: int, dtype: str, scope: str) -> str:
+    return f'W/"gallery-{revision}-{dtype}-{scope}"'
+
+
+@router.get("")
+async def get_gallery(response: Response,
+                      since: Optional[int] = Query(None, ge=0, description="revision the kiosk already holds"),
+                      dtype: str = Query("float32", description="float32 | float16"),
+                      compression: str = Query("none", description="none | zstd"),
+                      scope: Optional[str] = Query(None, description="X-Gallery-Scope of the held gallery"),
+                      if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+                      device: Dict[str, Any] = Depends(device_required),
+                      svc: AsyncGalleryService = Depends(get_gallery_service)):
+    """
+    Face-encoding gallery as a binary blob (desktop_app.utils.gallery_codec format),
+    restricted to employees allowed at the calling device's assigned_site.
+    Without `since` the full gallery is returned; with it, only entries changed after
+    that revision plus the ids removed since. If-None-Match with the last ETag returns
+    304 when nothing changed. If the device's site changed (`scope` differs from the
+    current X-Gallery-Scope) a full gallery is returned regardless of `since`.
+    """
+    if dtype not in DTYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="dtype must be float32 or float16")
+    if compression not in ("none", "zstd"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="compression must be none or zstd")
+
+    try:
+        revision = await svc.current_revision()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read gallery revision"
+        )
+
+    site = device.get("assigned_site") or None
+    current_scope = _scope_token(site)
+    if since is not None and scope != current_scope:
+        since = None
+
+    etag = _gallery_etag(revision, dtype, current_scope)
+    headers = {"ETag": etag, GALLERY_REVISION_HEADER: str(revision), GALLERY_SCOPE_HEADER: current_scope,
+               "Cache-Control": "no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        blob = await svc.get_gallery_blob(revision, since, dtype, site=site)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build gallery"
+        )
+
+    headers[GALLERY_ENCODING_HEADER] = "identity"
+    if compression == "zstd":
+        packed = compress(blob)
+        if packed is not None:
+            blob = packed
+            headers[GALLERY_ENCODING_HEADER] = "zstd"
+
+    return Response(content=blob, media_type=MEDIA_TYPE, headers=headers)
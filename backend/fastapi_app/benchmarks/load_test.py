@@ -0,0 +1,94 @@
+# backend/fastapi_app/benchmarks/load_test.py
+# Closed-loop load generator for the two hottest device-facing endpoints.
+#
+# Run the API (e.g. `uvicorn backend.fastapi_app.main:app --workers 1`) on the commit
+# you want to measure, then:
+#
+#   python -m backend.fastapi_app.benchmarks.load_test --base-url http://127.0.0.1:8000 \
+#       --device-uuid <uuid> --device-token <token> --username <op> --password <pw>
+#
+# Compare req/s between the sync build (previous commit) and the async build by running
+# the same command against each. Requires a provisioned device + assigned operator.
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, Awaitable, List
+
+import httpx
+
+
+async def _drive(name: str, make_request: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+                 client: httpx.AsyncClient, concurrency: int, duration: float) -> None:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                resp = await make_request(client)
+                if resp.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"{name}: no successful requests ({errors} errors)")
+        return
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"{name}: {len(latencies) / elapsed:8.1f} req/s | "
+        f"ok={len(latencies)} errors={errors} | "
+        f"p50={statistics.median(latencies) * 1000:.1f}ms p95={p95 * 1000:.1f}ms"
+    )
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        status_path = f"/api/v1/devices/status/{args.device_uuid}"
+        await _drive(
+            "GET  /devices/status",
+            lambda c: c.get(status_path),
+            client, args.concurrency, args.duration
+        )
+
+        login_body = {
+            "device_uuid": args.device_uuid,
+            "device_token": args.device_token,
+            "username": args.username,
+            "password": args.password,
+        }
+        await _drive(
+            "POST /auth/operator/login",
+            lambda c: c.post("/api/v1/auth/operator/login", json=login_body),
+            client, args.concurrency, args.duration
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test device status + operator login")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--device-uuid", required=True)
+    parser.add_argument("--device-token", required=True)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per endpoint")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backend/fastapi_app/benchmarks/operator_auth_bench.py
+# Compares the Postgres work done by operator_required before and after the
+# consolidated authorization query.
+#
+#   python -m backend.fastapi_app.benchmarks.operator_auth_bench \
+#       --device-uuid <uuid> --employee-id <id> [--iterations 2000] [--concurrency 16]
+#
+# "before" replays the old sequence (device row, device row again inside
+# validate_device_token, user status, assignment check = 4 round-trips);
+# "after" is the single OPERATOR_AUTH_QUERY. bcrypt and the Mongo audit write are
+# identical in both paths and are left out so the numbers isolate the DB lookups.
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from backend.fastapi_app.db.async_postgres_db import AsyncPostgresDB
+
+
+async def _before(pg: AsyncPostgresDB, device_uuid: str, employee_id: int) -> bool:
+    device = await pg.get_device_by_uuid(device_uuid)
+    if not device or device.get("status") != "active":
+        return False
+    device = await pg.get_device_by_uuid(device_uuid)
+    user = await pg.get_user_status(employee_id)
+    if not user or not user.get("is_active"):
+        return False
+    return await pg.is_employee_assigned_to_device(device["device_id"], employee_id)
+
+
+async def _after(pg: AsyncPostgresDB, device_uuid: str, employee_id: int) -> bool:
+    row = await pg.get_operator_auth_context(device_uuid, employee_id)
+    return bool(row and row["device_status"] == "active" and row["user_active"] and row["is_assigned"])
+
+
+async def _measure(name: str, fn: Callable[[], Awaitable[bool]], iterations: int, concurrency: int) -> None:
+    latencies: List[float] = []
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            if not await fn():
+                raise RuntimeError(f"{name}: authorization failed; check --device-uuid/--employee-id")
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"{name}: {len(latencies) / elapsed:8.1f} checks/s | "
+        f"p50={statistics.median(latencies) * 1000:.2f}ms p95={p95 * 1000:.2f}ms"
+    )
+
+
+async def run(args) -> None:
+    pg = AsyncPostgresDB()
+    await pg.open()
+    try:
+        # warm the pool so connection setup is not counted
+        await _after(pg, args.device_uuid, args.employee_id)
+        await _measure("before (4 queries)",
+                       lambda: _before(pg, args.device_uuid, args.employee_id),
+                       args.iterations, args.concurrency)
+        await _measure("after  (1 query)  ",
+                       lambda: _after(pg, args.device_uuid, args.employee_id),
+                       args.iterations, args.concurrency)
+    finally:
+        await pg.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark operator authorization DB lookups")
+    parser.add_argument("--device-uuid", required=True)
+    parser.add_argument("--employee-id", type=int, required=True)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
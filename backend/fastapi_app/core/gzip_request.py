@@ -0,0 +1,84 @@
+# backend/fastapi_app/core/gzip_request.py
+"""
+ASGI middleware that inflates `Content-Encoding: gzip` request bodies.
+
+Starlette's GZipMiddleware only compresses responses; the desktop ApiClient also
+gzips large JSON uploads, so those are decompressed here before routing.
+"""
+import zlib
+from typing import List, Tuple
+
+# Refuse to inflate beyond this (guards against decompression bombs).
+MAX_INFLATED_BYTES = 16 * 1024 * 1024
+
+
+class GZipRequestMiddleware:
+    def __init__(self, app, max_inflated_bytes: int = MAX_INFLATED_BYTES):
+        self.app = app
+        self.max_inflated_bytes = max_inflated_bytes
+
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_gzipped(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            body = _inflate(b"".join(chunks), self.max_inflated_bytes)
+        except ValueError as e:
+            await _send_error(send, 413 if "too large" in str(e) else 400, str(e))
+            return
+
+        headers = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+        scope = dict(scope, headers=headers)
+
+        sent = False
+
+        async def inflated_receive():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, inflated_receive, send)
+
+
+def _is_gzipped(headers: List[Tuple[bytes, bytes]]) -> bool:
+    for name, value in headers:
+        if name == b"content-encoding":
+            return value.strip().lower() == b"gzip"
+    return False
+
+
+def _inflate(data: bytes, limit: int) -> bytes:
+    try:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body = decompressor.decompress(data, limit + 1)
+    except Exception as e:
+        raise ValueError("malformed gzip body") from e
+    if len(body) > limit or decompressor.unconsumed_tail:
+        raise ValueError("request body too large")
+    return body
+
+
+async def _send_error(send, status_code: int, detail: str):
+    payload = ('{"detail":"%s"}' % detail).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode("ascii"))],
+    })
+    await send({"type": "http.response.body", "body": payload})
@@ -0,0 +1,28 @@
+# backend/fastapi_app/core/pagination.py
+"""
+Opaque keyset-pagination tokens.
+
+A token is the urlsafe-base64 JSON of the last row's sort key
+(created_at, device_id). Clients must treat it as opaque and pass it back verbatim.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, device_id: int) -> str:
+    payload = json.dumps({"c": created_at.isoformat(), "id": int(device_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    """
+    Returns (created_at, device_id). Raises ValueError for malformed tokens.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["id"])
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
@@ -0,0 +1,107 @@
+# backend/fastapi_app/core/status_notifier.py
+"""
+Wakes long-polling devices when their provisioning status changes.
+
+Admin actions call `status_notifier.publish(device_uuid)`; the /devices/status/{uuid}/wait
+endpoint parks on `status_notifier.subscribe(device_uuid)` instead of re-querying Postgres.
+
+With a single worker the in-process wake-up is enough. With several workers enable
+DEVICE_STATUS_LISTEN in settings: publish() then also sends `pg_notify('device_status', uuid)`
+and each worker's listener task relays notifications to its own waiters.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+import psycopg
+
+from backend.fastapi_app.db.connection import get_pg_conninfo
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "device_status"
+LISTEN_RETRY_SECONDS = 5.0
+
+
+class DeviceStatusNotifier:
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+        self._listen_task: Optional[asyncio.Task] = None
+        self._pool = None
+
+
+    def subscribe(self, device_uuid: str) -> asyncio.Event:
+        """
+        Register before reading the current status so a change that lands in
+        between is not missed. Always pair with unsubscribe().
+        """
+        event = asyncio.Event()
+        self._waiters.setdefault(device_uuid, set()).add(event)
+        return event
+
+
+    def unsubscribe(self, device_uuid: str, event: asyncio.Event) -> None:
+        waiters = self._waiters.get(device_uuid)
+        if not waiters:
+            return
+        waiters.discard(event)
+        if not waiters:
+            del self._waiters[device_uuid]
+
+
+    def _wake(self, device_uuid: str) -> None:
+        for event in self._waiters.get(device_uuid, ()):
+            event.set()
+
+
+    async def publish(self, device_uuid: Optional[str]) -> None:
+        if not device_uuid:
+            return
+        self._wake(device_uuid)
+        if self._pool is None:
+            return
+        try:
+            async with self._pool.connection() as conn:
+                await conn.execute("SELECT pg_notify(%s, %s)", (CHANNEL, device_uuid))
+        except Exception as e:
+            logger.warning(f"pg_notify for device {device_uuid} failed: {e}")
+
+    # ----------------------------
+    # Cross-worker relay (optional)
+    # ----------------------------
+
+    async def start_listener(self, pool) -> None:
+        """
+        `pool` is the app's AsyncConnectionPool, used for NOTIFY. LISTEN needs its
+        own long-lived autocommit connection, so the listener opens one.
+        """
+        self._pool = pool
+        self._listen_task = asyncio.create_task(self._listen_forever())
+
+
+    async def stop_listener(self) -> None:
+        task, self._listen_task = self._listen_task, None
+        self._pool = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(get_pg_conninfo(), autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    async for notify in conn.notifies():
+                        self._wake(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"device_status listener dropped ({e}); reconnecting")
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+status_notifier = DeviceStatusNotifier()
@@ -0,0 +1,233 @@
+# backend/fastapi_app/db/async_mongo_db.py
+import logging
+from datetime import datetime, timedelta, timezone, time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from desktop_app.utils.utils import current_date_utc_midnight, current_datetime_utc
+from desktop_app.database.attendance_summary import (
+    SUMMARY_COLLECTION, failed_summaries, rollup_pipeline, summary_increments, summary_query
+)
+from backend.fastapi_app.schemas.provisioning import DeviceLogDTO
+from backend.fastapi_app.db.connection import get_async_mongo_client
+from backend.fastapi_app.db.event_logs import EVENT_LOGS
+from backend.fastapi_app.db.mongo_migrations import SCHEMA_COLLECTION, SCHEMA_ID
+from backend.fastapi_app.core.config import settings
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def _punch_key(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Upsert filter for one punch. Numeric ids also match their str form, which absentee
+    records and batches uploaded before ids were stored as ints carry.
+    """
+    employee_id = rec["employee"]["id"]
+    id_clause = {"$in": [employee_id, str(employee_id)]} if isinstance(employee_id, int) else employee_id
+    return {"employee.id": id_clause, "attendance.date": rec["attendance"]["date"]}
+
+
+class AsyncMongoDB:
+    """
+    asyncio variant of MongoDB built on pymongo's native AsyncMongoClient.
+    Same collections and document shapes as the sync class.
+    """
+    def __init__(self):
+        self.client = get_async_mongo_client()
+        self.db = self.client[settings.MONGO_DB]
+
+        self.attendance = self.db['logs']
+        self.device_logs = self.db['device_logs']
+        self.user_login_logs = self.db['user_login_logs']
+        self.daily_summary = self.db[SUMMARY_COLLECTION]
+
+
+    async def get_schema_version(self) -> int:
+        """
+        Indexes are applied by `manage migrate-mongo`; this only reads the recorded version.
+        """
+        doc = await self.db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_ID})
+        return int(doc.get("version", 0)) if doc else 0
+
+    # ----------------------------
+    # Attendance helpers
+    # ----------------------------
+
+    async def log_attendance(self, record: dict):
+        await self.attendance.insert_one(record)
+        await self.increment_daily_summary([record])
+        return True
+
+
+    async def upsert_attendance_bulk(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert-if-absent on (employee.id, attendance.date) for many records in one
+        unordered bulk_write. Existing punches are never overwritten ($setOnInsert),
+        so replays of the same batch are harmless.
+        Returns {"inserted", "duplicates", "errors": [{"index", "error"}]}.
+        """
+        if not records:
+            return {"inserted": 0, "duplicates": 0, "errors": []}
+
+        ops = [UpdateOne(_punch_key(rec), {"$setOnInsert": rec}, upsert=True) for rec in records]
+        try:
+            result = await self.attendance.bulk_write(ops, ordered=False)
+            await self.increment_daily_summary([records[i] for i in result.upserted_ids])
+            return {"inserted": result.upserted_count, "duplicates": result.matched_count, "errors": []}
+        except BulkWriteError as e:
+            details = e.details
+            await self.increment_daily_summary([records[u["index"]] for u in details.get("upserted", [])])
+            write_errors = details.get("writeErrors", [])
+            # two concurrent upserts for the same key: the loser gets 11000, i.e. a duplicate
+            dup_count = sum(1 for we in write_errors if we.get("code") == 11000)
+            errors = [
+                {"index": we.get("index"), "error": we.get("errmsg", "write error")}
+                for we in write_errors if we.get("code") != 11000
+            ]
+            return {
+                "inserted": details.get("nUpserted", 0),
+                "duplicates": details.get("nMatched", 0) + dup_count,
+                "errors": errors
+            }
+
+
+    async def increment_daily_summary(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add newly inserted punches to attendance_daily_summary.
+        Returns {"updated", "errors": [{"date", "department", "site", "error"}]}; a summary
+        listed in errors is short until rollup_daily_summary of its date recomputes it.
+        """
+        ops = summary_increments(records, current_datetime_utc())
+        if not ops:
+            return {"updated": 0, "errors": []}
+        try:
+            await self.daily_summary.bulk_write(ops, ordered=False)
+            return {"updated": len(ops), "errors": []}
+        except Exception as e:
+            errors = failed_summaries(records, e)
+            logger.warning(f"Daily summary increment failed, needs rollup_daily_summary: {errors}")
+            return {"updated": len(ops) - len(errors), "errors": errors}
+
+
+    async def rollup_daily_summary(self, start: datetime, end: Optional[datetime] = None) -> None:
+        """
+        Recompute the summaries of [start, end) (one day if end is None) from the logs.
+        """
+        end = end or start + timedelta(days=1)
+        await self.attendance.aggregate(rollup_pipeline(start, end))
+
+
+    async def get_daily_summary(self, start: datetime, end: Optional[datetime] = None,
+                                department: Optional[str] = None,
+                                site: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Per (date, department, site) counts for [start, end): total, present, absent, early, on_time, late.
+        """
+        cursor = self.daily_summary.find(summary_query(start, end, department, site), {"_id": 0})
+        cursor = cursor.sort([("date", 1), ("department", 1), ("site", 1)])
+        return await cursor.to_list(length=None)
+
+
+    async def check_valid_entry_for_date(self, employee_id, date_obj=None):
+        """
+        Returns True if an attendance record exists for the given employee_id and UTC date.
+        If date_obj is None, today's UTC midnight date is used.
+        """
+        if date_obj is None:
+            today_utc = current_date_utc_midnight()
+        elif isinstance(date_obj, str):
+            date_dt = datetime.fromisoformat(date_obj)
+            today_utc = datetime.combine(date_dt.date(), time(0, 0, 0, tzinfo=timezone.utc))
+        elif isinstance(date_obj, datetime):
+            today_utc = datetime.combine(date_obj.astimezone(timezone.utc).date(), time(0,0,0, tzinfo=timezone.utc))
+        else:
+            raise TypeError("date_obj must be None, str, or datetime")
+
+        exists = await self.attendance.find_one({
+            "employee.id": employee_id,
+            "attendance.date": today_utc
+        })
+        return bool(exists)
+
+    # ----------------------------
+    # Device logging
+    # ----------------------------
+
+    async def log_device_event(self, device_id:int, device_uuid: str, user_id:int, event_type: str,
+                               details: dict) -> bool:
+        dto = DeviceLogDTO(
+            device_id=device_id,
+            device_uuid=device_uuid,
+            user_id=user_id,
+            event_type=event_type,
+            details=details,
+            timestamp= current_datetime_utc()
+        )
+        await self.device_logs.insert_one(dto.to_mongo())
+        return True
+
+
+    async def log_device_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Write many audit events in one unordered insert_many (one round-trip per batch).
+        Each event has the log_device_event keyword arguments. Returns the inserted count.
+        """
+        if not events:
+            return 0
+        timestamp = current_datetime_utc()
+        docs = [
+            DeviceLogDTO(timestamp=timestamp, **event).to_mongo()
+            for event in events
+        ]
+        result = await self.device_logs.insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+
+
+    async def get_device_logs(self, device_id: int, limit: int= 100) -> List[Dict[str, Any]]:
+        """
+        Fetches recent device logs for a device, sorted by timestamp (desc),
+        without MongoDB internal fields like `_id`.
+        """
+        cursor = self.device_logs.find({"device.id": device_id}, {"_id": 0}).sort("timestamp", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+
+    async def get_device_log_hourly(self, device_id: int, start: datetime,
+                                    end: datetime) -> List[Dict[str, Any]]:
+        """
+        Hourly event counts of a device in [start, end), from the rollup kept after raw
+        device_logs expire (see db/event_logs.py).
+        """
+        hourly, _ = EVENT_LOGS["device_logs"]
+        cursor = self.db[hourly].find(
+            {"device_id": device_id, "hour": {"$gte": start, "$lt": end}}, {"_id": 0}
+        ).sort("hour", 1)
+        return await cursor.to_list(length=None)
+
+
+    async def log_user_login(self, user_id: int, username: str, device_id: Optional[int],
+                             device_uuid: Optional[str], outcome: str, meta: dict=None) -> bool:
+        doc = {
+            "user": {
+                "id": user_id,
+                "username": username
+            },
+            "device": {
+                "id": device_id,
+                "uuid": device_uuid
+            },
+            "outcome": outcome,
+            "meta": meta or {},
+            "timestamp": current_datetime_utc()
+        }
+        await self.user_login_logs.insert_one(doc)
+        return True
+
+
+    async def get_user_login_logs(self, user_id: int, limit: int=100):
+        cursor = self.user_login_logs.find({"user.id": user_id}).sort("timestamp", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,443 @@
+# backend/fastapi_app/db/async_postgres_db.py
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+from psycopg.rows import args_row
+from .connection import get_async_pg_pool
+from .postgres_db import (
+    build_device_listing_query, PENDING_DEVICE_COLUMNS, DEVICE_LIST_COLUMNS, ASSIGN_EMPLOYEES_QUERY,
+    OPERATOR_AUTH_QUERY, DEVICE_COLUMNS, USER_COLUMNS, DEVICE_AUTH_QUERY, DeviceAuthRow,
+    DEVICE_BY_UUID_QUERY, USER_STATUS_QUERY, EMPLOYEE_ASSIGNED_QUERY
+)
+from .prepared import PREPARED_STATEMENTS
+
+# auth/status lookups run on every device and operator request: always prepared.
+# The sample parameters are only used to EXPLAIN them for the plan-time metrics.
+_NO_DEVICE = "00000000-0000-0000-0000-000000000000"
+for _name, _query, _sample in (
+    ("device_auth", DEVICE_AUTH_QUERY, (_NO_DEVICE,)),
+    ("device_by_uuid", DEVICE_BY_UUID_QUERY, (_NO_DEVICE,)),
+    ("operator_auth", OPERATOR_AUTH_QUERY, {"employee_id": 0, "device_uuid": _NO_DEVICE}),
+    ("user_status", USER_STATUS_QUERY, (0,)),
+    ("employee_assigned", EMPLOYEE_ASSIGNED_QUERY, (0, 0)),
+):
+    PREPARED_STATEMENTS.register(_name, _query, _sample)
+
+
+class AsyncPostgresDB:
+    """
+    asyncio variant of PostgresDB used by the API routers.
+    Backed by a psycopg3 connection pool: every helper borrows a connection for
+    one statement (or one transaction), so concurrent requests never share a cursor.
+    SQL is kept identical to PostgresDB so both layers stay easy to compare.
+    """
+    def __init__(self):
+        self.pool = get_async_pg_pool()
+
+    async def open(self):
+        await self.pool.open()
+
+    async def close(self):
+        await self.pool.close()
+
+    # ----------------------------
+    # Low level helpers
+    # ----------------------------
+
+    async def fetchone(self, query: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cur = await self._execute(conn, query, params)
+            return await cur.fetchone()
+
+    async def fetchall(self, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cur = await self._execute(conn, query, params)
+            return await cur.fetchall()
+
+    @staticmethod
+    async def _execute(conn, query: str, params: Sequence[Any], cursor=None):
+        """
+        Execute on a pooled connection, preparing registered hot queries (see db/prepared.py).
+        """
+        target = cursor if cursor is not None else conn
+        cur = await target.execute(query, params, prepare=PREPARED_STATEMENTS.prepare_flag(query))
+        PREPARED_STATEMENTS.record(query, conn.info.backend_pid)
+        return cur if cursor is None else cursor
+
+    async def execute(self, query: str, params: Sequence[Any] = ()) -> None:
+        # pool.connection() commits on clean exit and rolls back on error
+        async with self.pool.connection() as conn:
+            await conn.execute(query, params)
+
+    # ----------------------------
+    # Devices helpers
+    # ----------------------------
+
+    async def add_device_registration(self, device_uuid: str, device_name: Optional[str]=None,
+                                      assigned_site: Optional[str]=None, app_version: Optional[str]=None,
+                                      os_version: Optional[str]=None, registered_by: Optional[int]=None) -> Optional[int]:
+        """
+        Insert a register-request row (status = pending). Returns device_id.
+        """
+        query = """
+        INSERT INTO devices (device_uuid, device_name, assigned_site, app_version, os_version,
+        registered_by, status, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, 'pending', now(), now())
+        RETURNING device_id;
+        """
+        row = await self.fetchone(query, (device_uuid, device_name, assigned_site, app_version,
+                                          os_version, registered_by))
+        return row['device_id'] if row else None
+
+
+    async def get_device_by_uuid(self, device_uuid: str) -> Optional[Dict]:
+        return await self.fetchone(DEVICE_BY_UUID_QUERY, (device_uuid,))
+
+
+    async def get_device_auth(self, device_uuid: str) -> Optional[DeviceAuthRow]:
+        """
+        Credential check columns of a device as a DeviceAuthRow, built straight from the
+        row values (no per-row dict).
+        """
+        async with self.pool.connection() as conn:
+            cur = conn.cursor(row_factory=args_row(DeviceAuthRow))
+            await self._execute(conn, DEVICE_AUTH_QUERY, (device_uuid,), cursor=cur)
+            return await cur.fetchone()
+
+
+    async def get_operator_auth_context(self, device_uuid: str, employee_id: int) -> Optional[Dict]:
+        """
+        Device, operator and assignment state for operator_required in a single query.
+        """
+        return await self.fetchone(OPERATOR_AUTH_QUERY,
+                                   {"device_uuid": device_uuid, "employee_id": employee_id})
+
+
+    async def get_device_by_id(self, device_id: int) -> Optional[Dict]:
+        query = f"SELECT {DEVICE_COLUMNS} FROM devices WHERE device_id = %s;"
+        return await self.fetchone(query, (device_id,))
+
+
+    async def set_device_credential(self, device_id: int, credential_hash: str, status: str='active',
+                                    device_name: Optional[str]=None, app_version: Optional[str]=None,
+                                    os_version: Optional[str]=None):
+        query = """
+        UPDATE devices
+        SET credential_hash = %s,
+            status = %s,
+            device_name = COALESCE(%s, device_name),
+            app_version = COALESCE(%s, app_version),
+            os_version = COALESCE(%s, os_version),
+            updated_at = now()
+        WHERE device_id = %s;
+        """
+        await self.execute(query, (credential_hash, status, device_name, app_version, os_version, device_id))
+
+
+    async def get_pending_devices(self, limit: int = 50, after: Optional[Tuple[datetime, int]] = None,
+                                  site: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return devices with status = 'pending', newest first, one keyset page at a time.
+        """
+        query, params = build_device_listing_query(PENDING_DEVICE_COLUMNS, limit, after,
+                                                   status="pending", site=site)
+        return await self.fetchall(query, params)
+
+
+    async def get_all_devices(self, limit: int = 100, after: Optional[Tuple[datetime, int]] = None,
+                              status: Optional[str] = None, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        query, params = build_device_listing_query(DEVICE_LIST_COLUMNS, limit, after,
+                                                   status=status, site=site)
+        return await self.fetchall(query, params)
+
+
+    async def clear_token(self, device_id: int) -> None:
+        """
+        Set credential_hash to NULL so device must fetch a new token after approval.
+        """
+        query = """
+            UPDATE devices
+            SET credential_hash = NULL, updated_at = now()
+            WHERE device_id = %s;
+        """
+        await self.execute(query, (device_id,))
+
+
+    async def update_device_status(self, device_id: int, status: str):
+        query = "UPDATE devices SET status = %s, updated_at = now() WHERE device_id = %s;"
+        await self.execute(query, (status, device_id))
+
+
+    async def touch_device_update_check(self, device_id: int):
+        query = "UPDATE devices SET last_update_check = now(), updated_at = now() WHERE device_id = %s;"
+        await self.execute(query, (device_id,))
+
+    # ----------------------------
+    # Device assignment helpers
+    # ----------------------------
+
+    async def assign_employee_to_device(self, device_id: int, employee_id: int,
+                                        assigned_by: Optional[int]=None) -> bool:
+        query = """
+        INSERT INTO device_assignments (device_id, employee_id, assigned_by)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (device_id, employee_id) DO NOTHING
+        RETURNING id;
+        """
+        row = await self.fetchone(query, (device_id, employee_id, assigned_by))
+        return bool(row)
+
+
+    async def assign_employees_to_device(self, device_id: int, employee_ids: List[int],
+                                         assigned_by: Optional[int]=None) -> List[int]:
+        """
+        Assign many employees in a single INSERT ... SELECT FROM UNNEST.
+        Returns the employee_ids that were newly assigned.
+        """
+        rows = await self.fetchall(ASSIGN_EMPLOYEES_QUERY, (device_id, assigned_by, list(employee_ids)))
+        return [r['employee_id'] for r in rows]
+
+
+    async def get_assigned_employees(self, device_id: int) -> List[Dict]:
+        query = """
+        SELECT da.id, da.device_id, da.employee_id, u.username, da.assigned_at
+        FROM device_assignments da
+        JOIN users u ON u.employee_id = da.employee_id
+        WHERE da.device_id = %s;
+        """
+        return await self.fetchall(query, (device_id,))
+
+
+    async def get_assignments_for_device(self, device_id: int) -> List[Dict[str, Any]]:
+        query = """
+        SELECT da.id, da.device_id, da.employee_id, u.username, da.assigned_at
+        FROM device_assignments da
+        LEFT JOIN users u ON u.employee_id = da.employee_id
+        WHERE da.device_id = %s
+        ORDER BY da.assigned_at DESC;
+        """
+        return await self.fetchall(query, (device_id,))
+
+
+    async def remove_assignments_for_device(self, device_id: int) -> None:
+        """
+        Remove ALL assignments for the given device.
+        Used when device is revoked/deactivated by admin.
+        """
+        query = """
+            DELETE FROM device_assignments
+            WHERE device_id = %s;
+        """
+        await self.execute(query, (device_id,))
+
+
+    async def is_employee_assigned_to_device(self, device_id: int, employee_id: int) -> bool:
+        return bool(await self.fetchone(EMPLOYEE_ASSIGNED_QUERY, (device_id, employee_id)))
+
+    # ----------------------------
+    # Bulk admin helpers
+    # Each is one statement, so the whole batch commits or rolls back together.
+    # Rows come back per requested item so callers can report individual outcomes.
+    # ----------------------------
+
+    async def bulk_approve_devices(self, device_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Set status = 'active' for every listed device that isn't active yet.
+        Returns one row per requested id: device_id, device_uuid, previous_status, updated.
+        previous_status is NULL when the device doesn't exist.
+        """
+        query = """
+            WITH req AS (
+                SELECT DISTINCT UNNEST(%s::int[]) AS device_id
+            ),
+            upd AS (
+                UPDATE devices d
+                SET status = 'active', updated_at = now()
+                FROM req
+                WHERE d.device_id = req.device_id AND d.status <> 'active'
+                RETURNING d.device_id
+            )
+            SELECT req.device_id, d.device_uuid, d.status AS previous_status,
+                   (upd.device_id IS NOT NULL) AS updated
+            FROM req
+            LEFT JOIN devices d ON d.device_id = req.device_id
+            LEFT JOIN upd ON upd.device_id = req.device_id;
+        """
+        return await self.fetchall(query, (list(device_ids),))
+
+
+    async def bulk_reject_devices(self, device_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Pending devices become 'rejected'; active devices become 'revoked', lose their
+        credential and all assignments. Other states are left untouched.
+        Returns one row per requested id: device_id, device_uuid, previous_status, new_status.
+        """
+        query = """
+            WITH req AS (
+                SELECT DISTINCT UNNEST(%s::int[]) AS device_id
+            ),
+            cur AS (
+                SELECT d.device_id, d.device_uuid, d.status
+                FROM devices d
+                JOIN req ON req.device_id = d.device_id
+                FOR UPDATE OF d
+            ),
+            upd AS (
+                UPDATE devices d
+                SET status = CASE cur.status WHEN 'pending' THEN 'rejected' ELSE 'revoked' END,
+                    credential_hash = CASE cur.status WHEN 'active' THEN NULL ELSE d.credential_hash END,
+                    updated_at = now()
+                FROM cur
+                WHERE d.device_id = cur.device_id AND cur.status IN ('pending', 'active')
+                RETURNING d.device_id, d.status
+            ),
+            removed AS (
+                DELETE FROM device_assignments da
+                USING cur
+                WHERE da.device_id = cur.device_id AND cur.status = 'active'
+            )
+            SELECT req.device_id, cur.device_uuid, cur.status AS previous_status, upd.status AS new_status
+            FROM req
+            LEFT JOIN cur ON cur.device_id = req.device_id
+            LEFT JOIN upd ON upd.device_id = req.device_id;
+        """
+        return await self.fetchall(query, (list(device_ids),))
+
+
+    async def bulk_assign_employees(self, pairs: List[Tuple[int, int]],
+                                    assigned_by: Optional[int]=None) -> List[Dict[str, Any]]:
+        """
+        Insert many (device_id, employee_id) assignments with one UNNEST-based statement.
+        Returns one row per pair with outcome: assigned | already_assigned |
+        device_not_found | employee_not_found.
+        """
+        query = """
+            WITH pairs AS (
+                SELECT DISTINCT p.device_id, p.employee_id
+                FROM UNNEST(%s::int[], %s::int[]) AS p(device_id, employee_id)
+            ),
+            ins AS (
+                INSERT INTO device_assignments (device_id, employee_id, assigned_by)
+                SELECT p.device_id, p.employee_id, %s
+                FROM pairs p
+                JOIN devices d ON d.device_id = p.device_id
+                JOIN users u ON u.employee_id = p.employee_id
+                ON CONFLICT (device_id, employee_id) DO NOTHING
+                RETURNING device_id, employee_id
+            )
+            SELECT p.device_id, p.employee_id, d.device_uuid,
+                CASE
+                    WHEN ins.device_id IS NOT NULL THEN 'assigned'
+                    WHEN d.device_id IS NULL THEN 'device_not_found'
+                    WHEN u.employee_id IS NULL THEN 'employee_not_found'
+                    ELSE 'already_assigned'
+                END AS outcome
+            FROM pairs p
+            LEFT JOIN ins ON ins.device_id = p.device_id AND ins.employee_id = p.employee_id
+            LEFT JOIN devices d ON d.device_id = p.device_id
+            LEFT JOIN users u ON u.employee_id = p.employee_id
+            ORDER BY p.device_id, p.employee_id;
+        """
+        device_ids = [d for d, _ in pairs]
+        employee_ids = [e for _, e in pairs]
+        return await self.fetchall(query, (device_ids, employee_ids, assigned_by))
+
+    # ----------------------------
+    # Users helpers (minimal)
+    # ----------------------------
+
+    async def create_user(self, employee_id: int, username: str, password_hash: str,
+                          role: str='operator', is_active: bool=True):
+        query = """
+        INSERT INTO users (employee_id, username, password_hash, role, is_active, created_at)
+        VALUES (%s, %s, %s, %s, %s, now())
+        RETURNING employee_id;
+        """
+        row = await self.fetchone(query, (employee_id, username, password_hash, role, is_active))
+        return row['employee_id'] if row else None
+
+
+    async def get_user_by_username(self, username: str) -> Optional[Dict]:
+        query = f"SELECT {USER_COLUMNS} FROM users WHERE username = %s;"
+        return await self.fetchone(query, (username,))
+
+
+    async def validate_employee_ids(self, employee_ids: List[int]) -> List[Dict[str, Any]]:
+        query = """
+            SELECT employee_id
+            FROM users
+            WHERE employee_id = ANY(%s);
+        """
+        return await self.fetchall(query, (employee_ids,))
+
+
+    async def get_user_status(self, employee_id: int) -> Optional[Dict]:
+        return await self.fetchone(USER_STATUS_QUERY, (employee_id,))
+
+    # ----------------------------
+    # Face gallery (employees.gallery_rev, see migrations 008 and 010)
+    # ----------------------------
+
+    async def get_gallery_revision(self) -> int:
+        """
+        Latest committed gallery revision. Writers take revisions from this counter row
+        one transaction at a time, so every change up to it is already visible.
+        """
+        row = await self.fetchone("SELECT revision FROM employee_gallery_revision;")
+        return int(row["revision"]) if row else 0
+
+
+    async def get_gallery_changes(self, since: int) -> List[Dict[str, Any]]:
+        """
+        Employees whose gallery entry changed after `since` (face_encoding may be NULL,
+        meaning the encoding was cleared), with the sites they are allowed at
+        (empty array = unrestricted).
+        """
+        query = """
+        SELECT e.employee_id, e.name, e.department, e.face_encoding, e.gallery_rev,
+               ARRAY(SELECT es.site FROM employee_sites es WHERE es.employee_id = e.employee_id) AS sites
+        FROM employees e
+        WHERE e.gallery_rev > %s
+        ORDER BY e.gallery_rev;
+        """
+        return await self.fetchall(query, (since,))
+
+
+    async def get_gallery_tombstones(self, since: int) -> List[Dict[str, Any]]:
+        query = """
+        SELECT employee_id, gallery_rev
+        FROM employee_gallery_tombstones
+        WHERE gallery_rev > %s;
+        """
+        return await self.fetchall(query, (since,))
+
+
+    async def get_employee_sites(self, employee_id: int) -> List[str]:
+        rows = await self.fetchall("SELECT site FROM employee_sites WHERE employee_id = %s ORDER BY site;",
+                                   (employee_id,))
+        return [r["site"] for r in rows]
+
+
+    async def set_employee_sites(self, employee_id: int, sites: List[str]) -> Optional[List[str]]:
+        """
+        Replace an employee's site list in one transaction. Returns the new list,
+        or None if the employee does not exist.
+        """
+        # pool.connection() is one transaction: commit on exit, rollback on error
+        async with self.pool.connection() as conn:
+            cur = await conn.execute("SELECT 1 FROM employees WHERE employee_id = %s FOR UPDATE;",
+                                     (employee_id,))
+            if not await cur.fetchone():
+                return None
+            await conn.execute(
+                "DELETE FROM employee_sites WHERE employee_id = %s AND NOT (site = ANY(%s::text[]));",
+                (employee_id, sites)
+            )
+            await conn.execute(
+                """
+                INSERT INTO employee_sites (employee_id, site)
+                SELECT %s, s FROM UNNEST(%s::text[]) AS s
+                ON CONFLICT DO NOTHING;
+                """,
+                (employee_id, sites)
+            )
+        return sorted(set(sites))
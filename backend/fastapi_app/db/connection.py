@@ -1,11 +1,15 @@
 # backend/fastapi_app/db/connection.py
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from pymongo import MongoClient
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg.types.string import TextLoader
+from psycopg_pool import AsyncConnectionPool
+from pymongo import MongoClient, AsyncMongoClient
 from backend.fastapi_app.core.config import settings
 
 def get_pg_connection():
-    
+
     conn = psycopg2.connect(
         host=settings.POSTGRES_HOST,
         port=settings.POSTGRES_PORT,
@@ -18,4 +22,40 @@ def get_pg_connection():
 
 def get_mongo_client():
     client = MongoClient(settings.MONGO_URI)
-    return client
\ No newline at end of file
+    return client
+
+
+async def _configure_async_pg_connection(conn):
+    # psycopg2 hands UUID columns back as str; keep that shape for the existing DTOs
+    conn.adapters.register_loader("uuid", TextLoader)
+
+def get_pg_conninfo() -> str:
+    return make_conninfo(
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        dbname=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+    )
+
+def get_async_pg_pool() -> AsyncConnectionPool:
+    """
+    Build (but do not open) an asyncio psycopg3 connection pool.
+    Rows come back as dicts so callers see the same shape as RealDictCursor.
+    Statements run POSTGRES_PREPARE_THRESHOLD times on a connection are prepared
+    there (None disables auto-prepare, e.g. behind a transaction-mode pgbouncer).
+    The pool must be opened with `await pool.open()` inside a running event loop.
+    """
+    return AsyncConnectionPool(
+        get_pg_conninfo(),
+        min_size=getattr(settings, "POSTGRES_POOL_MIN_SIZE", 2),
+        max_size=getattr(settings, "POSTGRES_POOL_MAX_SIZE", 20),
+        kwargs={"row_factory": dict_row,
+                "prepare_threshold": getattr(settings, "POSTGRES_PREPARE_THRESHOLD", 5)},
+        configure=_configure_async_pg_connection,
+        open=False
+    )
+
+def get_async_mongo_client():
+    client = AsyncMongoClient(settings.MONGO_URI)
+    return client
@@ -0,0 +1,210 @@
+# backend/fastapi_app/db/event_logs.py
+"""
+Bounded storage for the append-only audit collections, `device_logs` and
+`user_login_logs`.
+
+  * Retention: events expire EVENT_LOG_RETENTION_DAYS after their timestamp (a TTL
+    index on `timestamp`, or the collection's expireAfterSeconds in time-series mode).
+    0 keeps events forever.
+  * Time-series mode (EVENT_LOG_TIMESERIES): the collections are stored as MongoDB
+    time-series collections with `timestamp` as timeField and the subject of their hot
+    query as metaField (`device` for device_logs, `user` for user_login_logs), so
+    events are bucketed per device / user and expire a bucket at a time. An existing
+    regular collection is converted once, by copying it into a new time-series one.
+  * Hourly rollups: rollup_event_logs() recomputes per-hour counts of recent events
+    into `device_logs_hourly` / `user_login_logs_hourly`, so history outlives the
+    raw events. Run it at least once per ROLLUP_LOOKBACK_HOURS, and keep retention
+    longer than that window:
+
+        python -m backend.fastapi_app.manage rollup-event-logs
+
+Retention and time-series mode are applied by the mongo migrations; after changing
+EVENT_LOG_RETENTION_DAYS run `manage apply-event-log-retention`.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING
+
+from backend.fastapi_app.core.config import settings
+from desktop_app.utils.utils import current_datetime_utc
+
+logger = logging.getLogger(__name__)
+
+TIME_FIELD = "timestamp"
+# bucket by what get_device_logs / get_user_login_logs filter on
+META_FIELDS = {"device_logs": "device", "user_login_logs": "user"}
+ROLLUP_LOOKBACK_HOURS = 48
+COPY_BATCH_SIZE = 5000
+
+# collection -> (hourly rollup collection, fields counted per hour besides the hour itself)
+EVENT_LOGS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "device_logs": ("device_logs_hourly", {"device_id": "$device.id", "event_type": "$event_type"}),
+    "user_login_logs": ("user_login_logs_hourly", {"device_id": "$device.id", "outcome": "$outcome"}),
+}
+
+# indexes behind get_device_logs / get_user_login_logs (the v1 ones, recreated after a
+# time-series conversion; read backwards for the newest-first sort)
+HOT_INDEXES: Dict[str, List[List[Tuple[str, int]]]] = {
+    "device_logs": [[("device.id", ASCENDING), (TIME_FIELD, ASCENDING)]],
+    "user_login_logs": [[("user.id", ASCENDING), (TIME_FIELD, ASCENDING)]],
+}
+
+
+def retention_seconds(days: Optional[int] = None) -> Optional[int]:
+    """EVENT_LOG_RETENTION_DAYS (default 90) in seconds; None when retention is disabled."""
+    if days is None:
+        days = getattr(settings, "EVENT_LOG_RETENTION_DAYS", 90)
+    return int(days) * 86400 if days else None
+
+
+def timeseries_enabled() -> bool:
+    return bool(getattr(settings, "EVENT_LOG_TIMESERIES", False))
+
+
+def _collection_info(db, name: str) -> Optional[Dict[str, Any]]:
+    return next(iter(db.list_collections(filter={"name": name})), None)
+
+
+def is_timeseries(db, name: str) -> bool:
+    info = _collection_info(db, name)
+    return bool(info) and info.get("type") == "timeseries"
+
+
+def _ttl_index_name(collection) -> Optional[str]:
+    for name, info in collection.index_information().items():
+        if list(info["key"]) == [(TIME_FIELD, ASCENDING)]:
+            return name
+    return None
+
+
+def apply_retention(db, name: str, seconds: Optional[int]) -> None:
+    """
+    Set (or with seconds=None, remove) the expiry of one event collection. Uses collMod
+    on the existing `timestamp` index, so changing retention never rebuilds an index.
+    """
+    if is_timeseries(db, name):
+        db.command("collMod", name, expireAfterSeconds=seconds if seconds else "off")
+        return
+
+    collection = db[name]
+    index = _ttl_index_name(collection)
+    if index is None:
+        if seconds:
+            collection.create_index([(TIME_FIELD, ASCENDING)], expireAfterSeconds=seconds)
+        return
+    if seconds:
+        db.command("collMod", name, index={"name": index, "expireAfterSeconds": seconds})
+    elif "expireAfterSeconds" in collection.index_information()[index]:
+        # a TTL can't be switched off in place; rebuild the plain index
+        collection.drop_index(index)
+        collection.create_index([(TIME_FIELD, ASCENDING)])
+
+
+def _create_timeseries(db, name: str, seconds: Optional[int]) -> None:
+    options: Dict[str, Any] = {"timeseries": {"timeField": TIME_FIELD, "metaField": META_FIELDS[name],
+                                               "granularity": "seconds"}}
+    if seconds:
+        options["expireAfterSeconds"] = seconds
+    db.create_collection(name, **options)
+
+
+def convert_to_timeseries(db, name: str, seconds: Optional[int]) -> None:
+    """
+    Replace a regular event collection with a time-series one holding the same events.
+    The old collection is renamed to `<name>_pre_timeseries` and dropped once copied;
+    an interrupted conversion starts its copy over. Run it with the API stopped: a
+    write between the rename and the create would recreate a regular collection.
+    """
+    legacy = f"{name}_pre_timeseries"
+    if name in db.list_collection_names() and not is_timeseries(db, name):
+        db[name].rename(legacy)
+    if legacy in db.list_collection_names():
+        # the target can only hold a partial copy from an interrupted run
+        db[name].drop()
+        _create_timeseries(db, name, seconds)
+        target = db[name]
+        batch: List[Dict[str, Any]] = []
+        for doc in db[legacy].find({}, {"_id": 0}).batch_size(COPY_BATCH_SIZE):
+            batch.append(doc)
+            if len(batch) >= COPY_BATCH_SIZE:
+                target.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            target.insert_many(batch, ordered=False)
+        db[legacy].drop()
+        logger.info(f"Converted {name} to a time-series collection")
+    elif name not in db.list_collection_names():
+        _create_timeseries(db, name, seconds)
+
+
+def ensure_event_log_storage(db, seconds: Optional[int] = None, timeseries: Optional[bool] = None) -> None:
+    """
+    Bring device_logs and user_login_logs to the configured mode and retention, and
+    create their hot-query and rollup indexes. Safe to re-run.
+    """
+    seconds = retention_seconds() if seconds is None else seconds
+    timeseries = timeseries_enabled() if timeseries is None else timeseries
+    for name, (hourly, fields) in EVENT_LOGS.items():
+        if timeseries:
+            convert_to_timeseries(db, name, seconds)
+            options = (_collection_info(db, name) or {}).get("options", {})
+            meta = options.get("timeseries", {}).get("metaField")
+            if meta != META_FIELDS[name]:
+                # the metaField of a time-series collection can't be changed in place
+                logger.warning(f"{name} is bucketed by {meta!r}, not {META_FIELDS[name]!r}; "
+                               f"recreate it to change the metaField")
+        elif is_timeseries(db, name):
+            logger.warning(f"{name} is a time-series collection; EVENT_LOG_TIMESERIES=False does not convert it back")
+        apply_retention(db, name, seconds)
+        for keys in HOT_INDEXES[name]:
+            db[name].create_index(keys)
+        # the unique key $merge in rollup_event_logs matches on; device_id first for per-device reads
+        first, *rest = fields
+        db[hourly].create_index([(first, ASCENDING), ("hour", ASCENDING), *[(field, ASCENDING) for field in rest]],
+                                unique=True)
+
+
+def hourly_rollup_pipeline(hourly: str, fields: Dict[str, str], start: datetime,
+                           end: datetime) -> List[Dict[str, Any]]:
+    """
+    Per-hour event counts of [start, end), $merged into `hourly` (replacing the hours
+    recomputed). Missing group fields become "" since $merge can't match on null.
+    """
+    return [
+        {"$match": {TIME_FIELD: {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {
+                "hour": {"$dateTrunc": {"date": f"${TIME_FIELD}", "unit": "hour"}},
+                **{field: {"$ifNull": [path, ""]} for field, path in fields.items()},
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$project": {
+            "_id": 0,
+            "hour": "$_id.hour",
+            **{field: f"$_id.{field}" for field in fields},
+            "count": 1,
+            "updated_at": "$$NOW",
+        }},
+        {"$merge": {
+            "into": hourly,
+            "on": ["hour", *fields],
+            "whenMatched": "replace",
+            "whenNotMatched": "insert",
+        }},
+    ]
+
+
+def rollup_event_logs(db, hours: int = ROLLUP_LOOKBACK_HOURS, now: Optional[datetime] = None) -> datetime:
+    """
+    Recompute the hourly counts of the last `hours` complete hours for every event
+    collection. Returns the end of the rolled-up window (the start of the current hour).
+    """
+    now = now or current_datetime_utc()
+    end = now.replace(minute=0, second=0, microsecond=0)
+    start = end - timedelta(hours=hours)
+    for name, (hourly, fields) in EVENT_LOGS.items():
+        db[name].aggregate(hourly_rollup_pipeline(hourly, fields, start, end))
+    return end
@@ -0,0 +1,13 @@
+-- 007_add_device_listing_indexes.sql
+-- Keyset pagination for the admin device listings orders by (created_at, device_id) DESC,
+-- optionally filtered by status or assigned_site. These composite indexes let each page
+-- be an index range scan starting at the cursor, so cost stays O(page) for any fleet size.
+
+CREATE INDEX IF NOT EXISTS idx_devices_created_id
+  ON devices (created_at DESC, device_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_devices_status_created_id
+  ON devices (status, created_at DESC, device_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_devices_site_created_id
+  ON devices (assigned_site, created_at DESC, device_id DESC);
@@ -0,0 +1,54 @@
+-- 008_add_gallery_revisions.sql
+-- Revision counter for the face-encoding gallery served by GET /api/v1/gallery.
+-- Every insert/update of an employee's encoding or name/department stamps the row with
+-- the next value of employee_gallery_rev_seq; deletes leave a tombstone with a revision.
+-- Kiosks send the revision they hold and receive only rows/tombstones newer than it.
+
+CREATE SEQUENCE IF NOT EXISTS employee_gallery_rev_seq;
+
+ALTER TABLE employees
+ADD COLUMN IF NOT EXISTS gallery_rev BIGINT NOT NULL DEFAULT nextval('employee_gallery_rev_seq');
+
+CREATE INDEX IF NOT EXISTS idx_employees_gallery_rev ON employees (gallery_rev);
+
+CREATE TABLE IF NOT EXISTS employee_gallery_tombstones (
+  employee_id INTEGER PRIMARY KEY,
+  gallery_rev BIGINT NOT NULL,
+  deleted_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_employee_gallery_tombstones_rev ON employee_gallery_tombstones (gallery_rev);
+
+CREATE OR REPLACE FUNCTION employees_bump_gallery_rev() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    INSERT INTO employee_gallery_tombstones (employee_id, gallery_rev)
+    VALUES (OLD.employee_id, nextval('employee_gallery_rev_seq'))
+    ON CONFLICT (employee_id) DO UPDATE
+      SET gallery_rev = EXCLUDED.gallery_rev, deleted_at = now();
+    RETURN OLD;
+  END IF;
+
+  IF TG_OP = 'UPDATE'
+     AND NEW.face_encoding IS NOT DISTINCT FROM OLD.face_encoding
+     AND NEW.name IS NOT DISTINCT FROM OLD.name
+     AND NEW.department IS NOT DISTINCT FROM OLD.department THEN
+    RETURN NEW;   -- e.g. photo_path only: gallery unchanged
+  END IF;
+
+  NEW.gallery_rev := nextval('employee_gallery_rev_seq');
+  -- a re-created id is live again
+  DELETE FROM employee_gallery_tombstones WHERE employee_id = NEW.employee_id;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_employees_gallery_rev ON employees;
+CREATE TRIGGER trg_employees_gallery_rev
+  BEFORE INSERT OR UPDATE ON employees
+  FOR EACH ROW EXECUTE FUNCTION employees_bump_gallery_rev();
+
+DROP TRIGGER IF EXISTS trg_employees_gallery_tombstone ON employees;
+CREATE TRIGGER trg_employees_gallery_tombstone
+  AFTER DELETE ON employees
+  FOR EACH ROW EXECUTE FUNCTION employees_bump_gallery_rev();
@@ -0,0 +1,28 @@
+-- 009_add_employee_sites.sql
+-- Which sites an employee may punch in at. A kiosk whose devices.assigned_site is S
+-- only receives (in GET /api/v1/gallery) employees listed for S plus employees with no
+-- site rows at all (unrestricted). Kiosks without an assigned_site get everyone.
+
+CREATE TABLE IF NOT EXISTS employee_sites (
+  employee_id INTEGER NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+  site TEXT NOT NULL,
+  PRIMARY KEY (employee_id, site)
+);
+
+CREATE INDEX IF NOT EXISTS idx_employee_sites_site ON employee_sites (site);
+
+-- A change in an employee's sites changes which galleries contain them, so bump the
+-- employee's gallery_rev (the employees trigger keeps an explicitly set revision).
+CREATE OR REPLACE FUNCTION employee_sites_bump_gallery_rev() RETURNS trigger AS $$
+BEGIN
+  UPDATE employees
+  SET gallery_rev = nextval('employee_gallery_rev_seq')
+  WHERE employee_id = COALESCE(NEW.employee_id, OLD.employee_id);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_employee_sites_gallery_rev ON employee_sites;
+CREATE TRIGGER trg_employee_sites_gallery_rev
+  AFTER INSERT OR UPDATE OR DELETE ON employee_sites
+  FOR EACH ROW EXECUTE FUNCTION employee_sites_bump_gallery_rev();
@@ -0,0 +1,63 @@
+-- 010_serialize_gallery_revisions.sql
+-- Gallery revisions must become visible in revision order. With nextval() a writer that
+-- took rev 10 could commit after one that took rev 11; kiosks (and GalleryCache) that had
+-- already advanced to 11 would then never fetch rev 10. Revisions now come from a single
+-- counter row that every gallery writer updates, so concurrent writers queue on its row
+-- lock and each takes its revision only once all earlier ones have committed or rolled
+-- back. Gallery writes are rare admin/enrolment operations; the cost is that they no
+-- longer overlap. The counter also answers "current revision" with one row read.
+
+CREATE TABLE IF NOT EXISTS employee_gallery_revision (
+  id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  revision BIGINT NOT NULL
+);
+
+INSERT INTO employee_gallery_revision (revision)
+SELECT GREATEST(
+  COALESCE((SELECT MAX(gallery_rev) FROM employees), 0),
+  COALESCE((SELECT MAX(gallery_rev) FROM employee_gallery_tombstones), 0)
+)
+ON CONFLICT (id) DO NOTHING;
+
+-- Takes the next revision and holds the counter's row lock until the caller commits.
+CREATE OR REPLACE FUNCTION next_gallery_rev() RETURNS BIGINT AS $$
+  UPDATE employee_gallery_revision SET revision = revision + 1 RETURNING revision;
+$$ LANGUAGE sql;
+
+-- the BEFORE INSERT trigger assigns the revision
+ALTER TABLE employees ALTER COLUMN gallery_rev SET DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION employees_bump_gallery_rev() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    INSERT INTO employee_gallery_tombstones (employee_id, gallery_rev)
+    VALUES (OLD.employee_id, next_gallery_rev())
+    ON CONFLICT (employee_id) DO UPDATE
+      SET gallery_rev = EXCLUDED.gallery_rev, deleted_at = now();
+    RETURN OLD;
+  END IF;
+
+  IF TG_OP = 'UPDATE'
+     AND NEW.face_encoding IS NOT DISTINCT FROM OLD.face_encoding
+     AND NEW.name IS NOT DISTINCT FROM OLD.name
+     AND NEW.department IS NOT DISTINCT FROM OLD.department THEN
+    RETURN NEW;   -- e.g. photo_path only, or a revision set by employee_sites_bump_gallery_rev
+  END IF;
+
+  NEW.gallery_rev := next_gallery_rev();
+  -- a re-created id is live again
+  DELETE FROM employee_gallery_tombstones WHERE employee_id = NEW.employee_id;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION employee_sites_bump_gallery_rev() RETURNS trigger AS $$
+BEGIN
+  UPDATE employees
+  SET gallery_rev = next_gallery_rev()
+  WHERE employee_id = COALESCE(NEW.employee_id, OLD.employee_id);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP SEQUENCE IF EXISTS employee_gallery_rev_seq;
@@ -1,5 +1,4 @@
 # backend/fastapi_app/db/mongo_db.py
-from pymongo import MongoClient, ASCENDING
 from datetime import datetime, timezone, time
 from desktop_app.utils.utils import current_date_utc_midnight, current_datetime_utc
 from backend.fastapi_app.schemas.provisioning import DeviceLogDTO
@@ -9,24 +8,19 @@ from typing import Optional, List, Dict, Any
 
 class MongoDB:
     def __init__(self):
+        # MongoClient connects lazily, so construction is cheap.
+        # Indexes are owned by db/mongo_migrations.py (`manage migrate-mongo`).
         self.client = get_mongo_client()
         self.db = self.client[settings.MONGO_DB]
 
         # existing attendance logs collection (kept for backwards compatibility)
         self.attendance = self.db['logs']
-        self.attendance.create_index([("employee.id", ASCENDING), ("attendance.date", ASCENDING)], unique=True)
-        self.attendance.create_index("attendance.date")
-        self.attendance.create_index("employee.id")
 
         # device_logs (events from devices)
         self.device_logs = self.db['device_logs']
-        self.device_logs.create_index([("device.id", ASCENDING), ("timestamp", ASCENDING)])
-        self.device_logs.create_index("timestamp")
 
         # user_login_logs (operator login attempts/events)
         self.user_login_logs = self.db['user_login_logs']
-        self.user_login_logs.create_index([("user.id", ASCENDING), ("timestamp", ASCENDING)])
-        self.user_login_logs.create_index("timestamp")
 
     # ----------------------------
     # Attendance helpers (existing)
@@ -124,6 +118,22 @@ class MongoDB:
         return True
     
 
+    def log_device_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Write many audit events in one unordered insert_many (one round-trip per batch).
+        Each event has the log_device_event keyword arguments. Returns the inserted count.
+        """
+        if not events:
+            return 0
+        timestamp = current_datetime_utc()
+        docs = [
+            DeviceLogDTO(timestamp=timestamp, **event).to_mongo()
+            for event in events
+        ]
+        result = self.device_logs.insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+    
+
     def get_device_logs(self, device_id: int, limit: int= 100) -> List[Dict[str, Any]]:
         """
         Fetches recent device logs for a device, sorted by timestamp (desc),
@@ -0,0 +1,86 @@
+# backend/fastapi_app/db/mongo_migrations.py
+"""
+Versioned, idempotent MongoDB schema steps (indexes, collection options).
+
+Index builds used to run inside MongoDB.__init__ on every worker start. They now run
+once, from the management command:
+
+    python -m backend.fastapi_app.manage migrate-mongo
+
+The applied version is stored in the `schema_version` collection under _id "backend"
+so re-running the command only applies steps that are newer than the recorded version.
+"""
+import logging
+from typing import Callable, List, Tuple
+from pymongo import ASCENDING
+from backend.fastapi_app.db.event_logs import ensure_event_log_storage
+from desktop_app.database.attendance_summary import create_summary_indexes
+from desktop_app.utils.utils import current_datetime_utc
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_COLLECTION = "schema_version"
+SCHEMA_ID = "backend"
+
+
+def _v1_base_indexes(db) -> None:
+    attendance = db["logs"]
+    attendance.create_index([("employee.id", ASCENDING), ("attendance.date", ASCENDING)], unique=True)
+    attendance.create_index("attendance.date")
+    attendance.create_index("employee.id")
+
+    device_logs = db["device_logs"]
+    device_logs.create_index([("device.id", ASCENDING), ("timestamp", ASCENDING)])
+    device_logs.create_index("timestamp")
+
+    user_login_logs = db["user_login_logs"]
+    user_login_logs.create_index([("user.id", ASCENDING), ("timestamp", ASCENDING)])
+    user_login_logs.create_index("timestamp")
+
+
+def _v2_daily_summary(db) -> None:
+    create_summary_indexes(db)
+
+
+def _v3_event_log_storage(db) -> None:
+    # configured retention (TTL) and optional time-series mode for device_logs / user_login_logs
+    ensure_event_log_storage(db)
+
+
+# (version, description, step). Steps must be safe to re-run.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "base indexes for logs, device_logs, user_login_logs", _v1_base_indexes),
+    (2, "attendance_daily_summary key index", _v2_daily_summary),
+    (3, "event log retention, time-series mode and hourly rollup indexes", _v3_event_log_storage),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(db) -> int:
+    doc = db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_ID})
+    return int(doc.get("version", 0)) if doc else 0
+
+
+def migrate(db) -> int:
+    """
+    Apply every step newer than the recorded version, recording progress after each one.
+    Returns the resulting schema version.
+    """
+    current = get_schema_version(db)
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info(f"Applying mongo schema v{version}: {description}")
+        step(db)
+        db[SCHEMA_COLLECTION].update_one(
+            {"_id": SCHEMA_ID},
+            {
+                "$set": {"version": version, "updated_at": current_datetime_utc()},
+                "$push": {"history": {"version": version, "description": description,
+                                      "applied_at": current_datetime_utc()}}
+            },
+            upsert=True
+        )
+        current = version
+    return current
@@ -1,11 +1,101 @@
 # backend/fastapi_app/db/postgres_db.py
 from psycopg2.extras import RealDictCursor, Json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 from .connection import get_pg_connection
 from .tables.users_table import create_users_table
 from .tables.devices_table import create_devices_table
 from .tables.device_assignments_table import create_device_assignments_table
 import psycopg2
+from datetime import datetime
+
+# Explicit column lists instead of SELECT *: callers get a stable row shape, and
+# columns added to the tables later aren't shipped to code that never reads them.
+DEVICE_COLUMNS = """device_id, device_uuid, credential_type, credential_hash, device_name, assigned_site,
+            registered_by, status, app_version, os_version, last_update_check, created_at, updated_at"""
+
+USER_COLUMNS = "employee_id, username, password_hash, role, is_active, created_at"
+
+
+class DeviceAuthRow(NamedTuple):
+    """The device columns token validation needs, as a plain tuple (hot path: every device call)."""
+    device_id: int
+    device_uuid: str
+    status: str
+    credential_hash: Optional[str]
+    assigned_site: Optional[str]
+
+
+DEVICE_AUTH_QUERY = f"SELECT {', '.join(DeviceAuthRow._fields)} FROM devices WHERE device_uuid = %s;"
+
+DEVICE_BY_UUID_QUERY = f"SELECT {DEVICE_COLUMNS} FROM devices WHERE device_uuid = %s;"
+
+USER_STATUS_QUERY = "SELECT username, is_active FROM users WHERE employee_id = %s LIMIT 1;"
+
+EMPLOYEE_ASSIGNED_QUERY = "SELECT 1 FROM device_assignments WHERE device_id = %s AND employee_id = %s;"
+
+PENDING_DEVICE_COLUMNS = """device_id, device_uuid, device_name, assigned_site, app_version,
+            os_version, status, created_at"""
+
+DEVICE_LIST_COLUMNS = """device_id, device_uuid, device_name, status, assigned_site,
+            app_version, os_version, last_update_check, created_at"""
+
+# Multi-row assignment insert: one statement (and one commit) for any number of employees.
+ASSIGN_EMPLOYEES_QUERY = """
+    INSERT INTO device_assignments (device_id, employee_id, assigned_by)
+    SELECT %s, emp.employee_id, %s
+    FROM UNNEST(%s::int[]) AS emp(employee_id)
+    ON CONFLICT (device_id, employee_id) DO NOTHING
+    RETURNING employee_id;
+"""
+
+# Everything operator_required needs in one round-trip: device status + credential hash,
+# operator active flag and assignment existence. No row means the device is unknown;
+# a NULL user_active means the operator does not exist.
+OPERATOR_AUTH_QUERY = """
+    SELECT d.device_id, d.device_uuid, d.status AS device_status, d.credential_hash, d.assigned_site,
+           u.username, u.is_active AS user_active,
+           EXISTS (
+               SELECT 1 FROM device_assignments da
+               WHERE da.device_id = d.device_id AND da.employee_id = %(employee_id)s
+           ) AS is_assigned
+    FROM devices d
+    LEFT JOIN users u ON u.employee_id = %(employee_id)s
+    WHERE d.device_uuid = %(device_uuid)s
+    LIMIT 1;
+"""
+
+
+def build_device_listing_query(columns: str, limit: int, after: Optional[Tuple[datetime, int]] = None,
+                               status: Optional[str] = None,
+                               site: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """
+    Keyset page over devices ordered by (created_at, device_id) DESC.
+    `after` is the (created_at, device_id) of the last row of the previous page.
+    Served by idx_devices_status_created_id / idx_devices_site_created_id / idx_devices_created_id.
+    """
+    conditions = []
+    params: List[Any] = []
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    if site:
+        conditions.append("assigned_site = %s")
+        params.append(site)
+    if after:
+        conditions.append("(created_at, device_id) < (%s, %s)")
+        params.extend(after)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        SELECT {columns}
+        FROM devices
+        {where}
+        ORDER BY created_at DESC, device_id DESC
+        LIMIT %s;
+    """
+    params.append(limit)
+    return query, params
+
 
 class PostgresDB:
     def __init__(self):
@@ -56,13 +146,19 @@ class PostgresDB:
     
     
     def get_device_by_uuid(self, device_uuid: str) -> Optional[Dict]:
-        query = "SELECT * FROM devices WHERE device_uuid = %s;"
-        self.cursor.execute(query, (device_uuid,))
+        self.cursor.execute(DEVICE_BY_UUID_QUERY, (device_uuid,))
         return self.cursor.fetchone()
     
 
+    def get_device_auth(self, device_uuid: str) -> Optional[DeviceAuthRow]:
+        with self.conn.cursor() as cursor:
+            cursor.execute(DEVICE_AUTH_QUERY, (device_uuid,))
+            row = cursor.fetchone()
+        return DeviceAuthRow._make(row) if row else None
+    
+
     def get_device_by_id(self, device_id: int) -> Optional[Dict]:
-        query = "SELECT * FROM devices WHERE device_id = %s;"
+        query = f"SELECT {DEVICE_COLUMNS} FROM devices WHERE device_id = %s;"
         self.cursor.execute(query, (device_id,))
         return self.cursor.fetchone()
     
@@ -84,32 +180,23 @@ class PostgresDB:
         self.conn.commit()
 
 
-    def get_pending_devices(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_pending_devices(self, limit: int = 50, after: Optional[Tuple[datetime, int]] = None,
+                            site: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Return devices with status = 'pending', ordered by created_at desc.
+        Return devices with status = 'pending', newest first, one keyset page at a time.
         """
-        query = """
-            SELECT device_id, device_uuid, device_name, assigned_site, app_version, 
-            os_version, status, created_at
-            FROM devices
-            WHERE status = 'pending'
-            ORDER BY created_at DESC
-            LIMIT %s;
-        """
-        self.cursor.execute(query, (limit,))
+        query, params = build_device_listing_query(PENDING_DEVICE_COLUMNS, limit, after,
+                                                   status="pending", site=site)
+        self.cursor.execute(query, params)
         rows = self.cursor.fetchall()
         return rows
     
 
-    def get_all_devices(self, limit: int = 100):
-        query = """
-            SELECT device_id, device_uuid, device_name, status, assigned_site, 
-            app_version, os_version, last_update_check, created_at
-            FROM devices
-            ORDER BY created_at DESC
-            LIMIT %s;
-        """
-        self.cursor.execute(query, (limit,))
+    def get_all_devices(self, limit: int = 100, after: Optional[Tuple[datetime, int]] = None,
+                        status: Optional[str] = None, site: Optional[str] = None):
+        query, params = build_device_listing_query(DEVICE_LIST_COLUMNS, limit, after,
+                                                   status=status, site=site)
+        self.cursor.execute(query, params)
         rows = self.cursor.fetchall()
         return rows
     
@@ -155,6 +242,18 @@ class PostgresDB:
         return bool(row)
     
     
+    def assign_employees_to_device(self, device_id: int, employee_ids: List[int],
+                                   assigned_by: Optional[int]=None) -> List[int]:
+        """
+        Assign many employees in a single INSERT ... SELECT FROM UNNEST.
+        Returns the employee_ids that were newly assigned (existing pairs are skipped).
+        """
+        self.cursor.execute(ASSIGN_EMPLOYEES_QUERY, (device_id, assigned_by, list(employee_ids)))
+        rows = self.cursor.fetchall()
+        self.conn.commit()
+        return [r['employee_id'] for r in rows]
+    
+    
     def get_assigned_employees(self, device_id: int) -> List[Dict]:
         query = """
         SELECT da.id, da.device_id, da.employee_id, u.username, da.assigned_at
@@ -191,8 +290,7 @@ class PostgresDB:
         self.conn.commit()
     
     def is_employee_assigned_to_device(self, device_id: int, employee_id: int) -> bool:
-        query = "SELECT 1 FROM device_assignments WHERE device_id = %s AND employee_id = %s;"
-        self.cursor.execute(query, (device_id, employee_id))
+        self.cursor.execute(EMPLOYEE_ASSIGNED_QUERY, (device_id, employee_id))
         return bool(self.cursor.fetchone())
     
     # ----------------------------
@@ -212,7 +310,7 @@ class PostgresDB:
     
 
     def get_user_by_username(self, username: str) -> Optional[Dict]:
-        query = "SELECT * FROM users WHERE username = %s;"
+        query = f"SELECT {USER_COLUMNS} FROM users WHERE username = %s;"
         self.cursor.execute(query, (username,))
         return self.cursor.fetchone()
     
@@ -229,11 +327,5 @@ class PostgresDB:
     
 
     def get_user_status(self, employee_id: int) -> Optional[Dict]:
-        query = """
-            SELECT username, is_active 
-            FROM users 
-            WHERE employee_id = %s 
-            LIMIT 1;
-        """
-        self.cursor.execute(query, (employee_id,))
+        self.cursor.execute(USER_STATUS_QUERY, (employee_id,))
         return self.cursor.fetchone()
\ No newline at end of file
@@ -0,0 +1,116 @@
+# backend/fastapi_app/db/prepared.py
+"""
+Server-side prepared statements for the hot auth/status queries.
+
+psycopg3 keeps a per-connection cache of prepared statements keyed by the SQL text:
+a statement executed with prepare=True is PREPAREd on that pooled connection the
+first time and EXECUTEd by name afterwards, so Postgres skips parsing and, once it
+settles on a generic plan, planning. Registered queries are always prepared; every
+other query is auto-prepared after POSTGRES_PREPARE_THRESHOLD executions on a
+connection (psycopg's prepare_threshold, see connection.get_async_pg_pool).
+
+The registry also keeps per-statement counters for GET /metrics/prepared-statements:
+executions, the number of connections it has been prepared on, and an estimate of
+plan time saved. The plan time of each statement is the best of PLAN_SAMPLES
+EXPLAIN (SUMMARY) runs with its sample parameters, taken once per process by a
+background task at startup (measure_plan_times), never on the request path. Postgres
+plans the first CUSTOM_PLAN_EXECUTIONS executions of a prepared statement individually
+before it may switch to a generic plan, so those executions are not counted as saved.
+"""
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_PLAN_EXECUTIONS = 5
+PLAN_SAMPLES = 3
+
+_PLANNING_TIME = re.compile(r"Planning Time: ([0-9.]+) ms")
+
+
+class _StatementStats:
+    __slots__ = ("name", "sample_params", "executions", "backends", "plan_ms")
+
+    def __init__(self, name: str, sample_params: Any):
+        self.name = name
+        self.sample_params = sample_params
+        self.executions = 0
+        self.backends: set = set()
+        self.plan_ms: Optional[float] = None
+
+
+class PreparedStatementRegistry:
+    def __init__(self):
+        self._by_query: Dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+        self._measuring = False
+
+    def register(self, name: str, query: str, sample_params: Any = ()) -> str:
+        """
+        Mark query as hot (always prepared). sample_params are only used to EXPLAIN it.
+        Returns the query, so it can wrap a constant.
+        """
+        self._by_query[query] = _StatementStats(name, sample_params)
+        return query
+
+    def prepare_flag(self, query: str) -> Optional[bool]:
+        """prepare= for conn.execute: True for registered queries, else psycopg's threshold."""
+        return True if query in self._by_query else None
+
+    def record(self, query: str, backend_pid: int) -> None:
+        stats = self._by_query.get(query)
+        if stats is None:
+            return
+        with self._lock:
+            stats.executions += 1
+            stats.backends.add(backend_pid)
+
+    @staticmethod
+    async def _plan_time(conn, query: str, params: Sequence[Any]) -> Optional[float]:
+        """Best of PLAN_SAMPLES EXPLAIN (SUMMARY) planning times for query, in ms."""
+        samples = []
+        for _ in range(PLAN_SAMPLES):
+            cur = await conn.execute(f"EXPLAIN (SUMMARY ON) {query}", params)
+            for row in await cur.fetchall():
+                match = _PLANNING_TIME.search(row["QUERY PLAN"])
+                if match:
+                    samples.append(float(match.group(1)))
+        return min(samples) if samples else None
+
+    async def measure_plan_times(self, pool) -> None:
+        """
+        Fill in plan_ms of the registered statements, once per process (later calls
+        return at once). Meant to run as a background task; a statement whose EXPLAIN
+        fails is logged and keeps plan_ms unset.
+        """
+        if self._measuring:
+            return
+        self._measuring = True
+        for query, stats in list(self._by_query.items()):
+            try:
+                async with pool.connection() as conn:
+                    stats.plan_ms = await self._plan_time(conn, query, stats.sample_params)
+            except Exception as e:
+                logger.warning(f"Could not measure plan time of {stats.name}: {e}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for stats in self._by_query.values():
+                prepared_on = len(stats.backends)
+                replanned = min(stats.executions, prepared_on * CUSTOM_PLAN_EXECUTIONS)
+                saved = None
+                if stats.plan_ms is not None:
+                    saved = round((stats.executions - replanned) * stats.plan_ms, 3)
+                result[stats.name] = {
+                    "executions": stats.executions,
+                    "prepared_connections": prepared_on,
+                    "plan_ms": stats.plan_ms,
+                    "plan_ms_saved_estimate": saved,
+                }
+            return result
+
+
+PREPARED_STATEMENTS = PreparedStatementRegistry()
@@ -1,6 +1,6 @@
 # backend/fastapi_app/db/repos/assignment_repo.py
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -20,23 +20,12 @@ class AssignmentRepository:
     
     def assign_users_to_device(self, device_id: int, employee_id: List[int], assigned_by: Optional[int] = None) -> int:
         """
-        Insert multiple employee assignments for the device.
+        Insert multiple employee assignments for the device in one multi-row statement.
         Uses ON CONFLICT DO NOTHING to avoid duplicate errors.
         Returns the number of rows actually inserted.
         """
-        inserted = 0
         try:
-            for emp in employee_id:
-                try:
-                    row = self._db.assign_employee_to_device(device_id, emp, assigned_by)
-                    if row:
-                        inserted += 1
-                except Exception as e:
-                    logger.warning(f"Failed to insert assignment for employee = {emp}: {e}")
-                    self._db.conn.rollback()
-                    continue
-            return inserted
-        
+            return len(self._db.assign_employees_to_device(device_id, employee_id, assigned_by))
         except Exception as e:
             logger.exception(f"Bulk assingment failed: {e}")
             self._db.conn.rollback()
@@ -73,3 +62,72 @@ class AssignmentRepository:
         except Exception as e:
             logger.exception(f"Failed removing assignments: {e}")
             raise
+
+
+class AsyncAssignmentRepository:
+    """
+    asyncio twin of AssignmentRepository, wrapping AsyncPostgresDB.
+    """
+    def __init__(self, postgres):
+        self._db = postgres
+
+
+    async def is_user_assigned_to_device(self, employee_id: int, device_id: int) -> bool:
+        try:
+            return await self._db.is_employee_assigned_to_device(device_id, employee_id)
+        except Exception as e:
+            logger.exception(f"Check assingment failed: {e}")
+            raise
+
+
+    async def assign_users_to_device(self, device_id: int, employee_id: List[int],
+                                     assigned_by: Optional[int] = None) -> int:
+        """
+        Insert multiple employee assignments for the device in one multi-row statement.
+        Returns the number of rows actually inserted.
+        """
+        try:
+            return len(await self._db.assign_employees_to_device(device_id, employee_id, assigned_by))
+        except Exception as e:
+            logger.exception(f"Bulk assingment failed: {e}")
+            raise
+
+
+    async def bulk_assign(self, pairs: List[Tuple[int, int]], assigned_by: Optional[int] = None) -> List[Dict[str, Any]]:
+        try:
+            return await self._db.bulk_assign_employees(pairs, assigned_by)
+        except Exception as e:
+            logger.exception(f"Bulk multi-device assignment failed: {e}")
+            raise
+
+
+    async def get_assignments_for_device(self, device_id) -> List[Dict[str, Any]]:
+        try:
+            return await self._db.get_assignments_for_device(device_id) or []
+        except Exception as e:
+            logger.exception(f"Failed to load device assignments: {e}")
+            raise
+
+
+    async def validate_employees(self, employee_ids: List[int]) -> List[int]:
+        """
+        Return subset of employee_ids that actually exist in users.employee_id
+        """
+        if not employee_ids:
+            return []
+
+        try:
+            rows = await self._db.validate_employee_ids(employee_ids)
+            return [r['employee_id'] for r in rows] if rows else []
+        except Exception as e:
+            logger.exception(f"Failed validating employees: {e}")
+            raise
+
+
+    async def remove_assignments(self, device_id: int) -> bool:
+        try:
+            await self._db.remove_assignments_for_device(device_id)
+            return True
+        except Exception as e:
+            logger.exception(f"Failed removing assignments: {e}")
+            raise
@@ -1,6 +1,9 @@
 # backend/fastapi_app/db/repos/device_repo.py
 import logging
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+from backend.fastapi_app.db.postgres_db import DeviceAuthRow
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,10 @@ class DeviceRepository:
         return self._db.get_device_by_id(device_id)
     
 
+    def get_auth_by_uuid(self, device_uuid: str) -> Optional[DeviceAuthRow]:
+        return self._db.get_device_auth(device_uuid)
+    
+
     def set_credential_hash(self, device_id: int, credential_hash: str, status: str = "active",
                             device_name: str = None, app_version: str = None, os_version: str = None):
         self._db.set_device_credential(device_id, credential_hash, status, device_name, app_version, os_version)
@@ -40,18 +47,18 @@ class DeviceRepository:
 
     
     def device_has_credential(self, device_uuid: str) -> bool:
-        dev = self.get_by_uuid(device_uuid)
-        if not dev:
-            return False
-        return bool(dev.get("credential_hash"))
+        dev = self.get_auth_by_uuid(device_uuid)
+        return bool(dev and dev.credential_hash)
     
 
-    def get_pending_devices(self, limit: int) -> List[Dict[str, Any]]:
-        return self._db.get_pending_devices(limit)
+    def get_pending_devices(self, limit: int, after: Optional[Tuple[datetime, int]] = None,
+                            site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._db.get_pending_devices(limit, after=after, site=site)
     
 
-    def get_all_devices(self, limit: int) -> List[Dict[str, Any]]:
-        return self._db.get_all_devices(limit)
+    def get_all_devices(self, limit: int, after: Optional[Tuple[datetime, int]] = None,
+                        status: Optional[str] = None, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._db.get_all_devices(limit, after=after, status=status, site=site)
     
 
     def clear_token(self, device_id: int):
@@ -59,4 +66,84 @@ class DeviceRepository:
             self._db.clear_token(device_id)
         except Exception as e:
             logger.exception(f"Failed to clear token: {e}")
-            raise
\ No newline at end of file
+            raise
+
+class AsyncDeviceRepository:
+    """
+    asyncio twin of DeviceRepository, wrapping AsyncPostgresDB.
+    """
+
+    def __init__(self, postgres):
+        self._db = postgres
+
+
+    async def create_register_request(self, device_uuid: str, device_name: str = None,
+                                      assigned_site: str = None, app_version: str = None,
+                                      os_version: str = None, registered_by: int = None) -> Optional[int]:
+        return await self._db.add_device_registration(device_uuid, device_name, assigned_site,
+                                                      app_version, os_version, registered_by)
+
+
+    async def get_by_uuid(self, device_uuid: str) -> Optional[Dict[str, Any]]:
+        return await self._db.get_device_by_uuid(device_uuid)
+
+
+    async def get_by_id(self, device_id: int) -> Optional[Dict[str, Any]]:
+        return await self._db.get_device_by_id(device_id)
+
+
+    async def get_auth_by_uuid(self, device_uuid: str) -> Optional[DeviceAuthRow]:
+        return await self._db.get_device_auth(device_uuid)
+
+
+    async def get_operator_auth_context(self, device_uuid: str, employee_id: int) -> Optional[Dict[str, Any]]:
+        return await self._db.get_operator_auth_context(device_uuid, employee_id)
+
+
+    async def set_credential_hash(self, device_id: int, credential_hash: str, status: str = "active",
+                                  device_name: str = None, app_version: str = None, os_version: str = None):
+        await self._db.set_device_credential(device_id, credential_hash, status, device_name,
+                                             app_version, os_version)
+
+
+    async def update_status(self, device_id: int, status: str):
+        await self._db.update_device_status(device_id, status)
+
+
+    async def device_has_credential(self, device_uuid: str) -> bool:
+        dev = await self.get_auth_by_uuid(device_uuid)
+        return bool(dev and dev.credential_hash)
+
+
+    async def get_pending_devices(self, limit: int, after: Optional[Tuple[datetime, int]] = None,
+                                  site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._db.get_pending_devices(limit, after=after, site=site)
+
+
+    async def get_all_devices(self, limit: int, after: Optional[Tuple[datetime, int]] = None,
+                              status: Optional[str] = None, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._db.get_all_devices(limit, after=after, status=status, site=site)
+
+
+    async def bulk_approve(self, device_ids: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return await self._db.bulk_approve_devices(device_ids)
+        except Exception as e:
+            logger.exception(f"Bulk approve failed: {e}")
+            raise
+
+
+    async def bulk_reject(self, device_ids: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return await self._db.bulk_reject_devices(device_ids)
+        except Exception as e:
+            logger.exception(f"Bulk reject failed: {e}")
+            raise
+
+
+    async def clear_token(self, device_id: int):
+        try:
+            await self._db.clear_token(device_id)
+        except Exception as e:
+            logger.exception(f"Failed to clear token: {e}")
+            raise
@@ -1,21 +1,22 @@
 # backend/app/db/repos/user_repo.py
 from typing import Optional, Dict, Any
 
+USER_BY_USERNAME_QUERY = """
+    SELECT u.employee_id, u.username, u.password_hash, u.role, u.is_active, e.name AS employee_name
+    FROM users u
+    LEFT JOIN employees e ON e.employee_id = u.employee_id
+    WHERE u.username = %s
+    LIMIT 1;
+"""
+
 class UserRepository:
     def __init__(self, postgres):
         self._db = postgres
 
     
     def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
-        query = """
-            SELECT u.employee_id, u.username, u.password_hash, u.role, u.is_active, e.name AS employee_name
-            FROM users u
-            LEFT JOIN employees e ON e.employee_id = u.employee_id
-            WHERE u.username = %s
-            LIMIT 1;
-        """
         try:
-            self._db.cursor.execute(query, (username,))
+            self._db.cursor.execute(USER_BY_USERNAME_QUERY, (username,))
             return self._db.cursor.fetchone()
         except Exception:
             return None
@@ -26,3 +27,15 @@ class UserRepository:
             self._db.close()
         except Exception:
             pass
+
+
+class AsyncUserRepository:
+    def __init__(self, postgres):
+        self._db = postgres
+
+
+    async def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._db.fetchone(USER_BY_USERNAME_QUERY, (username,))
+        except Exception:
+            return None
@@ -19,4 +19,8 @@ def create_devices_table(cursor):
     """
     cursor.execute(query)
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_status ON devices(status);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_uuid ON devices(device_uuid);")
\ No newline at end of file
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_uuid ON devices(device_uuid);")
+    # keyset pagination for admin listings: (created_at, device_id) DESC, optionally per status/site
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_created_id ON devices (created_at DESC, device_id DESC);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_status_created_id ON devices (status, created_at DESC, device_id DESC);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_devices_site_created_id ON devices (assigned_site, created_at DESC, device_id DESC);")
\ No newline at end of file
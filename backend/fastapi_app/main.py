@@ -1,38 +1,65 @@
 # backend/fastapi_app/main.py
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from backend.fastapi_app.db.postgres_db import PostgresDB
-from backend.fastapi_app.db.mongo_db import MongoDB
+from backend.fastapi_app.db.async_postgres_db import AsyncPostgresDB
+from backend.fastapi_app.db.async_mongo_db import AsyncMongoDB
+from backend.fastapi_app.db.prepared import PREPARED_STATEMENTS
+from backend.fastapi_app.db.mongo_migrations import LATEST_VERSION as LATEST_MONGO_SCHEMA
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.core.status_notifier import status_notifier
+from backend.fastapi_app.core.gzip_request import GZipRequestMiddleware
+from backend.fastapi_app.api.deps import admin_required
 
 from backend.fastapi_app.api.v1.auth import router as auth_router
 from backend.fastapi_app.api.v1.devices import router as devices_router
 from backend.fastapi_app.api.v1.admin_devices import router as admin_devices_router
+from backend.fastapi_app.api.v1.attendance import router as attendance_router
+from backend.fastapi_app.api.v1.gallery import router as gallery_router
+from backend.fastapi_app.api.v1.admin_employees import router as admin_employees_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     # ---------------- Startup ----------------
-    app.state.postgres = PostgresDB()
-    app.state.mongo = MongoDB()
+    app.state.postgres = AsyncPostgresDB()
+    await app.state.postgres.open()
+    app.state.mongo = AsyncMongoDB()
+    # plan-time metrics for the prepared hot queries, off the request path
+    app.state.plan_time_task = asyncio.create_task(
+        PREPARED_STATEMENTS.measure_plan_times(app.state.postgres.pool))
 
-    print("Databases initialized (Postgres + MongoDB)")
+    schema_version = await app.state.mongo.get_schema_version()
+    if schema_version < LATEST_MONGO_SCHEMA:
+        print(f"WARNING: Mongo schema v{schema_version} < v{LATEST_MONGO_SCHEMA}; "
+              "run `python -m backend.fastapi_app.manage migrate-mongo`")
+
+    # Relay status changes between workers via LISTEN/NOTIFY (single worker doesn't need it)
+    if getattr(settings, "DEVICE_STATUS_LISTEN", False):
+        await status_notifier.start_listener(app.state.postgres.pool)
+
+    print("Databases initialized (async Postgres pool + MongoDB)")
 
     yield
 
     # ---------------- Shutdown ----------------
+    await status_notifier.stop_listener()
+    app.state.plan_time_task.cancel()
+
     try:
-        app.state.postgres.close()
+        await app.state.postgres.close()
         print("Postgres connection closed")
     except Exception as e:
         print("Postgres close failed:", e)
 
     try:  
-        app.state.mongo.client.close()
+        await app.state.mongo.close()
         print("MongoDB connection closed")
-    except Exception:
+    except Exception as e:
         print("Mongo close failed:", e)
 
 def create_app() -> FastAPI:
@@ -49,18 +76,32 @@ def create_app() -> FastAPI:
         allow_origins=["*"],
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "X-Gallery-Revision", "X-Gallery-Encoding",
+                        "X-Gallery-Scope"],
     )
 
+    # gzip: compress responses over 1 KB, inflate gzip-encoded request bodies
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(GZipRequestMiddleware)
+
     # Register API routers
     app.include_router(auth_router)
     app.include_router(devices_router)
     app.include_router(admin_devices_router)
+    app.include_router(attendance_router)
+    app.include_router(gallery_router)
+    app.include_router(admin_employees_router)
 
     @app.get("/health")
-    def health():
+    async def health():
         return {
             "status": "ok"
         }
+
+    @app.get("/metrics/prepared-statements")
+    async def prepared_statement_metrics(admin=Depends(admin_required)):
+        # per worker process: executions, connections prepared on, estimated plan time saved
+        return PREPARED_STATEMENTS.snapshot()
     
     return app
 
@@ -0,0 +1,81 @@
+# backend/fastapi_app/manage.py
+# Management commands for one-off operational tasks.
+#
+#   python -m backend.fastapi_app.manage migrate-mongo
+#   python -m backend.fastapi_app.manage mongo-schema-version
+#   python -m backend.fastapi_app.manage apply-event-log-retention
+#   python -m backend.fastapi_app.manage rollup-event-logs [--hours 48]
+import argparse
+import logging
+import sys
+
+from backend.fastapi_app.db.mongo_db import MongoDB
+from backend.fastapi_app.db import event_logs, mongo_migrations
+
+
+def cmd_migrate_mongo(args) -> int:
+    mongo = MongoDB()
+    try:
+        before = mongo_migrations.get_schema_version(mongo.db)
+        after = mongo_migrations.migrate(mongo.db)
+        print(f"Mongo schema: v{before} -> v{after} (latest v{mongo_migrations.LATEST_VERSION})")
+        return 0
+    finally:
+        mongo.close()
+
+
+def cmd_mongo_schema_version(args) -> int:
+    mongo = MongoDB()
+    try:
+        version = mongo_migrations.get_schema_version(mongo.db)
+        print(f"Mongo schema: v{version} (latest v{mongo_migrations.LATEST_VERSION})")
+        return 0 if version >= mongo_migrations.LATEST_VERSION else 1
+    finally:
+        mongo.close()
+
+
+def cmd_apply_event_log_retention(args) -> int:
+    mongo = MongoDB()
+    try:
+        seconds = event_logs.retention_seconds()
+        for name in event_logs.EVENT_LOGS:
+            event_logs.apply_retention(mongo.db, name, seconds)
+        print(f"Event log retention: {seconds // 86400 if seconds else 'unlimited'} days")
+        return 0
+    finally:
+        mongo.close()
+
+
+def cmd_rollup_event_logs(args) -> int:
+    mongo = MongoDB()
+    try:
+        end = event_logs.rollup_event_logs(mongo.db, hours=args.hours)
+        print(f"Event logs rolled up to {end.isoformat()} ({args.hours}h window)")
+        return 0
+    finally:
+        mongo.close()
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(name)s | %(message)s")
+
+    parser = argparse.ArgumentParser(prog="manage", description="Smart Attendance backend management")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("migrate-mongo", help="apply pending MongoDB index/schema steps").set_defaults(
+        func=cmd_migrate_mongo)
+    sub.add_parser("mongo-schema-version", help="print the applied MongoDB schema version").set_defaults(
+        func=cmd_mongo_schema_version)
+    sub.add_parser("apply-event-log-retention",
+                   help="apply EVENT_LOG_RETENTION_DAYS to device_logs and user_login_logs").set_defaults(
+        func=cmd_apply_event_log_retention)
+    rollup = sub.add_parser("rollup-event-logs", help="recompute hourly counts of recent device/login events")
+    rollup.add_argument("--hours", type=int, default=event_logs.ROLLUP_LOOKBACK_HOURS)
+    rollup.set_defaults(func=cmd_rollup_event_logs)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# backend/fastapi_app/schemas/attendance.py
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
+from datetime import datetime, timezone
+
+
+class AttendancePunchDTO(BaseModel):
+    """
+    One kiosk punch, shaped like desktop_app AttendanceRecord.
+    """
+    employee_id: str = Field(..., min_length=1, max_length=64)
+    name: str = Field(..., max_length=200)
+    department: Optional[str] = Field(None, max_length=200)
+    status: str = Field(..., min_length=1, max_length=32)
+    remarks: Optional[str] = Field(None, max_length=200)
+    marked_by: str = Field("System", max_length=100)
+    timestamp: datetime
+
+    @field_validator("status")
+    @classmethod
+    def _lower_status(cls, value: str) -> str:
+        return value.strip().lower()
+
+    @field_validator("timestamp")
+    @classmethod
+    def _utc_timestamp(cls, value: datetime) -> datetime:
+        # naive timestamps from kiosks are UTC (AttendanceRecord uses current_datetime_utc)
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+
+class AttendanceBatchRequestDTO(BaseModel):
+    records: List[AttendancePunchDTO] = Field(..., min_items=1, max_items=1000)
+
+
+class AttendanceBatchErrorDTO(BaseModel):
+    index: int
+    employee_id: Optional[str] = None
+    error: str
+
+
+class AttendanceBatchResultDTO(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+    errors: List[AttendanceBatchErrorDTO] = []
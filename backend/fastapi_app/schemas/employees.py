@@ -0,0 +1,13 @@
+# backend/fastapi_app/schemas/employees.py
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class EmployeeSitesDTO(BaseModel):
+    # empty list = employee may punch in at any site
+    sites: List[str] = Field(default_factory=list, max_items=100)
+
+
+class EmployeeSitesResponseDTO(BaseModel):
+    employee_id: int
+    sites: List[str]
@@ -34,6 +34,32 @@ class AssignRequestDTO(BaseModel):
     employee_ids: List[int] = Field(..., min_items=1)
 
 
+class BulkDeviceActionDTO(BaseModel):
+    device_ids: List[int] = Field(..., min_items=1, max_items=500)
+
+
+class DeviceAssignmentDTO(BaseModel):
+    device_id: int
+    employee_ids: List[int] = Field(..., min_items=1)
+
+
+class BulkAssignRequestDTO(BaseModel):
+    assignments: List[DeviceAssignmentDTO] = Field(..., min_items=1, max_items=500)
+
+
+class BulkItemResultDTO(BaseModel):
+    device_id: int
+    employee_id: Optional[int] = None
+    outcome: str
+    status: Optional[str] = None
+
+
+class BulkResultDTO(BaseModel):
+    requested: int
+    succeeded: int
+    results: List[BulkItemResultDTO]
+
+
 class PendingDeviceDTO(BaseModel):
     device_id: int
     device_uuid: str
@@ -1,13 +1,34 @@
 import logging
-from typing import Optional, Dict, List, Any
-from backend.fastapi_app.db.repos.device_repo import DeviceRepository
-from backend.fastapi_app.services.device_service import DeviceService
-from backend.fastapi_app.db.repos.assignment_repo import AssignmentRepository
+from typing import Optional, Dict, List, Any, Tuple
+from backend.fastapi_app.db.repos.device_repo import DeviceRepository, AsyncDeviceRepository
+from backend.fastapi_app.services.device_service import DeviceService, AsyncDeviceService
+from backend.fastapi_app.db.repos.assignment_repo import AssignmentRepository, AsyncAssignmentRepository
+from backend.fastapi_app.core.pagination import encode_cursor, decode_cursor
+from backend.fastapi_app.core.status_notifier import status_notifier
 from desktop_app.utils.utils import current_datetime_utc
 
 logger = logging.getLogger(__name__)
 
 
+def _split_page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Rows were fetched with limit + 1; the extra row only tells us another page exists.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last["created_at"], last["device_id"])
+
+
+def _bulk_summary(results: List[Dict[str, Any]], success_outcomes: Tuple[str, ...]) -> Dict[str, Any]:
+    return {
+        "requested": len(results),
+        "succeeded": sum(1 for r in results if r["outcome"] in success_outcomes),
+        "results": results
+    }
+
+
 class AdminService:
     """
     Core provisioning engine. No API exposure here — this is pure service layer.
@@ -19,21 +40,26 @@ class AdminService:
         self.mongo_db = mongo
 
 
-    def list_pending_devices(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def list_pending_devices(self, limit: int = 100, cursor: Optional[str] = None,
+                             site: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Return devices with status = 'pending'
+        Return one page of devices with status = 'pending' and the next-page token (or None).
+        Raises ValueError for a malformed cursor.
         """
+        after = decode_cursor(cursor) if cursor else None
         try:
-            rows = self.device_repo.get_pending_devices(limit=limit)
-            return rows
+            rows = self.device_repo.get_pending_devices(limit=limit + 1, after=after, site=site)
+            return _split_page(rows, limit)
         except Exception as e:
                 logger.exception(f"Failed to list pending devices: {e}")
                 raise
     
-    def list_all_devices(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def list_all_devices(self, limit: int = 100, cursor: Optional[str] = None, status: Optional[str] = None,
+                         site: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        after = decode_cursor(cursor) if cursor else None
         try:
-            rows = self.device_repo.get_all_devices(limit=limit)
-            return rows
+            rows = self.device_repo.get_all_devices(limit=limit + 1, after=after, status=status, site=site)
+            return _split_page(rows, limit)
         except Exception as e:
                 logger.exception(f"Failed to list all devices: {e}")
                 raise
@@ -185,3 +211,278 @@ class AdminService:
         except Exception as e:
             logger.exception(f"Failed assigning users to device {device_id}: {e}")
             raise
+
+
+class AsyncAdminService:
+    """
+    asyncio twin of AdminService used by the admin routers.
+    """
+    def __init__(self, postgres, mongo):
+        self.device_repo = AsyncDeviceRepository(postgres)
+        self.device_service = AsyncDeviceService(postgres, mongo)
+        self.assignment_repo = AsyncAssignmentRepository(postgres)
+        self.mongo_db = mongo
+
+
+    async def list_pending_devices(self, limit: int = 100, cursor: Optional[str] = None,
+                                   site: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            rows = await self.device_repo.get_pending_devices(limit=limit + 1, after=after, site=site)
+            return _split_page(rows, limit)
+        except Exception as e:
+            logger.exception(f"Failed to list pending devices: {e}")
+            raise
+
+
+    async def list_all_devices(self, limit: int = 100, cursor: Optional[str] = None,
+                               status: Optional[str] = None,
+                               site: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            rows = await self.device_repo.get_all_devices(limit=limit + 1, after=after, status=status, site=site)
+            return _split_page(rows, limit)
+        except Exception as e:
+            logger.exception(f"Failed to list all devices: {e}")
+            raise
+
+
+    async def get_device_details(self, device_id: int) -> Dict[str, Any]:
+        """
+        Returns detailed device info including assignments and recent device logs.
+        """
+        dev = await self.device_repo.get_by_id(device_id)
+        if not dev:
+            return None
+
+        assignments = await self.assignment_repo.get_assignments_for_device(device_id)
+
+        try:
+            logs = await self.mongo_db.get_device_logs(device_id, limit=50)
+        except Exception as e:
+            logger.warning(f"Failed to fetch logs for device {device_id}: {e}")
+            logs = []
+
+        return {
+            "device": dev,
+            "assignments": assignments,
+            "recent_logs": logs
+        }
+
+
+    async def approve_device(self, device_id: int, approver_employee_id: int) -> bool:
+        return await self.device_service.approve_device(device_id, approver_employee_id)
+
+
+    async def reject_device(self, device_id: int, approver_employee_id: int) -> str:
+        """
+        Reject a pending device or revoke an active one, logging the event in mongo.
+        Returns status.
+        """
+        try:
+            dev = await self.device_repo.get_by_id(device_id)
+            if not dev:
+                raise ValueError(f"Device {device_id} not found")
+
+            device_uuid = dev.get("device_uuid")
+
+            if dev['status'] == 'pending':
+                status = "rejected"
+                await self.device_repo.update_status(device_id, status=status)
+
+                await self.mongo_db.log_device_event(
+                    device_id=device_id,
+                    device_uuid=device_uuid,
+                    user_id=approver_employee_id,
+                    event_type="reject_pending_device",
+                    details={
+                        "reason": "rejected before approval"
+                    }
+                )
+                await status_notifier.publish(device_uuid)
+                return status
+            elif dev["status"] == "active":
+                status = "revoked"
+                await self.assignment_repo.remove_assignments(device_id)
+                await self.device_repo.clear_token(device_id)
+                await self.device_repo.update_status(device_id, status=status)
+
+                await self.mongo_db.log_device_event(
+                    device_id=device_id,
+                    device_uuid=device_uuid,
+                    user_id=approver_employee_id,
+                    event_type="reject_approved_device",
+                    details={
+                        "reason": "device revoked by admin"
+                    }
+                )
+                await status_notifier.publish(device_uuid)
+                return status
+        except Exception as e:
+            logger.exception(f"Failed to reject device {device_id}: {e}")
+            raise
+
+
+    # ---------- Bulk operations (one transaction + one audit batch each) ----------
+
+    async def bulk_approve_devices(self, device_ids: List[int], approver_employee_id: int) -> Dict[str, Any]:
+        rows = await self.device_repo.bulk_approve(device_ids)
+
+        results, events = [], []
+        for row in rows:
+            if row["previous_status"] is None:
+                outcome = "not_found"
+            elif row["updated"]:
+                outcome = "approved"
+                events.append({
+                    "device_id": row["device_id"],
+                    "device_uuid": row["device_uuid"],
+                    "user_id": approver_employee_id,
+                    "event_type": "approved",
+                    "details": {"approved_by": approver_employee_id, "bulk": True}
+                })
+            else:
+                outcome = "already_active"
+            results.append({
+                "device_id": row["device_id"],
+                "outcome": outcome,
+                "status": "active" if row["previous_status"] else None
+            })
+
+        await self._log_bulk_events(events)
+        await self._publish_status_changes(events)
+        return _bulk_summary(results, success_outcomes=("approved",))
+
+
+    async def bulk_reject_devices(self, device_ids: List[int], approver_employee_id: int) -> Dict[str, Any]:
+        rows = await self.device_repo.bulk_reject(device_ids)
+
+        results, events = [], []
+        for row in rows:
+            new_status = row["new_status"]
+            if row["previous_status"] is None:
+                outcome = "not_found"
+            elif new_status is None:
+                outcome = "invalid_state"
+            else:
+                outcome = new_status
+                events.append({
+                    "device_id": row["device_id"],
+                    "device_uuid": row["device_uuid"],
+                    "user_id": approver_employee_id,
+                    "event_type": "reject_pending_device" if new_status == "rejected" else "reject_approved_device",
+                    "details": {
+                        "reason": "rejected before approval" if new_status == "rejected" else "device revoked by admin",
+                        "bulk": True
+                    }
+                })
+            results.append({
+                "device_id": row["device_id"],
+                "outcome": outcome,
+                "status": new_status or row["previous_status"]
+            })
+
+        await self._log_bulk_events(events)
+        await self._publish_status_changes(events)
+        return _bulk_summary(results, success_outcomes=("rejected", "revoked"))
+
+
+    async def bulk_assign_users(self, assignments: List[Dict[str, Any]], assigned_by: int) -> Dict[str, Any]:
+        """
+        assignments: [{"device_id": int, "employee_ids": [int, ...]}, ...]
+        """
+        pairs = sorted({
+            (item["device_id"], emp)
+            for item in assignments
+            for emp in item["employee_ids"]
+        })
+        rows = await self.assignment_repo.bulk_assign(pairs, assigned_by)
+
+        results, events = [], []
+        for row in rows:
+            results.append({
+                "device_id": row["device_id"],
+                "employee_id": row["employee_id"],
+                "outcome": row["outcome"]
+            })
+            if row["outcome"] == "assigned":
+                events.append({
+                    "device_id": row["device_id"],
+                    "device_uuid": row["device_uuid"],
+                    "user_id": assigned_by,
+                    "event_type": "employee_assigned",
+                    "details": {"employee_id": row["employee_id"], "bulk": True}
+                })
+
+        await self._log_bulk_events(events)
+        return _bulk_summary(results, success_outcomes=("assigned",))
+
+
+    async def _log_bulk_events(self, events: List[Dict[str, Any]]) -> None:
+        # Postgres is already committed; a failed audit write must not fail the request.
+        try:
+            await self.mongo_db.log_device_events_bulk(events)
+        except Exception as e:
+            logger.warning(f"Failed to write {len(events)} bulk audit events: {e}")
+
+
+    async def _publish_status_changes(self, events: List[Dict[str, Any]]) -> None:
+        # wake any device long-polling /status/{uuid}/wait
+        for event in events:
+            await status_notifier.publish(event["device_uuid"])
+
+
+    async def force_reset_token(self, device_id: int, admin_id: int) -> bool:
+        """
+        Clear credential_hash so device must fetch a new token later.
+        """
+        try:
+            await self.device_repo.clear_token(device_id)
+            dev = await self.device_repo.get_by_id(device_id)
+            if not dev:
+                raise ValueError("Device not found after clearing token")
+
+            await self.mongo_db.log_device_event(
+                device_id=device_id,
+                device_uuid=dev.get("device_uuid"),
+                user_id=admin_id,
+                event_type="force_reset_token",
+                details={
+                    "timestamp": current_datetime_utc()
+                }
+            )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to force reset token for device {device_id}: {e}")
+            raise
+
+
+    async def assign_users(self, device_id: int, employee_ids: List[int], assigned_by: int) -> Dict[str, Any]:
+        """
+        Assign multiple employee_ids to a device.
+        Returns a summary dict { assigned_count, requested_count }
+        """
+        dev = await self.device_repo.get_by_id(device_id)
+        if not dev:
+            raise ValueError("device not found")
+
+        valid_employees = await self.assignment_repo.validate_employees(employee_ids)
+        if not valid_employees:
+            raise ValueError("No valid employees found")
+
+        invalid = [emp for emp in employee_ids if emp not in valid_employees]
+
+        try:
+            created_count = await self.assignment_repo.assign_users_to_device(device_id, valid_employees, assigned_by)
+            assignments = await self.assignment_repo.get_assignments_for_device(device_id)
+
+            return {
+                "assigned": True,
+                "requested": len(employee_ids),
+                "created_count": created_count,
+                "invalid_employee_ids": invalid,
+                "assignments": assignments
+            }
+        except Exception as e:
+            logger.exception(f"Failed assigning users to device {device_id}: {e}")
+            raise
@@ -0,0 +1,110 @@
+# backend/fastapi_app/services/attendance_service.py
+import logging
+from datetime import datetime, timedelta, timezone, time
+from typing import List, Dict, Any, Optional
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.schemas.attendance import AttendancePunchDTO
+from desktop_app.services.shift_policy import ShiftPolicy, ShiftPolicyIndex
+from desktop_app.utils.utils import current_datetime_utc, normalize_department, normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Kiosks may flush a backlog after being offline, but not arbitrarily old or future punches.
+MAX_BACKFILL = timedelta(days=7)
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+# Kiosks don't know their site, the server does: present punches are classified here with the
+# default shift and the optional SHIFT_POLICY_OVERRIDES setting (same rows as desktop_app config.py).
+SHIFT_POLICIES = ShiftPolicyIndex.from_rows(ShiftPolicy(), getattr(settings, "SHIFT_POLICY_OVERRIDES", None) or ())
+
+
+def _utc_midnight(ts: datetime) -> datetime:
+    return datetime.combine(ts.astimezone(timezone.utc).date(), time(0, 0, 0, tzinfo=timezone.utc))
+
+
+def _employee_id(value: str):
+    # punches written by the kiosk itself carry the Postgres id as an int; store uploads the same way.
+    # isdigit() alone also accepts e.g. "²", which int() rejects.
+    return int(value) if value.isascii() and value.isdigit() else value
+
+
+class AsyncAttendanceService:
+    """
+    Server-side attendance ingestion for kiosks. Kiosks post punches here instead of
+    holding Mongo credentials; writes go through one unordered bulk upsert per batch.
+    """
+    def __init__(self, mongo):
+        self.mongo_db = mongo
+
+
+    @staticmethod
+    def to_document(punch: AttendancePunchDTO, device_id: int, device_uuid: str,
+                    operator_id: int, site: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Same shape as desktop_app AttendanceRecord.to_dict(), plus the submitting device.
+        Present punches get the remark of the employee's / site's shift, not the kiosk's.
+        """
+        employee_id = _employee_id(punch.employee_id)
+        if punch.status == "present":
+            remarks = SHIFT_POLICIES.get_remarks(punch.timestamp, employee_id, site)
+        else:
+            remarks = punch.remarks or punch.status
+        return {
+            "employee": {
+                "id": employee_id,
+                "name": punch.name,
+                "name_lc": normalize_name(punch.name),
+                "department": punch.department,
+                "department_lc": normalize_department(punch.department),
+            },
+            "attendance": {
+                "date": _utc_midnight(punch.timestamp),
+                "status": punch.status,
+                "remarks": remarks,
+                "marked_by": punch.marked_by,
+            },
+            "timestamp": punch.timestamp,
+            "source": {
+                "device_id": device_id,
+                "device_uuid": device_uuid,
+                "operator_id": operator_id,
+                "site": site,
+            },
+        }
+
+
+    async def ingest_batch(self, punches: List[AttendancePunchDTO], device_id: int, device_uuid: str,
+                           operator_id: int, site: Optional[str] = None) -> Dict[str, Any]:
+        now = current_datetime_utc()
+        errors: List[Dict[str, Any]] = []
+        docs: List[Dict[str, Any]] = []
+        doc_index: List[int] = []   # position in `docs` -> position in the request
+
+        for i, punch in enumerate(punches):
+            if punch.timestamp > now + MAX_CLOCK_SKEW:
+                errors.append({"index": i, "employee_id": punch.employee_id, "error": "timestamp in the future"})
+                continue
+            if punch.timestamp < now - MAX_BACKFILL:
+                errors.append({"index": i, "employee_id": punch.employee_id, "error": "timestamp too old"})
+                continue
+            docs.append(self.to_document(punch, device_id, device_uuid, operator_id, site))
+            doc_index.append(i)
+
+        result = await self.mongo_db.upsert_attendance_bulk(docs)
+
+        for err in result["errors"]:
+            i = doc_index[err["index"]] if err.get("index") is not None else None
+            errors.append({
+                "index": i if i is not None else -1,
+                "employee_id": punches[i].employee_id if i is not None else None,
+                "error": err["error"]
+            })
+        if result["errors"]:
+            logger.warning(f"Attendance batch from device {device_id}: {len(result['errors'])} write errors")
+
+        return {
+            "received": len(punches),
+            "inserted": result["inserted"],
+            "duplicates": result["duplicates"],
+            "errors": sorted(errors, key=lambda e: e["index"])
+        }
@@ -1,9 +1,10 @@
 # backend/fastapi_app/services/auth_service.py
+import asyncio
 from typing import Optional, Dict, Any
-from backend.fastapi_app.db.repos.user_repo import UserRepository
-from backend.fastapi_app.db.repos.assignment_repo import AssignmentRepository
-from backend.fastapi_app.db.repos.device_repo import DeviceRepository
-from backend.fastapi_app.services.device_service import DeviceService
+from backend.fastapi_app.db.repos.user_repo import UserRepository, AsyncUserRepository
+from backend.fastapi_app.db.repos.assignment_repo import AssignmentRepository, AsyncAssignmentRepository
+from backend.fastapi_app.db.repos.device_repo import DeviceRepository, AsyncDeviceRepository
+from backend.fastapi_app.services.device_service import DeviceService, AsyncDeviceService
 from backend.fastapi_app.core.security import verify_password, create_jwt_token
 
 class AuthService:
@@ -50,7 +51,7 @@ class AuthService:
             return None
         
         # validate device token and status
-        device_row = self.device_repo.get_by_uuid(device_uuid)
+        device_row = self.device_repo.get_auth_by_uuid(device_uuid)
         if not device_row:
             return None
         
@@ -59,7 +60,7 @@ class AuthService:
             return None
         
         # check assignment: device_id and employee_id must be linked
-        device_id = device_row.get("device_id")
+        device_id = device_row.device_id
         employee_id = user.get("employee_id")
         if not self.assignment_repo.is_user_assigned_to_device(employee_id, device_id):
             return None
@@ -86,4 +87,75 @@ class AuthService:
             self.assignment_repo.close()
             self.device_repo.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+class AsyncAuthService:
+    """
+    asyncio twin of AuthService. Password checks run in a worker thread.
+    """
+
+    def __init__(self, postgres_db=None, mongo_db=None):
+        self.user_repo = AsyncUserRepository(postgres_db)
+        self.assignment_repo = AsyncAssignmentRepository(postgres_db)
+        self.device_repo = AsyncDeviceRepository(postgres_db)
+        self.device_service = AsyncDeviceService(postgres_db, mongo_db)
+
+
+    async def _check_user(self, username: str, password: str, role: str) -> Optional[Dict[str, Any]]:
+        user = await self.user_repo.get_by_username(username)
+        if not user:
+            return None
+        if user.get("role") != role or not user.get("is_active"):
+            return None
+        if not await asyncio.to_thread(verify_password, password, user.get("password_hash")):
+            return None
+        return user
+
+
+    #----------- Admin login ---------------
+    async def admin_login(self, username: str, password: str) -> Optional[str]:
+        user = await self._check_user(username, password, "admin")
+        if not user:
+            return None
+
+        claims = {
+            "employee_id": user["employee_id"],
+            "role": "admin",
+            "username": user["username"],
+        }
+        return create_jwt_token(claims)
+
+
+    # ---------- Operator login (device + assignment checks) -------------
+    async def operator_login(self, device_uuid: str, device_token: str, username: str,
+                             password: str) -> Optional[Dict[str, Any]]:
+        user = await self._check_user(username, password, "operator")
+        if not user:
+            return None
+
+        device_row = await self.device_repo.get_auth_by_uuid(device_uuid)
+        if not device_row:
+            return None
+
+        if not await self.device_service.validate_device_token(device_uuid, device_token):
+            return None
+
+        device_id = device_row.device_id
+        employee_id = user.get("employee_id")
+        if not await self.assignment_repo.is_user_assigned_to_device(employee_id, device_id):
+            return None
+
+        claims = {
+            "employee_id": employee_id,
+            "role": "operator",
+            "username": user["username"],
+            "device_id": device_id
+        }
+        session_token = create_jwt_token(claims)
+        return {
+            "session_token": session_token,
+            "employee_id": employee_id,
+            "username": user.get("username"),
+            "name": user.get("employee_name")
+        }
@@ -1,9 +1,38 @@
+import asyncio
+import hashlib
 from typing import Optional, Dict, Any
 from backend.fastapi_app.schemas.provisioning import RegisterRequestDTO, DeviceStatusDTO, TokenDTO
-from backend.fastapi_app.db.repos.device_repo import DeviceRepository
+from backend.fastapi_app.db.repos.device_repo import DeviceRepository, AsyncDeviceRepository
 from backend.fastapi_app.services.token_service import generate_token, hash_token_bcrypt, verify_token_bcrypt
+from backend.fastapi_app.core.status_notifier import status_notifier
 from desktop_app.utils.utils import current_datetime_utc
 
+
+def _status_dto_from_row(dev: Optional[Dict[str, Any]]) -> DeviceStatusDTO:
+    if not dev:
+        # If not present, treat as unknown
+        return DeviceStatusDTO(status="unknown")
+    return DeviceStatusDTO(
+        status=dev.get("status"),
+        device_id=dev.get("device_id"),
+        device_name=dev.get("device_name"),
+        assigned_site=dev.get("assigned_site"),
+        app_version=dev.get("app_version"),
+        os_version=dev.get("os_version"),
+        created_at=str(dev.get("created_at")) if dev.get("created_at") else None,
+        updated_at=str(dev.get("updated_at")) if dev.get("updated_at") else None
+    )
+
+
+def status_etag(dto: DeviceStatusDTO) -> str:
+    """
+    Weak ETag for a status response. Every status change bumps devices.updated_at,
+    so (device_id, status, updated_at) identifies the representation.
+    """
+    key = f"{dto.device_id}|{dto.status}|{dto.updated_at}"
+    return 'W/"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
 class DeviceService:
     """
     Core provisioning engine. No API exposure here — this is pure service layer.
@@ -55,19 +84,7 @@ class DeviceService:
 
     def get_status(self, device_uuid: str) -> DeviceStatusDTO:
         dev = self.repo.get_by_uuid(device_uuid)
-        if not dev:
-            # If not present, treat as unknown
-            return DeviceStatusDTO(status="unknown")
-        return DeviceStatusDTO(
-            status=dev.get("status"),
-            device_id=dev.get("device_id"),
-            device_name=dev.get("device_name"),
-            assigned_site=dev.get("assigned_site"),
-            app_version=dev.get("app_version"),
-            os_version=dev.get("os_version"),
-            created_at=str(dev.get("created_at")) if dev.get("created_at") else None,
-            updated_at=str(dev.get("updated_at")) if dev.get("updated_at") else None
-        )
+        return _status_dto_from_row(dev)
     
 
     def approve_device(self, device_id: int, approver_employee_id: int) -> bool:
@@ -168,18 +185,210 @@ class DeviceService:
     
 
     def validate_device_token(self, device_uuid: str, token: str) -> bool:
-        dev = self.repo.get_by_uuid(device_uuid)
-        if not dev or not dev.get("credential_hash"):
+        dev = self.repo.get_auth_by_uuid(device_uuid)
+        if not dev or not dev.credential_hash:
             return False
         
-        stored_hash = dev.get("credential_hash")
-        ok = verify_token_bcrypt(token, stored_hash)
+        ok = verify_token_bcrypt(token, dev.credential_hash)
 
         # log event to mongoDB
         self.mongo.log_device_event(
+            device_id=dev.device_id,
+            device_uuid=device_uuid,
+            user_id=None,
+            event_type="device_validation",
+            details={
+                "outcome": "success" if ok else "failure",
+                "attempt": "validate_device_token"
+            }
+        )
+        return ok
+
+
+class AsyncDeviceService:
+    """
+    asyncio twin of DeviceService used by the API routers.
+    bcrypt work is pushed to a worker thread so it never stalls the event loop.
+    """
+    def __init__(self, postgres, mongo):
+        self.repo = AsyncDeviceRepository(postgres)
+        self.mongo = mongo
+
+
+    async def register_request(self, payload: RegisterRequestDTO,
+                               registered_by: Optional[int] = None) -> Dict[str, Any]:
+        """
+        If device exists, return that record. Otherwise create a pending record.
+        """
+        device_uuid = str(payload.device_uuid)
+        details = {
+            "hostname": payload.hostname,
+            "app_version": payload.app_version,
+            "os": payload.os
+        }
+        existing = await self.repo.get_by_uuid(device_uuid)
+        if existing:
+            await self.mongo.log_device_event(existing.get("device_id"), device_uuid, user_id=None,
+                                              event_type="register_requested_duplicate",
+                                              details=details)
+            return existing
+
+        device_id = await self.repo.create_register_request(
+            device_uuid=device_uuid,
+            device_name=payload.hostname,
+            assigned_site=None,
+            app_version=payload.app_version,
+            os_version=payload.os,
+            registered_by=registered_by
+        )
+
+        await self.mongo.log_device_event(
+            device_id=device_id,
+            device_uuid=device_uuid,
+            user_id=None,
+            event_type="register_requested",
+            details=details
+        )
+
+        return await self.repo.get_by_uuid(device_uuid)
+
+
+    async def get_status(self, device_uuid: str) -> DeviceStatusDTO:
+        dev = await self.repo.get_by_uuid(device_uuid)
+        return _status_dto_from_row(dev)
+
+
+    async def wait_for_status_change(self, device_uuid: str, known_status: Optional[str],
+                                     timeout: float) -> DeviceStatusDTO:
+        """
+        Long-poll: return as soon as the status differs from `known_status`, or after
+        `timeout` seconds with whatever the current status is. Postgres is read once
+        on entry and once on wake-up, not on a timer.
+        """
+        event = status_notifier.subscribe(device_uuid)
+        try:
+            current = await self.get_status(device_uuid)
+            if known_status is None or current.status != known_status:
+                return current
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return current
+            return await self.get_status(device_uuid)
+        finally:
+            status_notifier.unsubscribe(device_uuid, event)
+
+
+    async def approve_device(self, device_id: int, approver_employee_id: int) -> bool:
+        """
+        Approve device: set status to 'active' and log event.
+        Token issuance is deferred to fetch_credential called by device.
+        """
+        await self.repo.update_status(device_id, "active")
+
+        dev = await self.repo.get_by_id(device_id)
+        device_uuid = dev.get("device_uuid") if dev else None
+
+        await self.mongo.log_device_event(
+            device_id=device_id,
+            device_uuid=device_uuid or "unknown",
+            user_id=approver_employee_id,
+            event_type="approved",
+            details= {
+                "approved_by": approver_employee_id
+            }
+        )
+        await status_notifier.publish(device_uuid)
+        return True
+
+
+    async def generate_and_store_token(self, device_id: int, device_uuid: str) -> str:
+        """
+        Generates token, stores hash in Postgres and logs in Mongo.
+        Returns the plaintext token (to be returned once to device).
+        """
+        token = generate_token(32)
+        token_hash = await asyncio.to_thread(hash_token_bcrypt, token)
+
+        await self.repo.set_credential_hash(device_id, token_hash, status="active",
+                                            device_name=None, app_version=None, os_version=None)
+
+        await self.mongo.log_device_event(
+            device_id=device_id,
+            device_uuid=device_uuid,
+            user_id=None,
+            event_type="credential_generated",
+            details={
+                "timestamp": current_datetime_utc()
+            }
+        )
+
+        return token
+
+
+    async def fetch_credential(self, device_uuid: str) -> Optional[TokenDTO]:
+        dev = await self.repo.get_by_uuid(device_uuid)
+        if not dev:
+            return None
+
+        if dev.get("status") != "active":
+            await self.mongo.log_device_event(
+                device_id=dev.get("device_id"),
+                device_uuid=device_uuid,
+                user_id=None,
+                event_type="credential_fetch_denied",
+                details= {
+                    "reason": "not_active"
+                }
+            )
+            return None
+
+        if dev.get("credential_hash"):
+            await self.mongo.log_device_event(
+                device_id=dev.get("device_id"),
+                device_uuid=device_uuid,
+                user_id=None,
+                event_type="credential_fetch_attempt_after_issue",
+                details={}
+            )
+            return None
+
+        token = await self.generate_and_store_token(dev.get("device_id"), device_uuid)
+
+        await self.mongo.log_device_event(
             device_id=dev.get("device_id"),
             device_uuid=device_uuid,
             user_id=None,
+            event_type="credential_issued",
+            details={
+                "issued_at": current_datetime_utc()
+            }
+        )
+        return TokenDTO(token=token)
+
+
+    async def validate_device_token(self, device_uuid: str, token: str) -> bool:
+        dev = await self.repo.get_auth_by_uuid(device_uuid)
+        if not dev:
+            return False
+        return await self.verify_device_credential(dev.device_id, device_uuid, dev.credential_hash, token)
+
+
+    async def verify_device_credential(self, device_id: int, device_uuid: str,
+                                       credential_hash: Optional[str], token: str) -> bool:
+        """
+        bcrypt-compare a presented token against an already fetched credential hash
+        (so callers that loaded the device row don't fetch it a second time).
+        """
+        if not credential_hash:
+            return False
+
+        ok = await asyncio.to_thread(verify_token_bcrypt, token, credential_hash)
+
+        await self.mongo.log_device_event(
+            device_id=device_id,
+            device_uuid=device_uuid,
+            user_id=None,
             event_type="device_validation",
             details={
                 "outcome": "success" if ok else "failure",
@@ -187,4 +396,3 @@ class DeviceService:
             }
         )
         return ok
-    
\ No newline at end of file
@@ -0,0 +1,158 @@
+# backend/fastapi_app/services/gallery_service.py
+import asyncio
+import logging
+import pickle
+from typing import Optional, Dict, FrozenSet, List, Any, Tuple
+
+import numpy as np
+
+from desktop_app.utils.gallery_codec import encode_gallery, ENCODING_DIM
+
+logger = logging.getLogger(__name__)
+
+
+def _decode_encoding(raw: Optional[bytes]) -> Optional[np.ndarray]:
+    """
+    employees.face_encoding holds a pickled ndarray/list written by the desktop app.
+    Returns a (128,) float32 vector, or None if missing/malformed.
+    """
+    if not raw:
+        return None
+    try:
+        value = pickle.loads(raw)
+        vec = np.asarray(value, dtype=np.float32).ravel()
+    except Exception as e:
+        logger.warning(f"Unreadable face encoding: {e}")
+        return None
+    return vec if vec.shape[0] == ENCODING_DIM else None
+
+
+def in_scope(sites: FrozenSet[str], site: Optional[str]) -> bool:
+    """
+    Kiosks without an assigned site see everyone; otherwise employees listed for that
+    site plus employees with no site restriction.
+    """
+    return site is None or not sites or site in sites
+
+
+class GalleryCache:
+    """
+    Process-wide decoded gallery, kept current incrementally from gallery_rev so
+    pickles are only decoded once per change rather than once per kiosk request.
+    Per-site views are filtered from it at request time.
+    """
+    SNAPSHOT_SLOTS = 16
+
+    def __init__(self):
+        self.revision = -1
+        # employee_id -> (gallery_rev, meta, vector, allowed sites)
+        self.entries: Dict[int, Tuple[int, Dict[str, Any], np.ndarray, FrozenSet[str]]] = {}
+        # employee_id -> gallery_rev at which it left the gallery
+        self.removed: Dict[int, int] = {}
+        self._lock = asyncio.Lock()
+        # (revision, dtype, site) -> encoded full snapshot
+        self._snapshots: Dict[Tuple[int, str, Optional[str]], bytes] = {}
+
+
+    async def refresh(self, postgres, revision: int) -> None:
+        if revision <= self.revision:
+            return
+        async with self._lock:
+            if revision <= self.revision:
+                return
+            since = max(self.revision, 0)
+            rows = await postgres.get_gallery_changes(since)
+            tombstones = await postgres.get_gallery_tombstones(since)
+            vectors = await asyncio.to_thread(lambda: [_decode_encoding(r["face_encoding"]) for r in rows])
+
+            for row, vec in zip(rows, vectors):
+                emp_id, rev = row["employee_id"], int(row["gallery_rev"])
+                if vec is None:
+                    self.entries.pop(emp_id, None)
+                    self.removed[emp_id] = rev
+                    continue
+                meta = {"employee_id": emp_id, "name": row["name"], "department": row["department"]}
+                self.entries[emp_id] = (rev, meta, vec, frozenset(row.get("sites") or ()))
+                self.removed.pop(emp_id, None)
+
+            for row in tombstones:
+                self.entries.pop(row["employee_id"], None)
+                self.removed[row["employee_id"]] = int(row["gallery_rev"])
+
+            self.revision = revision
+            self._snapshots.clear()
+
+
+    def build(self, since: Optional[int], dtype: str, site: Optional[str] = None) -> bytes:
+        """
+        Full snapshot of the site's view when since is None. Otherwise the entries
+        changed after `since`: in-scope ones as rows, out-of-scope ones (e.g. their
+        site list changed) as removed ids, together with deleted employees.
+        """
+        key = (self.revision, dtype, site)
+        if since is None and key in self._snapshots:
+            return self._snapshots[key]
+
+        removed: List[int] = []
+        if since is None:
+            selected = sorted((k, v) for k, v in self.entries.items() if in_scope(v[3], site))
+        else:
+            selected = []
+            for emp_id, entry in self.entries.items():
+                if entry[0] <= since:
+                    continue
+                if in_scope(entry[3], site):
+                    selected.append((emp_id, entry))
+                else:
+                    removed.append(emp_id)
+            selected.sort(key=lambda item: item[0])
+            removed.extend(k for k, rev in self.removed.items() if rev > since)
+            removed.sort()
+
+        ids = [emp_id for emp_id, _ in selected]
+        meta = [entry[1] for _, entry in selected]
+        matrix = (np.stack([entry[2] for _, entry in selected])
+                  if selected else np.empty((0, ENCODING_DIM), dtype=np.float32))
+
+        blob = encode_gallery(ids, matrix, meta, revision=self.revision,
+                              base_revision=since, removed=removed, dtype=dtype)
+        if since is None:
+            if len(self._snapshots) >= self.SNAPSHOT_SLOTS:
+                self._snapshots.pop(next(iter(self._snapshots)))
+            self._snapshots[key] = blob
+        return blob
+
+
+_gallery_cache = GalleryCache()
+
+
+class AsyncGalleryService:
+    """
+    Serves the face-encoding gallery to kiosks as a compact binary blob
+    (see desktop_app.utils.gallery_codec), limited to the kiosk's site.
+    """
+    def __init__(self, postgres, cache: GalleryCache = _gallery_cache):
+        self.postgres = postgres
+        self.cache = cache
+
+
+    async def current_revision(self) -> int:
+        return await self.postgres.get_gallery_revision()
+
+
+    async def get_gallery_blob(self, revision: int, since: Optional[int], dtype: str,
+                               site: Optional[str] = None) -> bytes:
+        await self.cache.refresh(self.postgres, revision)
+        if since is not None and since >= self.cache.revision:
+            since = self.cache.revision
+        # built on the loop thread so refresh() can't mutate entries mid-build
+        return self.cache.build(since, dtype, site)
+
+
+    async def get_employee_sites(self, employee_id: int) -> List[str]:
+        return await self.postgres.get_employee_sites(employee_id)
+
+
+    async def set_employee_sites(self, employee_id: int, sites: List[str]) -> Optional[List[str]]:
+        cleaned = sorted({site.strip() for site in sites if site and site.strip()})
+        return await self.postgres.set_employee_sites(employee_id, cleaned)
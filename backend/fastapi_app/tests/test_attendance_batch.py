@@ -0,0 +1,116 @@
+# backend/fastapi_app/tests/test_attendance_batch.py
+# Batch uploads must dedupe against punches already stored, whatever type their id has.
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from backend.fastapi_app.db.async_mongo_db import AsyncMongoDB
+from backend.fastapi_app.schemas.attendance import AttendancePunchDTO
+from backend.fastapi_app.services import attendance_service
+from backend.fastapi_app.services.attendance_service import AsyncAttendanceService
+from desktop_app.services.attendance_record import AttendanceRecord
+from desktop_app.services.shift_policy import IST, ShiftPolicy, ShiftPolicyIndex
+from desktop_app.utils.utils import current_datetime_utc
+
+
+def _get(doc, path):
+    for key in path.split("."):
+        if not isinstance(doc, dict) or key not in doc:
+            return None
+        doc = doc[key]
+    return doc
+
+
+def _matches(doc, query):
+    for path, cond in query.items():
+        value = _get(doc, path)
+        if isinstance(cond, dict) and "$in" in cond:
+            if value not in cond["$in"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeCollection:
+    """Just enough of bulk_write for upserts with $setOnInsert."""
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    async def bulk_write(self, ops, ordered=True):
+        upserted, matched = {}, 0
+        for i, op in enumerate(ops):
+            if any(_matches(doc, op._filter) for doc in self.docs):
+                matched += 1
+            elif op._upsert:
+                self.docs.append(dict(op._doc.get("$setOnInsert", {})))
+                upserted[i] = i
+        return SimpleNamespace(upserted_ids=upserted, upserted_count=len(upserted), matched_count=matched)
+
+
+def _mongo(docs=()):
+    mongo = AsyncMongoDB.__new__(AsyncMongoDB)
+    mongo.attendance = FakeCollection(docs)
+    mongo.daily_summary = FakeCollection()
+    return mongo
+
+
+def _punch(employee_id, timestamp):
+    return AttendancePunchDTO(employee_id=employee_id, name="Asha Rao", department="Ops",
+                              status="present", timestamp=timestamp)
+
+
+def test_batch_replay_over_kiosk_punch_is_a_duplicate():
+    timestamp = current_datetime_utc() - timedelta(minutes=1)
+    local = AttendanceRecord(employee_id=7, name="Asha Rao", department="Ops", status="Present",
+                             marked_by="System", timestamp=timestamp).to_dict()
+    mongo = _mongo([local])
+    service = AsyncAttendanceService(mongo)
+
+    for _ in range(2):
+        result = asyncio.run(service.ingest_batch([_punch("7", timestamp)], 1, "uuid-1", 1))
+        assert (result["inserted"], result["duplicates"]) == (0, 1)
+
+    assert len(mongo.attendance.docs) == 1
+
+
+def test_batch_stores_numeric_ids_as_int_and_replays_idempotently():
+    timestamp = current_datetime_utc() - timedelta(minutes=1)
+    mongo = _mongo()
+    service = AsyncAttendanceService(mongo)
+    batch = [_punch("7", timestamp), _punch("visitor-3", timestamp)]
+
+    first = asyncio.run(service.ingest_batch(batch, 1, "uuid-1", 1))
+    replay = asyncio.run(service.ingest_batch(batch, 1, "uuid-1", 1))
+
+    assert (first["inserted"], first["duplicates"]) == (2, 0)
+    assert (replay["inserted"], replay["duplicates"]) == (0, 2)
+    assert [doc["employee"]["id"] for doc in mongo.attendance.docs] == [7, "visitor-3"]
+
+
+def test_non_ascii_digit_ids_are_kept_as_strings():
+    timestamp = current_datetime_utc() - timedelta(minutes=1)
+    mongo = _mongo()
+    service = AsyncAttendanceService(mongo)
+
+    result = asyncio.run(service.ingest_batch([_punch("²", timestamp), _punch("١٢", timestamp)], 1, "uuid-1", 1))
+
+    assert (result["inserted"], result["errors"]) == (2, [])
+    assert [doc["employee"]["id"] for doc in mongo.attendance.docs] == ["²", "١٢"]
+
+
+def test_present_punches_get_the_site_shift(monkeypatch):
+    monkeypatch.setattr(attendance_service, "SHIFT_POLICIES", ShiftPolicyIndex.from_rows(ShiftPolicy(), [
+        {"site": "north", "start_hour": 8, "start_minute": 30, "grace_minutes": 5},
+    ]))
+    punch = AttendancePunchDTO(employee_id="7", name="Asha Rao", department="Ops", status="present",
+                               remarks="early", timestamp=datetime(2026, 1, 7, 8, 40, tzinfo=IST))
+    absent = AttendancePunchDTO(employee_id="7", name="Asha Rao", department="Ops", status="absent",
+                                timestamp=datetime(2026, 1, 7, 12, 0, tzinfo=IST))
+
+    def remarks(dto, site):
+        return AsyncAttendanceService.to_document(dto, 1, "uuid-1", 1, site)["attendance"]["remarks"]
+
+    assert remarks(punch, "north") == "late"
+    assert remarks(punch, "south") == "early"
+    assert remarks(absent, "north") == "absent"
@@ -0,0 +1,139 @@
+# backend/fastapi_app/tests/test_event_logs.py
+# Retention settings, time-series conversion and the hourly rollup pipeline of
+# device/login event logs.
+from datetime import datetime, timezone
+
+from backend.fastapi_app.db.event_logs import (
+    EVENT_LOGS, apply_retention, convert_to_timeseries, hourly_rollup_pipeline, retention_seconds,
+    rollup_event_logs
+)
+
+
+class FakeCollection:
+    def __init__(self, db=None, name=None, docs=(), indexes=None):
+        self.db, self.name = db, name
+        self.pipelines = []
+        self.docs = list(docs)
+        self.indexes = dict(indexes or {})
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+
+    def index_information(self):
+        return self.indexes
+
+    def find(self, filter, projection):
+        return FakeCursor([{k: v for k, v in doc.items() if k != "_id"} for doc in self.docs])
+
+    def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+    def rename(self, new_name):
+        self.db.collections[new_name] = self.db.collections.pop(self.name)
+        self.name = new_name
+
+    def drop(self):
+        self.db.collections.pop(self.name, None)
+
+
+class FakeCursor(list):
+    def batch_size(self, size):
+        return self
+
+
+class FakeDatabase:
+    """Records the command documents pymongo would send for create/collMod."""
+    def __init__(self):
+        self.collections = {}
+        self.options = {}
+        self.commands = []
+
+    def __getitem__(self, name):
+        return self.collections.get(name) or FakeCollection(self, name)
+
+    def list_collection_names(self):
+        return list(self.collections)
+
+    def list_collections(self, filter):
+        name = filter["name"]
+        if name not in self.collections:
+            return []
+        options = self.options.get(name, {})
+        return [{"name": name, "type": "timeseries" if "timeseries" in options else "collection",
+                 "options": options}]
+
+    def create_collection(self, name, **options):
+        self.commands.append({"create": name, **options})
+        self.collections[name] = FakeCollection(self, name)
+        self.options[name] = options
+
+    def command(self, command, value, **kwargs):
+        self.commands.append({command: value, **kwargs})
+
+
+def test_retention_seconds():
+    assert retention_seconds(30) == 30 * 86400
+    assert retention_seconds(0) is None
+
+
+def test_hourly_rollup_merges_on_group_fields():
+    hourly, fields = EVENT_LOGS["device_logs"]
+    start, end = datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    pipeline = hourly_rollup_pipeline(hourly, fields, start, end)
+
+    assert pipeline[0] == {"$match": {"timestamp": {"$gte": start, "$lt": end}}}
+    assert set(pipeline[1]["$group"]["_id"]) == {"hour", "device_id", "event_type"}
+    assert pipeline[-1]["$merge"]["into"] == "device_logs_hourly"
+    assert pipeline[-1]["$merge"]["on"] == ["hour", "device_id", "event_type"]
+
+
+def test_rollup_covers_complete_hours_only():
+    db = {name: FakeCollection() for name in EVENT_LOGS}
+    now = datetime(2026, 1, 2, 10, 37, tzinfo=timezone.utc)
+
+    end = rollup_event_logs(db, hours=24, now=now)
+
+    assert end == datetime(2026, 1, 2, 10, tzinfo=timezone.utc)
+    match = db["device_logs"].pipelines[0][0]["$match"]["timestamp"]
+    assert match == {"$gte": datetime(2026, 1, 1, 10, tzinfo=timezone.utc), "$lt": end}
+    assert len(db["user_login_logs"].pipelines) == 1
+
+
+def test_convert_buckets_login_logs_by_user():
+    db = FakeDatabase()
+    db.collections["user_login_logs"] = FakeCollection(db, "user_login_logs", docs=[
+        {"_id": 1, "user": {"id": 3}, "device": {"id": 9}, "timestamp": datetime(2026, 1, 1)},
+    ])
+
+    convert_to_timeseries(db, "user_login_logs", 86400)
+
+    assert db.commands == [{
+        "create": "user_login_logs",
+        "timeseries": {"timeField": "timestamp", "metaField": "user", "granularity": "seconds"},
+        "expireAfterSeconds": 86400,
+    }]
+    assert db.list_collection_names() == ["user_login_logs"]
+    assert db["user_login_logs"].docs == [
+        {"user": {"id": 3}, "device": {"id": 9}, "timestamp": datetime(2026, 1, 1)},
+    ]
+
+
+def test_apply_retention_command_documents():
+    db = FakeDatabase()
+    db.create_collection("device_logs", timeseries={"timeField": "timestamp", "metaField": "device"})
+    db.collections["user_login_logs"] = FakeCollection(db, "user_login_logs", indexes={
+        "_id_": {"key": [("_id", 1)]},
+        "timestamp_1": {"key": [("timestamp", 1)], "expireAfterSeconds": 60},
+    })
+    db.commands.clear()
+
+    apply_retention(db, "device_logs", 30 * 86400)
+    apply_retention(db, "device_logs", None)
+    apply_retention(db, "user_login_logs", 7 * 86400)
+
+    assert db.commands == [
+        {"collMod": "device_logs", "expireAfterSeconds": 30 * 86400},
+        {"collMod": "device_logs", "expireAfterSeconds": "off"},
+        {"collMod": "user_login_logs", "index": {"name": "timestamp_1", "expireAfterSeconds": 7 * 86400}},
+    ]
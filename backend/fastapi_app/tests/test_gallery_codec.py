@@ -0,0 +1,28 @@
+# backend/fastapi_app/tests/test_gallery_codec.py
+# The gallery blob must round-trip ids, encodings and header fields.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from desktop_app.utils.gallery_codec import encode_gallery, decode_gallery
+
+
+def test_gallery_round_trip_float16():
+    ids = [3, 7, 11]
+    matrix = np.random.default_rng(0).random((3, 128), dtype=np.float32)
+    meta = [{"employee_id": i, "name": f"E{i}", "department": "Ops"} for i in ids]
+
+    blob = encode_gallery(ids, matrix, meta, revision=42, base_revision=40, removed=[5], dtype="float16")
+    out = decode_gallery(blob)
+
+    assert out["ids"] == ids
+    assert out["revision"] == 42 and out["base_revision"] == 40
+    assert out["removed"] == [5]
+    assert out["meta"] == meta
+    assert out["encodings"].dtype == np.float32
+    assert np.allclose(out["encodings"], matrix, atol=1e-3)
+
+
+def test_empty_gallery():
+    out = decode_gallery(encode_gallery([], np.empty((0, 128)), [], revision=0))
+    assert out["ids"] == [] and out["encodings"].shape == (0, 128)
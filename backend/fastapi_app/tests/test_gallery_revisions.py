@@ -0,0 +1,115 @@
+# backend/fastapi_app/tests/test_gallery_revisions.py
+# Gallery revisions must become visible in revision order: a writer that commits late
+# must not end up below a revision kiosks have already synced past. Needs a Postgres
+# server (POSTGRES_TEST_DSN); runs migrations 008-010 in a throwaway schema.
+import asyncio
+import os
+import pickle
+import threading
+import uuid
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+psycopg = pytest.importorskip("psycopg")
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from backend.fastapi_app.db.async_postgres_db import AsyncPostgresDB
+from backend.fastapi_app.services.gallery_service import GalleryCache
+
+POSTGRES_TEST_DSN = os.environ.get("POSTGRES_TEST_DSN")
+MIGRATIONS = Path(__file__).resolve().parent.parent / "db" / "migrations"
+
+pytestmark = pytest.mark.skipif(not POSTGRES_TEST_DSN, reason="set POSTGRES_TEST_DSN to a Postgres server")
+
+
+@pytest.fixture
+def schema():
+    name = f"gallery_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(POSTGRES_TEST_DSN, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {name}")
+        conn.execute(f"SET search_path TO {name}")
+        conn.execute("""
+            CREATE TABLE employees (
+                employee_id SERIAL PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                department VARCHAR(50) NOT NULL,
+                photo_path TEXT,
+                face_encoding BYTEA
+            )
+        """)
+        for migration in ("008_add_gallery_revisions.sql", "009_add_employee_sites.sql",
+                          "010_serialize_gallery_revisions.sql"):
+            conn.execute((MIGRATIONS / migration).read_text())
+        for emp_id in (1, 2):
+            conn.execute("INSERT INTO employees (name, department, face_encoding) VALUES (%s, 'Ops', %s)",
+                         (f"Employee {emp_id}", pickle.dumps(np.full(128, emp_id, dtype=np.float64))))
+        try:
+            yield name
+        finally:
+            conn.execute(f"DROP SCHEMA {name} CASCADE")
+
+
+def _connect(schema, **kwargs):
+    return psycopg.connect(POSTGRES_TEST_DSN, options=f"-c search_path={schema}", **kwargs)
+
+
+def _rename(schema, emp_id, name):
+    with _connect(schema) as conn:
+        conn.execute("UPDATE employees SET name = %s WHERE employee_id = %s", (name, emp_id))
+
+
+def test_late_commit_is_not_skipped(schema):
+    async def scenario():
+        pool = AsyncConnectionPool(POSTGRES_TEST_DSN, min_size=1, max_size=2, open=False,
+                                   kwargs={"row_factory": dict_row, "options": f"-c search_path={schema}"})
+        await pool.open()
+        pg = AsyncPostgresDB.__new__(AsyncPostgresDB)
+        pg.pool = pool
+        cache = GalleryCache()
+        writer_a = _connect(schema)
+        try:
+            start = await pg.get_gallery_revision()
+            await cache.refresh(pg, start)
+
+            # A takes the next revision and stays open; B starts after it and tries to commit first
+            writer_a.execute("UPDATE employees SET name = 'A' WHERE employee_id = 1")
+            writer_b = threading.Thread(target=_rename, args=(schema, 2, "B"))
+            writer_b.start()
+            await asyncio.sleep(0.3)
+            b_waited = writer_b.is_alive()
+            revision_while_a_open = await pg.get_gallery_revision()
+
+            writer_a.commit()
+            await asyncio.to_thread(writer_b.join)
+
+            revision = await pg.get_gallery_revision()
+            await cache.refresh(pg, revision)
+            return start, b_waited, revision_while_a_open, revision, cache
+        finally:
+            writer_a.close()
+            await pool.close()
+
+    start, b_waited, revision_while_a_open, revision, cache = asyncio.run(scenario())
+
+    assert b_waited, "B must wait for A's revision to commit"
+    assert revision_while_a_open == start
+    assert revision == start + 2
+    assert {emp_id: entry[1]["name"] for emp_id, entry in cache.entries.items()} == {1: "A", 2: "B"}
+    assert cache.entries[1][0] < cache.entries[2][0]
+
+
+def test_site_changes_take_several_revisions_in_one_commit(schema):
+    with _connect(schema) as conn:
+        before, = conn.execute("SELECT revision FROM employee_gallery_revision").fetchone()
+        conn.execute("INSERT INTO employee_sites (employee_id, site) VALUES (1, 'north'), (1, 'south')")
+        conn.execute("DELETE FROM employee_sites WHERE employee_id = 1 AND site = 'north'")
+        conn.commit()
+        after, = conn.execute("SELECT revision FROM employee_gallery_revision").fetchone()
+        rev, = conn.execute("SELECT gallery_rev FROM employees WHERE employee_id = 1").fetchone()
+
+    assert after == before + 3
+    assert rev == after
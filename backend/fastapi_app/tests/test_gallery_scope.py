@@ -0,0 +1,50 @@
+# backend/fastapi_app/tests/test_gallery_scope.py
+# Site scoping of the kiosk gallery, full and delta.
+import asyncio
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backend.fastapi_app.services.gallery_service import GalleryCache
+from desktop_app.utils.gallery_codec import decode_gallery
+
+
+class FakePostgres:
+    def __init__(self, rows, tombstones=()):
+        self.rows = rows
+        self.tombstones = list(tombstones)
+
+    async def get_gallery_changes(self, since):
+        return [r for r in self.rows if r["gallery_rev"] > since]
+
+    async def get_gallery_tombstones(self, since):
+        return [t for t in self.tombstones if t["gallery_rev"] > since]
+
+
+def _row(emp_id, rev, sites=()):
+    return {"employee_id": emp_id, "name": f"E{emp_id}", "department": "Ops", "gallery_rev": rev,
+            "face_encoding": pickle.dumps(np.full(128, emp_id, dtype=np.float64)), "sites": list(sites)}
+
+
+def test_site_view_and_delta():
+    pg = FakePostgres([_row(1, 1), _row(2, 2, ["north"]), _row(3, 3, ["south"])])
+    cache = GalleryCache()
+    asyncio.run(cache.refresh(pg, 3))
+
+    assert decode_gallery(cache.build(None, "float32"))["ids"] == [1, 2, 3]
+    assert decode_gallery(cache.build(None, "float32", site="north"))["ids"] == [1, 2]
+
+    # employee 2 moves to "south", employee 1 is deleted
+    pg.rows[1] = _row(2, 4, ["south"])
+    pg.tombstones.append({"employee_id": 1, "gallery_rev": 5})
+    asyncio.run(cache.refresh(pg, 5))
+
+    delta = decode_gallery(cache.build(3, "float32", site="north"))
+    assert delta["ids"] == []
+    assert delta["removed"] == [1, 2]
+
+    delta = decode_gallery(cache.build(3, "float32", site="south"))
+    assert delta["ids"] == [2]
+    assert delta["removed"] == [1]
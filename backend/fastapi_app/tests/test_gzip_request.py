@@ -0,0 +1,44 @@
+# backend/fastapi_app/tests/test_gzip_request.py
+# gzip request bodies must reach the app inflated, with headers fixed up.
+import asyncio
+import gzip
+
+from backend.fastapi_app.core.gzip_request import GZipRequestMiddleware
+
+
+def _call(options, body: bytes, headers):
+    seen = {}
+    sent = []
+
+    async def app(scope, receive, send):
+        seen["headers"] = dict(scope["headers"])
+        seen["body"] = (await receive())["body"]
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": headers}
+    asyncio.run(GZipRequestMiddleware(app, **options)(scope, receive, send))
+    return seen, sent
+
+
+def test_gzip_body_is_inflated():
+    raw = b'{"records": [' + b'1,' * 500 + b'1]}'
+    seen, sent = _call({}, gzip.compress(raw), [(b"content-encoding", b"gzip"),
+                                                (b"content-length", b"999")])
+
+    assert seen["body"] == raw
+    assert b"content-encoding" not in seen["headers"]
+    assert seen["headers"][b"content-length"] == str(len(raw)).encode()
+    assert sent == []
+
+
+def test_oversized_body_is_rejected():
+    seen, sent = _call({"max_inflated_bytes": 100}, gzip.compress(b"x" * 1000),
+                       [(b"content-encoding", b"gzip")])
+
+    assert seen == {}
+    assert sent[0]["status"] == 413
@@ -0,0 +1,20 @@
+# backend/fastapi_app/tests/test_pagination.py
+# Keyset cursor tokens must round-trip and reject garbage.
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.fastapi_app.core.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 14, 9, 26, 53, 589793, tzinfo=timezone.utc)
+    token = encode_cursor(created_at, 4242)
+
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, 4242)
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,90 @@
+# backend/fastapi_app/tests/test_prepared_statements.py
+# Registered queries are always prepared; saved plan time excludes each connection's
+# custom-plan executions. Plan time is measured once, in the background, and an
+# EXPLAIN failure only leaves it unset.
+import asyncio
+from contextlib import asynccontextmanager
+
+from backend.fastapi_app.db.prepared import CUSTOM_PLAN_EXECUTIONS, PLAN_SAMPLES, PreparedStatementRegistry
+
+QUERY = "SELECT 1 FROM device_assignments WHERE device_id = %s AND employee_id = %s;"
+
+
+def test_prepare_flag_only_forces_registered_queries():
+    registry = PreparedStatementRegistry()
+    registry.register("employee_assigned", QUERY)
+
+    assert registry.prepare_flag(QUERY) is True
+    assert registry.prepare_flag("SELECT now();") is None
+
+
+def test_snapshot_estimates_saved_plan_time():
+    registry = PreparedStatementRegistry()
+    registry.register("employee_assigned", QUERY)
+    registry.record("SELECT now();", backend_pid=1)   # unregistered: not tracked
+    for i in range(20):
+        registry.record(QUERY, backend_pid=100 + i % 2)
+
+    assert registry.snapshot()["employee_assigned"]["plan_ms_saved_estimate"] is None
+
+    registry._by_query[QUERY].plan_ms = 0.5
+    stats = registry.snapshot()["employee_assigned"]
+
+    assert stats["executions"] == 20
+    assert stats["prepared_connections"] == 2
+    assert stats["plan_ms_saved_estimate"] == (20 - 2 * CUSTOM_PLAN_EXECUTIONS) * 0.5
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, fail):
+        self.fail = fail
+        self.explained = []
+
+    async def execute(self, query, params):
+        if self.fail:
+            raise RuntimeError("relation does not exist")
+        self.explained.append((query, params))
+        await asyncio.sleep(0)
+        ms = 0.1 * (3 - len(self.explained) % 3)
+        return FakeCursor([{"QUERY PLAN": "Result"}, {"QUERY PLAN": f"Planning Time: {ms:.3f} ms"}])
+
+
+class FakePool:
+    def __init__(self, fail=False):
+        self.conn = FakeConnection(fail)
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+def test_plan_time_is_measured_once_with_sample_params():
+    registry = PreparedStatementRegistry()
+    registry.register("employee_assigned", QUERY, (0, 0))
+    pool = FakePool()
+
+    async def measure_twice():
+        await asyncio.gather(registry.measure_plan_times(pool), registry.measure_plan_times(pool))
+
+    asyncio.run(measure_twice())
+
+    assert pool.conn.explained == [(f"EXPLAIN (SUMMARY ON) {QUERY}", (0, 0))] * PLAN_SAMPLES
+    assert registry._by_query[QUERY].plan_ms == 0.1
+
+
+def test_plan_time_failure_is_logged_not_raised(caplog):
+    registry = PreparedStatementRegistry()
+    registry.register("employee_assigned", QUERY, (0, 0))
+
+    asyncio.run(registry.measure_plan_times(FakePool(fail=True)))
+
+    assert registry._by_query[QUERY].plan_ms is None
+    assert "employee_assigned" in caplog.text
@@ -2,43 +2,132 @@
 """
 Small ApiClient wrapper around requests.Session for the provisioning flow.
 Centralizes timeouts, error messages and endpoints used by the ProvisioningThread.
+
+Transport: one pooled keep-alive Session, urllib3 retries (idempotent methods only),
+gzip in both directions, and per-endpoint timing counters (see get_metrics()).
 """
+import gzip
+import json as jsonlib
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Tuple
 
 DEFAULT_TIMEOUT = 8     # seconds
+POOL_SIZE = 8           # kiosk traffic is a handful of concurrent calls at most
+GZIP_MIN_BYTES = 1024   # smaller JSON bodies are not worth compressing
+
+
+def build_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """
+    Session with a sized connection pool and retries for transient failures.
+    Only idempotent methods are retried; POSTs (register, login, credential fetch)
+    are never replayed automatically.
+    """
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+    return session
+
 
 class ApiClient:
     """
     Central API client for desktop application.
-    All HTTP traffic MUST go through _request().
+    All HTTP traffic MUST go through _send() (usually via _request()).
     """
     def __init__(self, base_url: str, session: Optional[requests.Session] = None,
                  timeout: int = DEFAULT_TIMEOUT):
         self.base_url = base_url.rstrip("/")
-        self.session = session or requests.Session()
+        self.session = session or build_session()
         self.timeout = timeout
+        # cache_key -> (etag, last body) for conditional GETs
+        self._etag_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # endpoint -> {"count", "errors", "total_ms", "max_ms"}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    # --------------------------------------------------
+    # Metrics
+    # --------------------------------------------------
+
+    def _record(self, endpoint: str, elapsed_ms: float, ok: bool):
+        with self._metrics_lock:
+            m = self._metrics.setdefault(endpoint, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            m["count"] += 1
+            m["total_ms"] += elapsed_ms
+            m["max_ms"] = max(m["max_ms"], elapsed_ms)
+            if not ok:
+                m["errors"] += 1
+
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Snapshot of per-endpoint timings, e.g.
+        {"GET /devices/status/{uuid}": {"count": 12, "errors": 0, "avg_ms": 21.4, "max_ms": 80.2, ...}}
+        """
+        with self._metrics_lock:
+            return {
+                endpoint: dict(m, avg_ms=m["total_ms"] / m["count"] if m["count"] else 0.0)
+                for endpoint, m in self._metrics.items()
+            }
 
     # --------------------------------------------------
     # Core request handler (single source of truth)
     # --------------------------------------------------
-    def _request(self, method: str, path: str, *, json: Optional[dict] = None,
-                 params: Optional[dict] = None, headers: Optional[dict] = None,
-    ) -> Dict[str, Any]:
+
+    @staticmethod
+    def _encode_json(payload: dict, headers: Dict[str, str]) -> bytes:
+        body = jsonlib.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+        if len(body) >= GZIP_MIN_BYTES:
+            headers["Content-Encoding"] = "gzip"
+            body = gzip.compress(body, compresslevel=5)
+        return body
+
+
+    def _send(self, method: str, path: str, *, json: Optional[dict] = None,
+              params: Optional[dict] = None, headers: Optional[dict] = None,
+              timeout: Optional[float] = None, endpoint: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        `endpoint` is the metrics label; pass the route template for paths that
+        embed ids so timings aggregate per route rather than per device.
+        """
         url = f"{self.base_url}{path}"
+        headers = dict(headers or {})
+        data = self._encode_json(json, headers) if json is not None else None
+        label = f"{method} {endpoint or path}"
+
+        started = time.perf_counter()
+        ok = False
         try:
             resp = self.session.request(
                 method=method,
                 url=url,
-                json=json,
+                data=data,
                 params=params,
                 headers=headers,
-                timeout=self.timeout,
+                timeout=timeout or self.timeout,
             )
             resp.raise_for_status()
-            if resp.text.strip() == "":
-                return {}
-            return resp.json()
+            ok = True
+            return resp
         
         except requests.HTTPError as e:
             # Try extracting FastAPI error message
@@ -52,6 +141,40 @@ class ApiClient:
         except requests.RequestException as e:
             raise RuntimeError(f"Network error: {str(e)}") from e
 
+        finally:
+            self._record(label, (time.perf_counter() - started) * 1000.0, ok)
+
+
+    @staticmethod
+    def _decode(resp: requests.Response) -> Dict[str, Any]:
+        # parse the (already gunzipped) bytes once; no intermediate str decode
+        if not resp.content or resp.content.isspace():
+            return {}
+        return resp.json()
+
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        return self._decode(self._send(method, path, **kwargs))
+
+
+    def _conditional_get(self, path: str, cache_key: str, **kwargs) -> Dict[str, Any]:
+        """
+        GET with If-None-Match. On 304 the cached body for cache_key is returned,
+        so callers always get a full dict while the server sends no body.
+        """
+        cached = self._etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        resp = self._send("GET", path, headers=headers, **kwargs)
+        if resp.status_code == 304 and cached:
+            return dict(cached[1])
+
+        body = self._decode(resp)
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etag_cache[cache_key] = (etag, body)
+        return body
+
     # --------------------------------------------------
     # Device provisioning endpoints
     # --------------------------------------------------    
@@ -72,9 +195,25 @@ class ApiClient:
     
 
     def get_status(self, device_uuid: str) -> Dict[str, Any]:
-        return self._request(
-            method="GET",
-            path=f"/devices/status/{device_uuid}",
+        return self._conditional_get(f"/devices/status/{device_uuid}", cache_key=f"status:{device_uuid}",
+                                     endpoint="/devices/status/{uuid}")
+    
+
+    def wait_for_status(self, device_uuid: str, since: Optional[str] = None,
+                        wait: float = 30.0) -> Dict[str, Any]:
+        """
+        Long-poll: the server holds the request until the status differs from
+        `since` or `wait` seconds pass. The read timeout is padded past `wait`.
+        """
+        params = {"timeout": wait}
+        if since:
+            params["since"] = since
+        return self._conditional_get(
+            f"/devices/status/{device_uuid}/wait",
+            cache_key=f"status:{device_uuid}",
+            params=params,
+            timeout=wait + self.timeout,
+            endpoint="/devices/status/{uuid}/wait",
         )
     
 
@@ -101,4 +240,52 @@ class ApiClient:
                 "password": password,
             },
         )
-        
\ No newline at end of file
+        
+
+    # --------------------------------------------------
+    # Attendance
+    # --------------------------------------------------
+
+    def upload_attendance_batch(self, records: List[Dict[str, Any]], *, session_token: str,
+                                device_uuid: str, device_token: str) -> Dict[str, Any]:
+        """
+        One request per flush. Large batches go out gzip-encoded (see _encode_json).
+        Returns {"received", "inserted", "duplicates", "errors"}.
+        """
+        return self._request(
+            method="POST",
+            path="/attendance/batch",
+            json={"records": records},
+            headers={
+                "Authorization": f"Bearer {session_token}",
+                "X-Device-UUID": device_uuid,
+                "X-Device-Token": device_token,
+            },
+            timeout=self.timeout * 2,
+        )
+
+    # --------------------------------------------------
+    # Face gallery
+    # --------------------------------------------------
+
+    def get_gallery(self, *, device_uuid: str, device_token: str, since: Optional[int] = None,
+                    etag: Optional[str] = None, dtype: str = "float32",
+                    compression: str = "none", scope: Optional[str] = None) -> Optional[requests.Response]:
+        """
+        Raw gallery download (binary, see desktop_app.utils.gallery_codec).
+        Returns None on 304 (the gallery for `etag` is still current).
+        """
+        params = {"dtype": dtype, "compression": compression}
+        if since is not None:
+            params["since"] = since
+        if scope is not None:
+            params["scope"] = scope
+        headers = {"X-Device-UUID": device_uuid, "X-Device-Token": device_token}
+        if etag:
+            headers["If-None-Match"] = etag
+
+        resp = self._send("GET", "/gallery", params=params, headers=headers,
+                          timeout=self.timeout * 4, endpoint="/gallery")
+        if resp.status_code == 304:
+            return None
+        return resp
@@ -0,0 +1,114 @@
+# desktop_app/benchmarks/absentee_bench.py
+# CPU and peak memory of absentee marking at 100k employees: the old AbsenteeWorker
+# pipeline (every column of every employee in one list, present ids as a list,
+# `eid not in present_ids`, one AttendanceRecord per absentee) versus
+# services.absentee_marking (streamed id/name/department rows, set lookup, chunked
+# upserts).
+#
+#   python -m desktop_app.benchmarks.absentee_bench [--employees 100000] [--present-ratio 0.9]
+#
+# The databases are replaced by in-memory sources and a counting sink so the numbers
+# isolate the client-side work; the old list scan is O(N*P), so it is timed on
+# --legacy-sample employees and scaled quadratically.
+import argparse
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Set
+
+from desktop_app.database.postgres_db import AttendanceEmployee
+from desktop_app.services.absentee_marking import mark_absentees
+from desktop_app.services.attendance_record import AttendanceRecord
+
+# roughly a pickled 128-d float64 encoding plus a photo path, as SELECT * returned them
+_ENCODING_BYTES = 1200
+
+
+class _Postgres:
+    def __init__(self, n: int):
+        self.n = n
+
+    def get_all_employees(self) -> List[Dict[str, Any]]:
+        return [{"employee_id": i, "name": f"Employee {i}", "department": f"Dept {i % 12}",
+                 "photo_path": f"/var/photos/{i}.jpg", "face_encoding": os.urandom(_ENCODING_BYTES)}
+                for i in range(self.n)]
+
+    def count_employees(self, after_id=None) -> int:
+        return self.n - (after_id + 1 if after_id is not None else 0)
+
+    def iter_employees_for_attendance(self, batch_size: int = 5000, after_id=None) -> Iterator[AttendanceEmployee]:
+        for i in range(after_id + 1 if after_id is not None else 0, self.n):
+            yield AttendanceEmployee(i, f"Employee {i}", f"Dept {i % 12}")
+
+
+class _Mongo:
+    def __init__(self, present: Set[str]):
+        self.present = present
+        self.inserted = 0
+
+    def get_present_employee_ids(self):
+        return set(self.present)
+
+    def upsert_absentees_bulk(self, records, chunk_size: int = 1000) -> Dict[str, Any]:
+        self.inserted += len(records)
+        return {"inserted": len(records), "skipped": 0, "errors": []}
+
+    def get_absentee_checkpoint(self, date_key: str):
+        return None
+
+    def save_absentee_checkpoint(self, date_key: str, fields: Dict[str, Any]) -> None:
+        pass
+
+    def rollup_daily_summary(self, start, end=None) -> None:
+        pass
+
+
+def _legacy(postgres: _Postgres, present: List[str]) -> int:
+    all_employees = postgres.get_all_employees()
+    all_ids = {str(emp["employee_id"]): emp for emp in all_employees}
+    absent_ids = [eid for eid in all_ids.keys() if eid not in present]
+    records = [
+        AttendanceRecord(employee_id=str(all_ids[eid]["employee_id"]), name=all_ids[eid].get("name"),
+                         department=all_ids[eid].get("department"), status="absent",
+                         marked_by="System").to_dict()
+        for eid in absent_ids
+    ]
+    return len(records)
+
+
+def _timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark absentee marking (client-side work)")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--present-ratio", type=float, default=0.9)
+    parser.add_argument("--legacy-sample", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    def present_ids(n: int) -> List[str]:
+        return [str(i) for i in range(n) if (i * 7919) % 1000 < args.present_ratio * 1000]
+
+    sample = min(args.legacy_sample, args.employees)
+    absent, elapsed, peak = _timed(lambda: _legacy(_Postgres(sample), present_ids(sample)))
+    scale = (args.employees / sample) ** 2
+    print(f"legacy (sample {sample}): {elapsed * 1000:9.1f}ms, {absent} absentees, peak={peak / 2**20:6.1f} MiB"
+          f" -> ~{elapsed * scale:8.1f}s extrapolated to {args.employees}")
+
+    mongo = _Mongo(set(present_ids(args.employees)))
+    summary, elapsed, peak = _timed(lambda: mark_absentees(_Postgres(args.employees), mongo,
+                                                           chunk_size=args.chunk_size))
+    print(f"set-based ({args.employees}):  {elapsed * 1000:9.1f}ms, {summary['absent_to_mark']} absentees,"
+          f" peak={peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# desktop_app/benchmarks/attendance_record_bench.py
+# Time and peak memory of building absentee documents the way AbsenteeWorker used
+# to (one AttendanceRecord + to_dict per employee) versus
+# AttendanceRecord.bulk_documents, as dicts and as pre-encoded RawBSONDocuments.
+#
+#   python -m desktop_app.benchmarks.attendance_record_bench [--records 100000] [--repeat 3]
+#
+# No database is touched; employees are synthetic Postgres-shaped rows.
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from desktop_app.database.postgres_db import AttendanceEmployee
+from desktop_app.services.attendance_record import AttendanceRecord
+
+
+def _employees(n: int) -> List[AttendanceEmployee]:
+    return [AttendanceEmployee(i, f"Employee {i}", f"Dept {i % 12}") for i in range(n)]
+
+
+def _per_record(employees: List[AttendanceEmployee]) -> List[dict]:
+    return [
+        AttendanceRecord(
+            employee_id=str(emp.employee_id),
+            name=emp.name,
+            department=emp.department,
+            status="absent",
+            marked_by="Admin",
+        ).to_dict()
+        for emp in employees
+    ]
+
+
+def _measure(name: str, fn: Callable[[], List[Any]], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    docs = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {len(docs) / best:10.0f} docs/s | best={best * 1000:8.1f}ms | peak={peak / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark absentee document construction")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    employees = _employees(args.records)
+    _measure("AttendanceRecord(...).to_dict()  ", lambda: _per_record(employees), args.repeat)
+    _measure("bulk_documents (dicts)           ",
+             lambda: AttendanceRecord.bulk_documents(employees, "absent", "Admin"), args.repeat)
+    _measure("bulk_documents (RawBSONDocument) ",
+             lambda: AttendanceRecord.bulk_documents(employees, "absent", "Admin", raw=True), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
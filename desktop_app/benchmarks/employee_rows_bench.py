@@ -0,0 +1,98 @@
+# desktop_app/benchmarks/employee_rows_bench.py
+# Rows/sec fetched and decoded for the employee reads: the old `SELECT *` through
+# RealDictCursor (pickled face_encoding and photo path included, one dict per row)
+# versus the projected columns as dicts and as the NamedTuple rows PostgresDB returns.
+#
+#   python -m desktop_app.benchmarks.employee_rows_bench [--employees 100000] [--repeat 3]
+#
+# Needs the Postgres server from config.POSTGRES_CONFIG. The rows live in a TEMP
+# `employees` table, which shadows the real one for this session only, so no
+# existing data is read or written.
+import argparse
+import os
+import pickle
+import time
+from typing import Callable
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from desktop_app.database.postgres_db import (
+    ATTENDANCE_EMPLOYEE_COLUMNS, AttendanceEmployee, EMPLOYEE_COLUMNS, EmployeeRow, PostgresDB
+)
+
+
+def _seed(db: PostgresDB, n: int) -> None:
+    encoding = pickle.dumps(os.urandom(1024))   # ~ a pickled 128-d float64 encoding
+    with db.conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMP TABLE employees (
+                employee_id SERIAL PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                department VARCHAR(50) NOT NULL,
+                photo_path TEXT,
+                face_encoding BYTEA
+            )
+        """)
+        execute_values(
+            cursor,
+            "INSERT INTO employees (name, department, photo_path, face_encoding) VALUES %s",
+            ((f"Employee {i}", f"Dept {i % 12}", f"/var/photos/{i}.jpg", encoding) for i in range(n)),
+            page_size=5000,
+        )
+    db.conn.commit()
+
+
+def _select_star(db: PostgresDB) -> int:
+    with db.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute("SELECT * FROM employees")
+        return len(cursor.fetchall())
+
+
+def _projected_dicts(db: PostgresDB) -> int:
+    with db.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees ORDER BY employee_id")
+        return len(cursor.fetchall())
+
+
+def _attendance_dicts(db: PostgresDB) -> int:
+    with db.conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(f"SELECT {ATTENDANCE_EMPLOYEE_COLUMNS} FROM employees ORDER BY employee_id")
+        return len(cursor.fetchall())
+
+
+def _attendance_tuples(db: PostgresDB) -> int:
+    with db.conn.cursor() as cursor:
+        cursor.execute(f"SELECT {ATTENDANCE_EMPLOYEE_COLUMNS} FROM employees ORDER BY employee_id")
+        return len(list(map(AttendanceEmployee._make, cursor)))
+
+
+def _measure(name: str, fn: Callable[[], int], repeat: int) -> None:
+    best, rows = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:42s} {rows / best:12.0f} rows/s | best={best * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark projected, tuple-based employee reads")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = PostgresDB()
+    try:
+        _seed(db, args.employees)
+        _measure("SELECT * -> RealDictRow", lambda: _select_star(db), args.repeat)
+        _measure(f"{len(EmployeeRow._fields)} columns -> RealDictRow", lambda: _projected_dicts(db), args.repeat)
+        _measure("get_all_employees -> EmployeeRow", lambda: len(db.get_all_employees()), args.repeat)
+        _measure(f"{len(AttendanceEmployee._fields)} columns -> RealDictRow", lambda: _attendance_dicts(db), args.repeat)
+        _measure(f"{len(AttendanceEmployee._fields)} columns -> AttendanceEmployee",
+                 lambda: _attendance_tuples(db), args.repeat)
+    finally:
+        db.conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# desktop_app/benchmarks/report_bench.py
+# Client-side cost of a monthly attendance report: a per-employee Python loop over
+# the aggregation output versus services.attendance_report.compute_monthly_stats.
+#
+#   python -m desktop_app.benchmarks.report_bench [--employees 50000] [--days 22]
+#
+# The aggregation output is synthesized in memory so the numbers isolate the work
+# done after Mongo returns its groups.
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from desktop_app.services.attendance_report import EmployeeMonthlyStats, compute_monthly_stats
+
+_IST_OFFSET_MS = 19_800_000
+
+
+def _groups(employees: int, days: int) -> List[Dict[str, Any]]:
+    rng = random.Random(7)
+    base = int(datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    groups = []
+    for i in range(employees):
+        present = [rng.random() < 0.9 for _ in range(days)]
+        punched = [base + d * 86_400_000 + rng.randint(3 * 3600_000, 5 * 3600_000) for d in range(days)]
+        late = [p and t % 86_400_000 > 3.5 * 3600_000 for p, t in zip(present, punched)]
+        groups.append({"_id": str(i), "name": f"Employee {i}", "department": f"Dept {i % 12}",
+                       "present": present, "late": late, "punched_ms": punched})
+    return groups
+
+
+def _loop(groups: List[Dict[str, Any]]) -> int:
+    rows = []
+    for g in groups:
+        present = late = timed = 0
+        arrival = 0.0
+        for p, l, t in zip(g["present"], g["late"], g["punched_ms"]):
+            if p:
+                present += 1
+                late += l
+                if t is not None:
+                    timed += 1
+                    arrival += ((t + _IST_OFFSET_MS) % 86_400_000) / 1000.0
+        rows.append(EmployeeMonthlyStats(g["_id"], g["name"], g["department"], present,
+                                         len(g["present"]) - present, late,
+                                         arrival / timed if timed else None))
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark monthly report statistics (client-side work)")
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=22)
+    args = parser.parse_args()
+
+    groups = _groups(args.employees, args.days)
+    for label, fn in (("python loop", _loop), ("numpy", lambda g: len(compute_monthly_stats(g)))):
+        start = time.perf_counter()
+        rows = fn(groups)
+        print(f"{label:12s} {(time.perf_counter() - start) * 1000:9.1f}ms for {rows} employees")
+
+
+if __name__ == "__main__":
+    main()
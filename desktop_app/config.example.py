@@ -18,5 +18,12 @@ MONGO_CONFIG = {
 # Default office shift: 9:00 AM IST, 1-minute grace
 DEFAULT_SHIFT_POLICY = ShiftPolicy(start_hour=9, start_minute=0, grace_minutes=1)
 
+# Per-employee / per-site shifts, applied when punches are recorded (site shifts by the backend,
+# which knows each kiosk's site; keep its SHIFT_POLICY_OVERRIDES setting in step) and to stored
+# punches by `python -m desktop_app.services.remarks_backfill`, e.g.
+# {"site": "north", "start_hour": 8, "start_minute": 30, "grace_minutes": 5}
+# {"employee_id": 42, "start_hour": 10, "start_minute": 0, "grace_minutes": 1}
+SHIFT_POLICY_OVERRIDES = []
+
 FACE_MATCH_TOLERANCE = 0.6
 FACE_SKIP_INTERVAL = 3
\ No newline at end of file
@@ -0,0 +1,139 @@
+# desktop_app/database/attendance_summary.py
+"""
+Daily attendance rollups: one document per (date, department, site) in
+`attendance_daily_summary` with counts of punches by status and remark, so
+dashboards and reports read O(days x departments) documents instead of every punch.
+
+Kept current two ways:
+  * new punches $inc their summary document as they are written (summary_increments);
+  * rollup_pipeline recomputes whole days from `logs` and $merges the result, which
+    the absentee job runs once it has marked the day.
+The recompute is authoritative: it corrects any increment lost to a crash, or
+overwritten by a punch that landed while the day was being recomputed.
+
+Driver-agnostic (plain pipelines and UpdateOne ops), so the kiosk's MongoDB and the
+backend's AsyncMongoDB share it.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+SUMMARY_COLLECTION = "attendance_daily_summary"
+SUMMARY_KEY_FIELDS = ("date", "department", "site")
+
+# counter field -> (log field, value)
+COUNTERS = {
+    "present": ("status", "present"),
+    "absent": ("status", "absent"),
+    "early": ("remarks", "early"),
+    "on_time": ("remarks", "on-time"),
+    "late": ("remarks", "late"),
+}
+
+
+def summary_key(doc: Dict[str, Any]) -> Tuple[datetime, str, str]:
+    """
+    (date, department, site) of a log document. Missing values become "" because
+    $merge cannot match on null fields.
+    """
+    employee = doc.get("employee") or {}
+    source = doc.get("source") or {}
+    return doc["attendance"]["date"], employee.get("department") or "", source.get("site") or ""
+
+
+def summary_increments(docs: Iterable[Dict[str, Any]], now: datetime) -> List[UpdateOne]:
+    """
+    Upserting $inc operations that add newly inserted log documents to their summaries.
+    """
+    totals: Dict[Tuple[datetime, str, str], Counter] = {}
+    for doc in docs:
+        counts = totals.setdefault(summary_key(doc), Counter())
+        counts["total"] += 1
+        attendance = doc["attendance"]
+        for counter, (field, value) in COUNTERS.items():
+            if attendance.get(field) == value:
+                counts[counter] += 1
+
+    return [
+        UpdateOne(
+            dict(zip(SUMMARY_KEY_FIELDS, key)),
+            {"$inc": dict(counts), "$set": {"updated_at": now}},
+            upsert=True
+        )
+        for key, counts in totals.items()
+    ]
+
+
+def failed_summaries(docs: Iterable[Dict[str, Any]], error: Exception) -> List[Dict[str, Any]]:
+    """
+    The summaries whose summary_increments(docs) op failed with `error`, as
+    {date, department, site, error}: those a BulkWriteError names, else all of them.
+    They miss these docs until rollup_pipeline recomputes their date.
+    """
+    keys = list(dict.fromkeys(summary_key(doc) for doc in docs))    # the order of summary_increments
+    if isinstance(error, BulkWriteError):
+        failed = [(keys[we["index"]], we.get("errmsg", "write error"))
+                  for we in error.details.get("writeErrors", [])]
+    else:
+        failed = [(key, str(error)) for key in keys]
+    return [{**dict(zip(SUMMARY_KEY_FIELDS, key)), "error": message} for key, message in failed]
+
+
+def rollup_pipeline(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """
+    Recompute the summaries of every day in [start, end) from `logs` and $merge them
+    into SUMMARY_COLLECTION, replacing the stored counts. Runs on the
+    (attendance.date) index of `logs`.
+    """
+    counters = {
+        counter: {"$sum": {"$cond": [{"$eq": [f"$attendance.{field}", value]}, 1, 0]}}
+        for counter, (field, value) in COUNTERS.items()
+    }
+    return [
+        {"$match": {"attendance.date": {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {
+                "date": "$attendance.date",
+                "department": {"$ifNull": ["$employee.department", ""]},
+                "site": {"$ifNull": ["$source.site", ""]},
+            },
+            "total": {"$sum": 1},
+            **counters,
+        }},
+        {"$project": {
+            "_id": 0,
+            "date": "$_id.date",
+            "department": "$_id.department",
+            "site": "$_id.site",
+            "total": 1,
+            **{counter: 1 for counter in COUNTERS},
+            "updated_at": "$$NOW",
+        }},
+        {"$merge": {
+            "into": SUMMARY_COLLECTION,
+            "on": list(SUMMARY_KEY_FIELDS),
+            "whenMatched": "replace",
+            "whenNotMatched": "insert",
+        }},
+    ]
+
+
+def summary_query(start: datetime, end: Optional[datetime] = None, department: Optional[str] = None,
+                  site: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Filter for the summaries of [start, end) (a single day if end is None), optionally one department / site.
+    """
+    query: Dict[str, Any] = {"date": {"$gte": start, "$lt": end or start + timedelta(days=1)}}
+    if department is not None:
+        query["department"] = department
+    if site is not None:
+        query["site"] = site
+    return query
+
+
+def create_summary_indexes(db) -> None:
+    # unique key required by $merge's `on`; also serves date-range reads
+    db[SUMMARY_COLLECTION].create_index([(field, 1) for field in SUMMARY_KEY_FIELDS], unique=True)
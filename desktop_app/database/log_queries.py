@@ -0,0 +1,224 @@
+# desktop_app/database/log_queries.py
+"""
+The query shapes the kiosk runs against `logs`, and an explain()-based check that
+each one is served by an index.
+
+MongoDB reads its filters and projections from here, so the shapes checked are the
+ones the app actually sends. Run against a migrated database to see how each shape
+is planned and which indexes are redundant:
+
+    python -m desktop_app.database.log_queries
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from desktop_app.utils.utils import current_date_utc_midnight, normalize_department
+
+# fields shown in the logs table; everything else (e.g. source metadata) stays on the server
+LOG_PROJECTION = {
+    "employee.id": 1, "employee.name": 1, "employee.department": 1,
+    "attendance.date": 1, "attendance.status": 1, "attendance.remarks": 1, "attendance.marked_by": 1,
+    "timestamp": 1,
+}
+
+# answered from the (attendance.date, attendance.status, employee.id) index alone
+PRESENT_IDS_PROJECTION = {"employee.id": 1, "_id": 0}
+
+LOG_PAGE_SORT = [("attendance.date", -1), ("_id", -1)]
+
+LOG_STATUSES = {"present", "absent"}
+LOG_REMARKS = {"early", "on-time", "late"}
+
+
+def present_ids_filter(date: datetime) -> Dict[str, Any]:
+    return {"attendance.date": date, "attendance.status": "present"}
+
+
+def _is_number(value: str) -> bool:
+    # isdigit() alone also accepts e.g. "²", which int() rejects
+    return value.isascii() and value.isdecimal()
+
+
+def _employee_id_clause(value: str) -> dict:
+    # punches store the Postgres id as an int, older absentee records as a str
+    return {"employee.id": {"$in": [value, int(value)]}} if _is_number(value) else {"employee.id": value}
+
+
+def _name_prefix_clause(value: str) -> dict:
+    # an anchored, case-sensitive regex on the lowercased field is a range scan on its index
+    return {"employee.name_lc": {"$regex": "^" + re.escape(value.lower())}}
+
+
+def _department_clause(value: str) -> dict:
+    # equality on the normalized field: tight bounds on its index, unlike a case-insensitive regex
+    return {"employee.department_lc": normalize_department(value)}
+
+
+def build_log_search_query(text: str) -> dict:
+    """
+    Translate the logs search box into an indexed Mongo filter. Terms are ANDed:
+      id:<x> or a bare number            exact employee id
+      name:<x>                           case-insensitive name prefix (employee.name_lc)
+      dept:<x>                           department, case-insensitive equality (employee.department_lc)
+      status:<x>, present, absent        attendance.status
+      remarks:<x>, early, on-time, late  attendance.remarks
+    Remaining words form one phrase matched as a name prefix or a department.
+    """
+    clauses, words = [], []
+    for term in text.split():
+        key, sep, value = term.partition(":")
+        key, value = (key.lower(), value.strip()) if sep else ("", term)
+        lower = value.lower()
+        if sep and not value:
+            continue
+        if key == "id" or (not key and _is_number(value)):
+            clauses.append(_employee_id_clause(value))
+        elif key == "name":
+            clauses.append(_name_prefix_clause(value))
+        elif key in ("dept", "department"):
+            clauses.append(_department_clause(value))
+        elif key == "status" or (not key and lower in LOG_STATUSES):
+            clauses.append({"attendance.status": lower})
+        elif key == "remarks" or (not key and lower in LOG_REMARKS):
+            clauses.append({"attendance.remarks": lower})
+        else:
+            words.append(term)
+
+    if words:
+        phrase = " ".join(words)
+        clauses.append({"$or": [_name_prefix_clause(phrase), _department_clause(phrase)]})
+    if not clauses:
+        return {}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class QueryShape(NamedTuple):
+    name: str
+    filter: Dict[str, Any]
+    projection: Optional[Dict[str, Any]] = None
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 0
+    # must be answered from the index without fetching documents
+    covered: bool = False
+    # False where index order can't give the sort (a name-prefix range, an id $in of two
+    # types) and the few matches of the week may be sorted in memory
+    indexed_sort: bool = True
+
+
+def query_shapes(day: Optional[datetime] = None) -> List[QueryShape]:
+    """The `logs` queries issued by the logs window, search box and absentee marking."""
+    day = day or current_date_utc_midnight()
+    week = {"attendance.date": {"$gte": day - timedelta(days=day.weekday()), "$lt": day + timedelta(days=1)}}
+
+    def search(name: str, text: str, indexed_sort: bool = True) -> QueryShape:
+        # as LogsWindow.apply_filters combines the date filter and the search box
+        return QueryShape(f"logs search, {name}", {"$and": [week, build_log_search_query(text)]},
+                          LOG_PROJECTION, LOG_PAGE_SORT, 200, indexed_sort=indexed_sort)
+
+    return [
+        QueryShape("logs table, date range", week, LOG_PROJECTION, LOG_PAGE_SORT, 200),
+        QueryShape("logs table, by punch time", {}, LOG_PROJECTION, [("timestamp", -1), ("_id", -1)], 200),
+        search("status", "status:absent"),
+        search("remarks", "late"),
+        search("department", "dept:sales"),
+        search("name prefix", "name:employee", indexed_sort=False),
+        search("employee id", "1", indexed_sort=False),
+        search("name or department", "Sales", indexed_sort=False),
+        QueryShape("present employee ids", present_ids_filter(day), PRESENT_IDS_PROJECTION, covered=True),
+        QueryShape("entry for employee and date", {"employee.id": "1", "attendance.date": day}, limit=1),
+    ]
+
+
+class PlanSummary(NamedTuple):
+    stages: Tuple[str, ...]
+    indexes: Tuple[str, ...]
+
+    def problems(self, shape: QueryShape) -> List[str]:
+        found = []
+        if "COLLSCAN" in self.stages:
+            found.append("collection scan")
+        if shape.covered and "FETCH" in self.stages:
+            found.append("fetches documents (not covered)")
+        if shape.sort and shape.indexed_sort and "SORT" in self.stages:
+            found.append("in-memory sort")
+        return found
+
+
+def plan_summary(explain: Dict[str, Any]) -> PlanSummary:
+    """Stage and index names of an explain() result's winning plan, root first."""
+    stages: List[str] = []
+    indexes: List[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if isinstance(node.get("stage"), str):
+                stages.append(node["stage"])
+            if isinstance(node.get("indexName"), str):
+                indexes.append(node["indexName"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(explain["queryPlanner"]["winningPlan"])
+    return PlanSummary(tuple(stages), tuple(indexes))
+
+
+def explain_shape(collection, shape: QueryShape) -> PlanSummary:
+    cursor = collection.find(shape.filter, shape.projection)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    if shape.limit:
+        cursor = cursor.limit(shape.limit)
+    return plan_summary(cursor.explain())
+
+
+def redundant_indexes(index_information: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    (index, covered_by) pairs for plain indexes (no unique/TTL/partial options) whose
+    keys are a prefix of another index, which can serve the same queries.
+    """
+    plain = {
+        name: list(info["key"]) for name, info in index_information.items()
+        if name != "_id_" and set(info) <= {"key", "v", "ns"}
+    }
+    found = []
+    for name, keys in plain.items():
+        for other, info in index_information.items():
+            other_keys = list(info["key"])
+            if other != name and len(other_keys) > len(keys) and other_keys[:len(keys)] == keys:
+                found.append((name, other))
+                break
+    return found
+
+
+def check_shapes(collection, shapes: Iterable[QueryShape]) -> List[Tuple[QueryShape, PlanSummary, List[str]]]:
+    results = []
+    for shape in shapes:
+        plan = explain_shape(collection, shape)
+        results.append((shape, plan, plan.problems(shape)))
+    return results
+
+
+def main() -> int:
+    from desktop_app.database.mongo_db import MongoDB
+
+    mongo_db = MongoDB()
+    try:
+        failed = False
+        for shape, plan, problems in check_shapes(mongo_db.collection, query_shapes()):
+            failed = failed or bool(problems)
+            status = "; ".join(problems) if problems else "ok"
+            print(f"{shape.name:30s} {' <- '.join(plan.stages):45s} {', '.join(plan.indexes) or '-':40s} {status}")
+        for name, covered_by in redundant_indexes(mongo_db.collection.index_information()):
+            print(f"index {name} is a prefix of {covered_by}")
+        return 1 if failed else 0
+    finally:
+        mongo_db.client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
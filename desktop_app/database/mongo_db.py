@@ -1,20 +1,37 @@
-from pymongo import MongoClient, ASCENDING
-from datetime import datetime, timezone, time
-from desktop_app.utils.utils import current_date_utc_midnight
+from pymongo import MongoClient, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta, timezone, time
+from desktop_app.utils.utils import current_date_utc_midnight, current_datetime_utc
 from desktop_app.config import MONGO_CONFIG
+from desktop_app.database.attendance_summary import (
+    SUMMARY_COLLECTION, failed_summaries, rollup_pipeline, summary_increments, summary_query
+)
+from desktop_app.database.log_queries import (
+    LOG_PROJECTION, PRESENT_IDS_PROJECTION, build_log_search_query, present_ids_filter
+)
+
+
+def _attendance_key(rec: dict) -> dict:
+    """
+    (employee.id, attendance.date) filter for one log. Numeric ids also match their str
+    form, which absentee logs written before ids were stored as ints carry.
+    """
+    employee_id = rec["employee"]["id"]
+    id_clause = {"$in": [employee_id, str(employee_id)]} if isinstance(employee_id, int) else employee_id
+    return {"employee.id": id_clause, "attendance.date": rec["attendance"]["date"]}
+
 
 class MongoDB:
     def __init__(self):
         self.client = MongoClient(MONGO_CONFIG['host'], MONGO_CONFIG['port'])
         self.db = self.client[MONGO_CONFIG['database']]
         self.collection = self.db['logs']
+        self.checkpoints = self.db['absentee_checkpoints']
+        self.daily_summary = self.db[SUMMARY_COLLECTION]
+
+        # MongoClient connects lazily, so construction stays cheap.
+        # Indexes are applied once by `python -m desktop_app.database.mongo_migrations`.
 
-        # Add indexes for date and employee_id
-        # Compound unique index to prevent duplocate employee/day entries
-        self.collection.create_index([("employee.id", ASCENDING), ("attendance.date", ASCENDING)], unique=True)
-        self.collection.create_index("attendance.date")
-        self.collection.create_index("employee.id")
-        
 
     def log_attendance(self, record: dict):
         """
@@ -22,12 +39,83 @@ class MongoDB:
         Caller can handle exceptions if they want to skip duplicates.
         """
         self.collection.insert_one(record)
+        self.increment_daily_summary([record])
         return True
 
     def get_logs(self):
         return list(self.collection.find())
-    
-    
+
+
+    def find_logs_page(self, query: dict, sort_field: str = "attendance.date", descending: bool = True,
+                       after: tuple | None = None, limit: int = 200) -> list[dict]:
+        """
+        One keyset page of logs ordered by (sort_field, _id), projected to LOG_PROJECTION.
+        after: (sort value, _id) of the last row of the previous page. Unlike skip(), the
+        cost of a page does not grow with how far the user has scrolled.
+        """
+        return list(self.logs_page_cursor(query, sort_field, descending, after, limit))
+
+
+    def logs_page_cursor(self, query: dict, sort_field: str = "attendance.date", descending: bool = True,
+                         after: tuple | None = None, limit: int = 200, batch_size: int = 0):
+        """
+        Cursor form of find_logs_page, for callers that consume the page as it arrives.
+        """
+        direction = DESCENDING if descending else ASCENDING
+        if after is not None:
+            op = "$lt" if descending else "$gt"
+            value, last_id = after
+            keyset = {"$or": [{sort_field: {op: value}}, {sort_field: value, "_id": {op: last_id}}]}
+            query = {"$and": [query, keyset]} if query else keyset
+        return (self.collection.find(query, LOG_PROJECTION)
+                .sort([(sort_field, direction), ("_id", direction)])
+                .limit(limit)
+                .batch_size(batch_size))
+
+
+    def count_logs(self, query: dict) -> int:
+        return self.collection.count_documents(query)
+
+
+    def iter_logs(self, query: dict, batch_size: int = 1000):
+        """
+        All logs matching query, newest first, projected to LOG_PROJECTION and streamed
+        from the server batch_size documents at a time (for exports).
+        """
+        return (self.collection.find(query, LOG_PROJECTION)
+                .sort([("attendance.date", DESCENDING), ("_id", DESCENDING)])
+                .batch_size(batch_size))
+
+
+    def aggregate_logs(self, pipeline: list[dict], hint=None, batch_size: int = 1000):
+        """
+        Run an aggregation over the logs, spilling large $group/$sort stages to disk.
+        """
+        kwargs = {"hint": hint} if hint is not None else {}
+        return self.collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size, **kwargs)
+
+
+    def iter_present_punches(self, start: datetime, end: datetime, batch_size: int = 1000):
+        """
+        _id, employee id, site, punch time and remark of the present logs of [start, end),
+        streamed batch_size at a time (for recomputing remarks).
+        """
+        query = {"attendance.date": {"$gte": start, "$lt": end}, "attendance.status": "present"}
+        projection = {"employee.id": 1, "source.site": 1, "timestamp": 1, "attendance.remarks": 1}
+        return self.collection.find(query, projection).batch_size(batch_size)
+
+
+    def set_remarks_bulk(self, remarks: list[tuple]) -> int:
+        """
+        Write (_id, remark) pairs to attendance.remarks in one unordered bulk_write.
+        Returns the number of documents modified.
+        """
+        if not remarks:
+            return 0
+        ops = [UpdateOne({"_id": _id}, {"$set": {"attendance.remarks": remark}}) for _id, remark in remarks]
+        return self.collection.bulk_write(ops, ordered=False).modified_count
+
+
     def check_valid_entry_for_date(self, employee_id, date_obj=None):
         """
         Returns True if an attendance record exists for the given employee_id and UTC date.
@@ -52,45 +140,132 @@ class MongoDB:
         return bool(exists)
     
     
-    def get_present_employee_ids(self) -> list[str]:
+    def get_present_employee_ids(self) -> set[str]:
         """
-        Returns a list of employee_ids marked 'present' for today's IST date.
+        Returns the set of employee_ids marked 'present' for today's IST date.
         Uses IST date at midnight for consistent querying.
         """
         today_utc = current_date_utc_midnight()
 
-        present_docs = self.collection.find(
-            {"attendance.date": today_utc, "attendance.status": "present"},
-            {"employee.id": 1, "_id": 0}
-        )
-        return [str(doc["employee"]["id"]) for doc in present_docs]
+        # covered by the (attendance.date, attendance.status, employee.id) index
+        present_docs = self.collection.find(present_ids_filter(today_utc), PRESENT_IDS_PROJECTION)
+        return {str(doc["employee"]["id"]) for doc in present_docs}
     
     
-    def insert_absentees_bulk(self, records: list[dict]) -> dict:
+    def insert_absentees_bulk(self, records: list, chunk_size: int = 1000) -> dict:
         """
-        Insert a list of attendance dicts. Uses ordered=False so the insert continues if duplicates found,
+        Insert a list of attendance dicts in chunks of chunk_size. Uses ordered=False so the insert continues if duplicates found,
         and returns a summary dict with inserted_count and errors.
         We assume records are already properly shaped (with date as datetime, timestamp as datetime, etc.)
+        Records may be dicts or RawBSONDocuments (AttendanceRecord.bulk_documents(raw=True)).
         """
-        if not records:
-            return {"inserted": 0, "skipped": 0, "errors": []}
+        summary = {"inserted": 0, "skipped": 0, "errors": []}
+        for start in range(0, len(records), chunk_size):
+            result = self._insert_chunk(records[start:start + chunk_size])
+            summary["inserted"] += result["inserted"]
+            summary["skipped"] += result["skipped"]
+            summary["errors"].extend(result["errors"])
+        return summary
+
 
+    def _insert_chunk(self, records: list) -> dict:
         try:
-            result = self.collection.insert_many(records, ordered=False)
-            inserted = len(result.inserted_ids)
-            return {"inserted": inserted, "skipped": 0, "errors": []}
-        except Exception as e:
+            self.collection.insert_many(records, ordered=False)
+            # no error means every record went in; inserted_ids omits raw documents
+            return {"inserted": len(records), "skipped": 0, "errors": []}
+        except BulkWriteError as e:
             # If duplicates are attempted (unique index), insert_many raises BulkWriteError.
             # We will analyze writeErrors to compute inserted vs skipped.
-            from pymongo.errors import BulkWriteError
-            if isinstance(e, BulkWriteError):
+            details = e.details
+            write_errors = details.get("writeErrors", [])
+            # count duplicated vs other
+            dup_count = sum(1 for we in write_errors if we.get("code") == 11000)
+            inserted = details.get("nInserted", 0)
+            other_errors = [we for we in write_errors if we.get("code") != 11000]
+            return {"inserted": inserted, "skipped": dup_count, "errors": other_errors}
+        except Exception as e:
+            return {"inserted": 0, "skipped": 0, "errors": [str(e)]}
+
+
+    def upsert_absentees_bulk(self, records: list[dict], chunk_size: int = 1000) -> dict:
+        """
+        Insert-if-absent on (employee.id, attendance.date) in unordered bulk_writes of chunk_size.
+        Existing records (a present punch, or an absentee from an earlier run) are matched and
+        left untouched ($setOnInsert), so reruns cost no duplicate-key errors. Logs written
+        before absentee ids were stored as ints carry a str id; the filter matches both.
+        Records must not carry _id (AttendanceRecord.bulk_documents(with_id=False)).
+        """
+        summary = {"inserted": 0, "skipped": 0, "errors": []}
+        for start in range(0, len(records), chunk_size):
+            ops = [
+                UpdateOne(
+                    _attendance_key(rec),
+                    {"$setOnInsert": rec},
+                    upsert=True
+                )
+                for rec in records[start:start + chunk_size]
+            ]
+            try:
+                result = self.collection.bulk_write(ops, ordered=False)
+                summary["inserted"] += result.upserted_count
+                summary["skipped"] += result.matched_count
+            except BulkWriteError as e:
                 details = e.details
                 write_errors = details.get("writeErrors", [])
-                # count duplicated vs other
-                dup_count = sum(1 for we in write_errors if we.get("code") == 11000)
-                inserted = details.get("nInserted", 0)
-                other_errors = [we for we in write_errors if we.get("code") != 11000]
-                return {"inserted": inserted, "skipped": dup_count, "errors": other_errors}
-            else:
-                return {"inserted": 0, "skipped": 0, "errors": [str(e)]}
-        
\ No newline at end of file
+                # a punch racing the upsert for the same (int id, date) key loses with 11000: already marked
+                summary["inserted"] += details.get("nUpserted", 0)
+                summary["skipped"] += details.get("nMatched", 0) + sum(
+                    1 for we in write_errors if we.get("code") == 11000)
+                summary["errors"].extend(we for we in write_errors if we.get("code") != 11000)
+        return summary
+
+
+    def get_absentee_checkpoint(self, date_key: str) -> dict | None:
+        return self.checkpoints.find_one({"_id": date_key})
+
+
+    def save_absentee_checkpoint(self, date_key: str, fields: dict) -> None:
+        """
+        Upsert the per-day absentee-marking progress (see services.absentee_marking).
+        """
+        self.checkpoints.update_one(
+            {"_id": date_key},
+            {"$set": {**fields, "updated_at": current_datetime_utc()}},
+            upsert=True
+        )
+
+
+    def increment_daily_summary(self, records: list[dict]) -> dict:
+        """
+        Add newly inserted log records to attendance_daily_summary.
+        Returns {"updated", "errors": [{"date", "department", "site", "error"}]}; a summary
+        listed in errors is short until rollup_daily_summary of its date recomputes it.
+        """
+        ops = summary_increments(records, current_datetime_utc())
+        if not ops:
+            return {"updated": 0, "errors": []}
+        try:
+            self.daily_summary.bulk_write(ops, ordered=False)
+            return {"updated": len(ops), "errors": []}
+        except Exception as e:
+            errors = failed_summaries(records, e)
+            dates = sorted({err["date"].date().isoformat() for err in errors})
+            print(f"Daily summary increment failed; run rollup_daily_summary for {', '.join(dates)}: {errors}")
+            return {"updated": len(ops) - len(errors), "errors": errors}
+
+
+    def rollup_daily_summary(self, start: datetime, end: datetime | None = None) -> None:
+        """
+        Recompute the summaries of [start, end) (one day if end is None) from the logs.
+        """
+        end = end or start + timedelta(days=1)
+        self.collection.aggregate(rollup_pipeline(start, end))
+
+
+    def get_daily_summary(self, start: datetime, end: datetime | None = None,
+                          department: str | None = None, site: str | None = None) -> list[dict]:
+        """
+        Per (date, department, site) counts for [start, end): total, present, absent, early, on_time, late.
+        """
+        cursor = self.daily_summary.find(summary_query(start, end, department, site), {"_id": 0})
+        return list(cursor.sort([("date", ASCENDING), ("department", ASCENDING), ("site", ASCENDING)]))
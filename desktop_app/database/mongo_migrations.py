@@ -0,0 +1,145 @@
+"""
+Versioned, idempotent MongoDB schema steps for the kiosk's `logs` collection.
+
+Run once per database (not on every app start):
+
+    python -m desktop_app.database.mongo_migrations
+
+The applied version is stored in `schema_version` under _id "desktop", so re-runs
+only apply newer steps and MongoDB() construction never builds indexes.
+"""
+import sys
+from typing import Callable, List, Tuple
+from pymongo import ASCENDING, DESCENDING
+from desktop_app.database.attendance_summary import create_summary_indexes
+from desktop_app.utils.utils import current_datetime_utc
+
+SCHEMA_COLLECTION = "schema_version"
+SCHEMA_ID = "desktop"
+CHECKPOINT_TTL_SECONDS = 30 * 24 * 3600
+
+
+def _v1_base_indexes(db) -> None:
+    logs = db["logs"]
+    # Compound unique index to prevent duplicate employee/day entries
+    logs.create_index([("employee.id", ASCENDING), ("attendance.date", ASCENDING)], unique=True)
+    logs.create_index("attendance.date")
+    logs.create_index("employee.id")
+
+
+def _v2_absentee_checkpoints(db) -> None:
+    # per-day progress is only needed until the day's run completes; keep a month for auditing
+    db["absentee_checkpoints"].create_index("updated_at", expireAfterSeconds=CHECKPOINT_TTL_SECONDS)
+
+
+def _v3_log_pagination_indexes(db) -> None:
+    logs = db["logs"]
+    # keyset pages of the logs table: (sort field, _id), newest first
+    logs.create_index([("attendance.date", DESCENDING), ("_id", DESCENDING)])
+    logs.create_index([("timestamp", DESCENDING), ("_id", DESCENDING)])
+
+
+def _v4_log_search(db) -> None:
+    logs = db["logs"]
+    # backfill the normalized name (utils.normalize_name) on logs written before it existed
+    logs.update_many(
+        {"employee.name_lc": {"$exists": False}, "employee.name": {"$type": "string"}},
+        [{"$set": {"employee.name_lc": {"$toLower": {"$trim": {"input": "$employee.name"}}}}}]
+    )
+    # search terms (see mongo_db.build_log_search_query) combined with the date filter
+    logs.create_index([("employee.name_lc", ASCENDING), ("attendance.date", DESCENDING)])
+    logs.create_index([("employee.department", ASCENDING), ("attendance.date", DESCENDING)])
+    logs.create_index([("attendance.status", ASCENDING), ("attendance.date", DESCENDING)])
+    logs.create_index([("attendance.remarks", ASCENDING), ("attendance.date", DESCENDING)])
+
+
+def _v5_daily_summary(db) -> None:
+    create_summary_indexes(db)
+
+
+def _v6_query_shape_indexes(db) -> None:
+    logs = db["logs"]
+    # covering index for get_present_employee_ids (see log_queries.query_shapes)
+    logs.create_index([("attendance.date", ASCENDING), ("attendance.status", ASCENDING),
+                       ("employee.id", ASCENDING)])
+    # status/remarks searches page by (date, _id); without the _id key every page sorts a whole day in memory
+    for field in ("attendance.status", "attendance.remarks"):
+        logs.create_index([(field, ASCENDING), ("attendance.date", DESCENDING), ("_id", DESCENDING)])
+        _drop_index_if_exists(logs, [(field, ASCENDING), ("attendance.date", DESCENDING)])
+
+
+def _v7_department_search(db) -> None:
+    logs = db["logs"]
+    # backfill the normalized department (utils.normalize_department), as v4 does for the name
+    logs.update_many(
+        {"employee.department_lc": {"$exists": False}, "employee.department": {"$type": "string"}},
+        [{"$set": {"employee.department_lc": {"$toLower": {"$trim": {"input": "$employee.department"}}}}}]
+    )
+    logs.create_index([("employee.department_lc", ASCENDING), ("attendance.date", DESCENDING),
+                       ("_id", DESCENDING)])
+    _drop_index_if_exists(logs, [("employee.department", ASCENDING), ("attendance.date", DESCENDING)])
+
+
+def _drop_index_if_exists(collection, keys) -> None:
+    for name, info in collection.index_information().items():
+        if list(info["key"]) == keys:
+            collection.drop_index(name)
+
+
+# (version, description, step). Steps must be safe to re-run.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "base indexes for logs", _v1_base_indexes),
+    (2, "TTL index for absentee checkpoints", _v2_absentee_checkpoints),
+    (3, "keyset pagination indexes for logs", _v3_log_pagination_indexes),
+    (4, "normalized employee name and search indexes for logs", _v4_log_search),
+    (5, "attendance_daily_summary key index", _v5_daily_summary),
+    (6, "covering present-ids index; (date, _id) order for status/remarks searches", _v6_query_shape_indexes),
+    (7, "normalized employee department and its search index for logs", _v7_department_search),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(db) -> int:
+    doc = db[SCHEMA_COLLECTION].find_one({"_id": SCHEMA_ID})
+    return int(doc.get("version", 0)) if doc else 0
+
+
+def migrate(db) -> int:
+    """
+    Apply every step newer than the recorded version. Returns the resulting version.
+    """
+    current = get_schema_version(db)
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"Applying mongo schema v{version}: {description}")
+        step(db)
+        db[SCHEMA_COLLECTION].update_one(
+            {"_id": SCHEMA_ID},
+            {
+                "$set": {"version": version, "updated_at": current_datetime_utc()},
+                "$push": {"history": {"version": version, "description": description,
+                                      "applied_at": current_datetime_utc()}}
+            },
+            upsert=True
+        )
+        current = version
+    return current
+
+
+def main() -> int:
+    from desktop_app.database.mongo_db import MongoDB
+
+    mongo_db = MongoDB()
+    try:
+        before = get_schema_version(mongo_db.db)
+        after = migrate(mongo_db.db)
+        print(f"Mongo schema: v{before} -> v{after} (latest v{LATEST_VERSION})")
+        return 0
+    finally:
+        mongo_db.client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
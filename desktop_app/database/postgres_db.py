@@ -1,8 +1,28 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from typing import List, NamedTuple, Optional
 from desktop_app.config import POSTGRES_CONFIG
 import pickle   # for serializing face encodings
 
+
+# Typed rows for the hot read paths: built from plain tuple cursors, so no per-row dict,
+# and their columns are selected explicitly, so face_encoding is never transferred.
+class EmployeeRow(NamedTuple):
+    employee_id: int
+    name: str
+    department: str
+    photo_path: Optional[str]
+
+
+class AttendanceEmployee(NamedTuple):
+    employee_id: int
+    name: str
+    department: str
+
+
+EMPLOYEE_COLUMNS = ", ".join(EmployeeRow._fields)
+ATTENDANCE_EMPLOYEE_COLUMNS = ", ".join(AttendanceEmployee._fields)
+
 class PostgresDB:
     def __init__(self):
         self.conn = psycopg2.connect(**POSTGRES_CONFIG)
@@ -42,18 +62,43 @@ class PostgresDB:
         self.cursor.execute(query, (photo_path, employee_id))
         self.conn.commit()
     
-    def get_all_employees(self):
-        self.cursor.execute("SELECT * FROM employees")
-        return self.cursor.fetchall()
+    def get_all_employees(self) -> List[EmployeeRow]:
+        """Every employee without the face encoding (see get_all_encodings for those)."""
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees ORDER BY employee_id")
+            return list(map(EmployeeRow._make, cursor))
     
-    def get_employee_by_id(self, employee_id: int):
-        query = """
-            SELECT employee_id, name, department, photo_path 
-            FROM employees
-            WHERE employee_id = %s;
+    def count_employees(self, after_id: int | None = None) -> int:
+        self.cursor.execute("SELECT COUNT(*) AS total FROM employees WHERE employee_id > %s",
+                            (after_id if after_id is not None else -1,))
+        return self.cursor.fetchone()["total"]
+
+    def iter_employees_for_attendance(self, batch_size: int = 5000, after_id: int | None = None):
         """
-        self.cursor.execute(query, (employee_id,))
-        return self.cursor.fetchone()
+        Streams AttendanceEmployee rows in employee_id order through a server-side
+        cursor, batch_size rows per round-trip, so large tables are never held in
+        memory and encodings / photo paths are never transferred.
+        after_id resumes after that employee (absentee-marking checkpoints).
+        """
+        cursor = self.conn.cursor(name="employees_for_attendance")
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(
+                f"SELECT {ATTENDANCE_EMPLOYEE_COLUMNS} FROM employees "
+                "WHERE employee_id > %s ORDER BY employee_id",
+                (after_id if after_id is not None else -1,)
+            )
+            yield from map(AttendanceEmployee._make, cursor)
+        finally:
+            cursor.close()
+            # a named cursor lives in a transaction; end it so the connection isn't left idle in one
+            self.conn.commit()
+    
+    def get_employee_by_id(self, employee_id: int) -> Optional[EmployeeRow]:
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employees WHERE employee_id = %s;", (employee_id,))
+            row = cursor.fetchone()
+        return EmployeeRow._make(row) if row else None
     
     def get_all_encodings(self):
         """
@@ -85,6 +85,12 @@ class AttendanceWindow(QWidget):
 
         # Track marked employees in this session to avoid duplicates
         self._marked_today = set()  
+
+        # Set after operator login; when present punches go to the backend API
+        # instead of straight into Mongo
+        self.uploader = None
+        # Set once the device is provisioned; when present the gallery comes from the API
+        self.gallery = None
         
         # Track currently detected faces for persistent rectangle drawing
         # key: employee_id, value: (bbox, last_seen_timestamp)
@@ -114,6 +120,13 @@ class AttendanceWindow(QWidget):
         Load known encodings from Postgres into memory for fast comparison.
         Returns tuple (ids_list, encodings_array, meta_list)
         """
+        if self.gallery is not None:
+            try:
+                self.gallery.sync()
+                return self.gallery.snapshot()
+            except Exception as e:
+                print(f"[WARN] Gallery sync failed, falling back to Postgres: {e}")
+
         rows = self.post_db.get_all_encodings()
         if not rows:
             return [], np.empty((0, 128)), []
@@ -297,13 +310,14 @@ class AttendanceWindow(QWidget):
         self.current_faces[employee_id] = (bbox, time.time())
 
         with self._attendance_lock:
-            if self.mongo_db.check_valid_entry_for_date(employee_id):
-                print(f"Attendance already marked for {employee_id} for today.")
-                return
-
             if employee_id in self._marked_today:
                 print(f"Attendance already marked for {employee_id}. Skipping.")
                 return  # Already marked in this session
+
+            # the server dedupes (employee, date) itself; only the direct-Mongo path checks first
+            if self.uploader is None and self.mongo_db.check_valid_entry_for_date(employee_id):
+                print(f"Attendance already marked for {employee_id} for today.")
+                return
             
             employee = self.meta.get(employee_id)
             if not employee:
@@ -317,7 +331,11 @@ class AttendanceWindow(QWidget):
                 marked_by="System"
             )
             try:
-                success = self.mongo_db.log_attendance(record.to_dict())
+                if self.uploader is not None:
+                    self.uploader.submit(record)
+                    success = True
+                else:
+                    success = self.mongo_db.log_attendance(record.to_dict())
                 if success:
                     self._marked_today.add(employee_id)
                     self.show_feedback(f"Attendance marked for {employee['name']}", "success")
@@ -327,6 +345,15 @@ class AttendanceWindow(QWidget):
                 self.show_feedback("Error logging attendance", "error")
 
     
+    def set_uploader(self, uploader) -> None:
+        self.uploader = uploader
+
+
+    def set_gallery(self, gallery) -> None:
+        self.gallery = gallery
+        self.ids, self.encodings, self.meta = self._prepare_known_encodings()
+
+    
     # Feedback overlay helpers
     def show_feedback(self, message: str, message_type: str = "info") -> None:
         """Show adaptive feedback message (success, error, info) with fade-out animation."""
@@ -0,0 +1,184 @@
+# desktop_app/gui/logs_model.py
+"""
+Lazily fetched table model for the attendance logs.
+
+Rows are pulled from Mongo one keyset page at a time when the view scrolls to the
+bottom (canFetchMore/fetchMore), and are stored as tuples of display strings, so
+opening the logs costs one page regardless of how many punches the collection
+holds. Pages are loaded by a LogLoaderWorker on the global thread pool and arrive
+in batches; changing the query bumps a generation counter so late results of the
+old query are ignored.
+"""
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QBrush
+
+from desktop_app.threads.log_loader import LogLoaderWorker
+from desktop_app.utils.log_format import COLUMNS, Row, flatten_log, log_row
+
+STATUS_COLUMN = 4
+
+# columns the server can sort (and page) by; always-present datetimes, so keyset
+# comparisons never skip documents
+SORT_FIELDS = {3: "attendance.date", 5: "timestamp"}
+DEFAULT_SORT_COLUMN = 3
+
+
+def _field_value(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+def _keyset(sort_field: str, doc: Dict[str, Any]) -> Tuple[Any, Any]:
+    return _field_value(doc, sort_field), doc["_id"]
+
+
+class AttendanceLogModel(QAbstractTableModel):
+    PAGE_SIZE = 200
+
+    loading_changed = pyqtSignal(bool)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.thread_pool = QThreadPool.globalInstance()
+        self._rows: List[Row] = []
+        self._query: Optional[Dict[str, Any]] = None
+        self.sort_column = DEFAULT_SORT_COLUMN
+        self.sort_order = Qt.SortOrder.DescendingOrder
+        self._sort_field = SORT_FIELDS[DEFAULT_SORT_COLUMN]
+        self._descending = True
+        self._after: Optional[Tuple[Any, Any]] = None
+        self._exhausted = True
+        self._generation = 0
+        self._worker: Optional[LogLoaderWorker] = None
+
+
+    def set_query(self, query: Dict[str, Any]) -> None:
+        """
+        Replace the Mongo filter and load the first page.
+        """
+        self._query = query
+        self.reload()
+
+
+    def reload(self) -> None:
+        self.cancel()
+        self.beginResetModel()
+        self._rows = []
+        self._after = None
+        self._exhausted = self._query is None
+        self.endResetModel()
+        if not self._exhausted:
+            self.fetchMore(QModelIndex())
+
+
+    def cancel(self) -> None:
+        """Abandon the page being loaded; its remaining results are discarded."""
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+            self.loading_changed.emit(False)
+
+
+    def is_loading(self) -> bool:
+        return self._worker is not None
+
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section][0]
+        return None
+
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == STATUS_COLUMN:
+            present = "present" in self._rows[index.row()][STATUS_COLUMN].lower()
+            return QBrush(Qt.GlobalColor.darkGreen if present else Qt.GlobalColor.red)
+        return None
+
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and self._worker is None
+
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        """
+        Start loading the next page in the background; rows are appended as batches arrive.
+        """
+        if parent.isValid() or self._exhausted or self._worker is not None:
+            return
+        worker = LogLoaderWorker(self.db, self._generation, self._query, self._sort_field, self._descending,
+                                 self._after, self.PAGE_SIZE, row_factory=log_row,
+                                 key_factory=partial(_keyset, self._sort_field))
+        worker.signals.batch.connect(self._on_batch)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.error.connect(self._on_error)
+        self._worker = worker
+        self.loading_changed.emit(True)
+        self.thread_pool.start(worker)
+
+
+    def _on_batch(self, generation: int, rows: List[Row]) -> None:
+        if generation != self._generation or not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+
+    def _on_finished(self, generation: int, after, exhausted: bool) -> None:
+        if generation != self._generation:
+            return
+        self._after = after
+        self._exhausted = exhausted
+        self._worker = None
+        self.loading_changed.emit(False)
+
+
+    def _on_error(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+        # stop paging; Refresh starts over
+        self._exhausted = True
+        self._worker = None
+        self.loading_changed.emit(False)
+        self.load_failed.emit(message)
+
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Server-side sort. Only SORT_FIELDS columns can be paged in order; others keep the current order.
+        """
+        field = SORT_FIELDS.get(column)
+        if field is None:
+            return
+        descending = order == Qt.SortOrder.DescendingOrder
+        if (field, descending) == (self._sort_field, self._descending):
+            return
+        self.sort_column, self.sort_order = column, order
+        self._sort_field, self._descending = field, descending
+        if self._query is not None:
+            self.reload()
@@ -1,23 +1,33 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QComboBox,
-    QLineEdit, QHeaderView, QAbstractItemView
-)
-from PyQt6.QtCore import Qt
-from datetime import datetime, timedelta
-from desktop_app.utils.utils import ( 
-    current_date_utc_midnight,
-    get_ist_time_from_utc, get_ist_date_from_utc
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QComboBox,
+    QLineEdit, QHeaderView, QAbstractItemView, QLabel, QProgressBar, QFileDialog, QMessageBox
 )
+from PyQt6.QtCore import Qt, QTimer, QThreadPool
+from datetime import timedelta
+from desktop_app.gui.logs_model import AttendanceLogModel, DEFAULT_SORT_COLUMN, SORT_FIELDS, flatten_log
+from desktop_app.database.mongo_db import build_log_search_query
+from desktop_app.services.log_export import FORMATS
+from desktop_app.threads.log_exporter import LogExportWorker
+from desktop_app.utils.utils import current_date_utc_midnight, get_filename_wrt_date_filter_and_searchbox
 
 class LogsWindow(QWidget):
+    SEARCH_DEBOUNCE_MS = 300
+
     def __init__(self, db, parent=None):
         super().__init__(parent)
         self.db = db
         self.setWindowTitle("Attendance Logs")
         self.resize(800, 500)
 
-        self.all_logs = []          # store all logs fetched from MongoDB
-        self.filtered_logs = []     # store filtered logs based on search/filter
+        # rows are fetched from MongoDB page by page, in the background, as the table scrolls
+        self.model = AttendanceLogModel(db, self)
+        self.model.loading_changed.connect(self.on_loading_changed)
+        self.model.load_failed.connect(self.on_load_failed)
+        self.model.rowsInserted.connect(self.update_status)
+        self.model.modelReset.connect(self.update_status)
+        self.query = {}
+        self.current_query = {}
+        self.export_worker = None
 
         main_layout = QVBoxLayout()
 
@@ -30,10 +40,14 @@ class LogsWindow(QWidget):
         self.date_filter.currentIndexChanged.connect(self.load_logs)
         top_layout.addWidget(self.date_filter)
 
-        # Search box
+        # Search box; queries run once typing pauses for SEARCH_DEBOUNCE_MS
         self.search_box = QLineEdit()
-        self.search_box.setPlaceholderText("Search logs")
-        self.search_box.textChanged.connect(self.apply_filters)
+        self.search_box.setPlaceholderText("Search: id, name, department, status (e.g. dept:HR late)")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.search_box.textChanged.connect(self.search_timer.start)
         top_layout.addWidget(self.search_box)
 
         # Reset Filter button
@@ -41,13 +55,17 @@ class LogsWindow(QWidget):
         self.btn_reset_filter.clicked.connect(self.reset_filters)
         top_layout.addWidget(self.btn_reset_filter)
 
+        # Export button (doubles as cancel while an export runs)
+        self.btn_export = QPushButton("Export")
+        self.btn_export.clicked.connect(self.export_logs)
+        top_layout.addWidget(self.btn_export)
+
         # Add top_layout into main layout
         main_layout.addLayout(top_layout)
 
         # Table to display logs
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["Employee ID", "Name", "Department","Date", "Status", "Timestamp", "Remarks", "Marked By"])
+        self.table = QTableView()
+        self.table.setModel(self.model)
 
         # Static UI styling (apply once)
         self.table.setAlternatingRowColors(True)
@@ -55,12 +73,28 @@ class LogsWindow(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSortIndicator(DEFAULT_SORT_COLUMN, Qt.SortOrder.DescendingOrder)
         self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_indicator_changed)
         main_layout.addWidget(self.table)
 
         # Apply custom header and table styling
         self.setup_table_style()
 
+        # Loading status: row count plus a busy bar while a page is being fetched
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        status_layout.addWidget(self.status_label)
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setRange(0, 0)
+        self.loading_bar.setMaximumHeight(10)
+        self.loading_bar.setVisible(False)
+        status_layout.addWidget(self.loading_bar)
+        self.export_label = QLabel("")
+        status_layout.addWidget(self.export_label)
+        main_layout.addLayout(status_layout)
+
         # Button to refresh logs
         self.btn_refresh = QPushButton("Refresh Logs")
         self.btn_refresh.clicked.connect(self.load_logs)
@@ -86,12 +120,12 @@ class LogsWindow(QWidget):
         """)
 
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #d0d0d0;
                 selection-background-color: #dfe6e9;
                 selection-color: #2d3436;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 2px;
             }
         """)
@@ -123,28 +157,20 @@ class LogsWindow(QWidget):
         if start_date and end_date:
             query["attendance.date"] = {"$gte": start_date, "$lt": end_date}
 
-        # Fetch logs
-        raw_logs = list(self.db.collection.find(query).sort("attendance.date", -1)) # Sort by the most recent
-
-        # Flatten and convert times to IST
-        self.all_logs = [self.flatten_log(log) for log in raw_logs]
-
-        # Apply search filters
-        self.apply_filters()    
+        self.query = query
+        self.apply_filters()
 
 
     def apply_filters(self):
-        """Apply search-based filtering to logs"""
-        search_text = self.search_box.text().lower().strip()
+        """Combine the date filter with the search box as a Mongo query; the model re-fetches from the first page."""
+        self.search_timer.stop()
+        search_query = build_log_search_query(self.search_box.text())
 
-        if not search_text:
-            self.filtered_logs = self.all_logs
-        else:
-            self.filtered_logs = [
-                log for log in self.all_logs
-                if any(search_text in str(value).lower() for value in log.values())
-            ]
-        self.update_table()
+        query = self.query
+        if search_query:
+            query = {"$and": [self.query, search_query]} if self.query else search_query
+        self.current_query = query
+        self.model.set_query(query)
 
 
     def reset_filters(self) -> None:
@@ -155,78 +181,98 @@ class LogsWindow(QWidget):
         self.search_box.clear()
         self.date_filter.setCurrentIndex(0)
 
-        # Reset all column header sorts
-        header = self.table.horizontalHeader()
-        self.table.setSortingEnabled(False)
-        header.setSortIndicatorShown(False)
-        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        # Back to the default order (newest first); the sort indicator drives model.sort()
+        self.table.horizontalHeader().setSortIndicator(DEFAULT_SORT_COLUMN, Qt.SortOrder.DescendingOrder)
 
-        # Reload all logs
+        # Reload all logs (also cancels the search debounce started by clear())
         self.load_logs()
-        
-        self.table.setSortingEnabled(True)  # Re-enable sorting
-        header.setSortIndicatorShown(True)
 
         self.btn_reset_filter.setEnabled(True)
 
 
-    def add_table_item(self, row, col, text):
-        """Helper to create a centered, styled table item."""
-        item = QTableWidgetItem(str(text))
-        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+    def export_logs(self) -> None:
+        """Export everything matching the current filters (not just the loaded rows) in the background."""
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.btn_export.setEnabled(False)
+            return
+
+        default_name = get_filename_wrt_date_filter_and_searchbox(
+            self.date_filter.currentText(), self.search_box.text())
+        name_filters = ";;".join(f"{fmt.upper()} files (*.{fmt})" for fmt in FORMATS)
+        path, _ = QFileDialog.getSaveFileName(self, "Export logs", f"{default_name}.{FORMATS[0]}", name_filters)
+        if not path:
+            return
+
+        worker = LogExportWorker(self.db, self.current_query, path)
+        worker.signals.progress.connect(self.on_export_progress)
+        worker.signals.done.connect(self.on_export_done)
+        worker.signals.cancelled.connect(self.on_export_cancelled)
+        worker.signals.error.connect(self.on_export_error)
+        self.export_worker = worker
+        self.btn_export.setText("Cancel export")
+        self.export_label.setText("Exporting...")
+        QThreadPool.globalInstance().start(worker)
 
-        if col == 4:
-            status_text = str(text).lower()
-            if "present" in status_text:
-                item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                item.setForeground(Qt.GlobalColor.red)
 
-        return item
+    def on_export_progress(self, rows: int, total: int) -> None:
+        self.export_label.setText(f"Exporting... {rows}/{total} rows")
 
 
-    def update_table(self):
-        """Update QTableWidget with current filtered logs."""
+    def on_export_done(self, summary: dict) -> None:
+        self.finish_export(f"Exported {summary['rows']} rows to {summary['path']}")
 
-        self.table.setSortingEnabled(False) # Temporarily disable sorting
 
-        self.table.setRowCount(len(self.filtered_logs))
+    def on_export_cancelled(self) -> None:
+        self.finish_export("Export cancelled")
+
+
+    def on_export_error(self, message: str) -> None:
+        print(f"Log export failed: {message}")
+        self.finish_export("Export failed")
+        QMessageBox.critical(self, "Export failed", message.splitlines()[0])
+
+
+    def finish_export(self, message: str) -> None:
+        self.export_worker = None
+        self.btn_export.setText("Export")
+        self.btn_export.setEnabled(True)
+        self.export_label.setText(message)
+
+
+    def on_loading_changed(self, loading: bool) -> None:
+        self.loading_bar.setVisible(loading)
+        self.update_status()
+        if not loading:
+            # the view only asks for more rows on scroll; keep loading until the viewport is full
+            scroll_bar = self.table.verticalScrollBar()
+            if scroll_bar.value() >= scroll_bar.maximum() and self.model.canFetchMore():
+                self.model.fetchMore()
+
+
+    def on_load_failed(self, message: str) -> None:
+        print(f"Failed to load attendance logs: {message}")
+        self.status_label.setText("Failed to load logs. Press Refresh Logs to retry.")
+
+
+    def update_status(self, *args) -> None:
+        rows = self.model.rowCount()
+        if self.model.is_loading():
+            self.status_label.setText(f"Loading... {rows} rows")
+        else:
+            more = " (scroll for more)" if self.model.canFetchMore() else ""
+            self.status_label.setText(f"{rows} rows{more}")
 
-        for row, log in enumerate(self.filtered_logs):
-            self.table.setItem(row, 0, self.add_table_item(row, 0, log.get("employee_id", "")))
-            self.table.setItem(row, 1, self.add_table_item(row, 1, log.get("name", "")))
-            self.table.setItem(row, 2, self.add_table_item(row, 2, log.get("department", "")))
-            self.table.setItem(row, 3, self.add_table_item(row, 3, log.get("date", "")))
-            self.table.setItem(row, 4, self.add_table_item(row, 4, log.get("status", "")))
-            self.table.setItem(row, 5, self.add_table_item(row, 5, log.get("timestamp", "")))
-            self.table.setItem(row, 6, self.add_table_item(row, 6, log.get("remarks", "")))
-            self.table.setItem(row, 7, self.add_table_item(row, 7, log.get("marked_by", "")))
 
-        self.table.setSortingEnabled(True) # Re-enable sorting after population
+    def on_sort_indicator_changed(self, column, order) -> None:
+        """Only date/timestamp are sorted server-side; snap the indicator back for other columns."""
+        if column not in SORT_FIELDS:
+            header = self.table.horizontalHeader()
+            header.blockSignals(True)
+            header.setSortIndicator(self.model.sort_column, self.model.sort_order)
+            header.blockSignals(False)
 
 
     def flatten_log(self, log: dict) -> dict:
         """Flatten nested MongoDB log document for display/export."""
-        employee = log.get("employee", {})
-        attendance = log.get("attendance", {})
-        timestamp = log.get("timestamp", "")
-
-        flattened =  {
-            "employee_id": employee.get("id", ""),
-            "name": employee.get("name", ""),
-            "department": employee.get("department", ""),
-            "date": attendance.get("date", ""),
-            "status": attendance.get("status", ""),
-            "remarks": attendance.get("remarks", ""),
-            "marked_by": attendance.get("marked_by", ""),
-            "timestamp": timestamp
-        }  
-
-        # Convert UTC -> IST for display
-        if isinstance(flattened["timestamp"], datetime):
-            flattened["timestamp"] = get_ist_time_from_utc(flattened["timestamp"])
-        if isinstance(flattened["date"], datetime):
-            flattened["date"] = get_ist_date_from_utc(flattened["date"])
-
-        return flattened
-   
\ No newline at end of file
+        return flatten_log(log)
@@ -10,6 +10,8 @@ from desktop_app.utils.utils import center_window
 
 from desktop_app.threads.provisioning_thread import ProvisioningThread
 from desktop_app.api.api_client import ApiClient
+from desktop_app.services.attendance_uploader import AttendanceUploader
+from desktop_app.services.gallery_sync import GallerySync
 from desktop_app.utils.keyring_store import get_value as keyring_get, set_value as keyring_set
 from desktop_app.config import BASE_URL
 
@@ -72,6 +74,7 @@ class MainWindow(QMainWindow):
 
         # worker handle
         self._provision_worker = None
+        self._attendance_uploader = None
         self._api_client = ApiClient(BASE_URL.rstrip("/"))
 
         # check keyring for device_uuid and token
@@ -84,6 +87,7 @@ class MainWindow(QMainWindow):
             self.start_provisioning_flow()
         else:
             # Procedd to operator login (device already provisioned)
+            self._attach_gallery(device_uuid, device_token)
             self.open_login_window()
 
 
@@ -168,6 +172,7 @@ class MainWindow(QMainWindow):
                 keyring_set("device_token", token)
 
             self._provision_worker = None
+            self._attach_gallery(keyring_get("device_uuid"), token)
 
             # Show success UI
             self.dashboard_ui.update_loader("Device approved successfully")
@@ -216,6 +221,27 @@ class MainWindow(QMainWindow):
 
     
     # --------------- Login flow --------------
+    def _attach_gallery(self, device_uuid: str, device_token: str):
+        """
+        Load face encodings from the backend gallery endpoint instead of Postgres.
+        """
+        self.attendance_page.set_gallery(GallerySync(self._api_client, device_uuid, device_token))
+
+
+    def _start_attendance_uploader(self, device_uuid: str, device_token: str, session_token: str):
+        """
+        Route punches through the backend batch endpoint for this operator session.
+        """
+        if self._attendance_uploader is not None:
+            self._attendance_uploader.set_session(session_token)
+            return
+        self._attendance_uploader = AttendanceUploader(
+            self._api_client, device_uuid, device_token, session_token
+        )
+        self._attendance_uploader.start()
+        self.attendance_page.set_uploader(self._attendance_uploader)
+
+
     def open_login_window(self):
         self.dashboard_ui.show_login_overlay()
 
@@ -263,6 +289,7 @@ class MainWindow(QMainWindow):
             return
         
         self._session_token = session_token
+        self._start_attendance_uploader(device_uuid, device_token, session_token)
         self.dashboard_ui.login_overlay.show_success_state()
 
         QTimer.singleShot(400, lambda: 
@@ -276,4 +303,10 @@ class MainWindow(QMainWindow):
 
         # Open attendance page
         self.dashboard_ui.content_stack.setCurrentIndex(self.page_attendance_idx)
-        self.dashboard_ui.highlight_active_button(self.dashboard_ui.btn_attendance)
\ No newline at end of file
+        self.dashboard_ui.highlight_active_button(self.dashboard_ui.btn_attendance)
+
+    def closeEvent(self, event):
+        # push any buffered punches before the app exits
+        if self._attendance_uploader is not None:
+            self._attendance_uploader.stop(flush=True)
+        super().closeEvent(event)
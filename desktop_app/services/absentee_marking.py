@@ -0,0 +1,99 @@
+# desktop_app/services/absentee_marking.py
+"""
+Set-based, resumable absentee marking shared by AbsenteeWorker (manual, from the
+GUI) and the daily scheduler job.
+
+Employees are streamed from Postgres (id, name and department tuples) in employee_id
+order through a server-side cursor and checked against the set of today's present
+ids from Mongo. Absentees are upserted one unordered chunk at a time
+(insert-if-absent on employee/date), so memory stays bounded by the chunk size and
+a rerun matches existing records instead of failing on duplicate keys.
+
+After each chunk the last employee_id is saved in a per-day checkpoint
+(`absentee_checkpoints`, keyed by the UTC date), so a run that dies halfway resumes
+after that employee, reusing the original marking timestamp. Once a day is done a
+rerun only looks at employees added since. A completed run recomputes the day's
+attendance_daily_summary.
+"""
+from datetime import timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from desktop_app.services.attendance_record import AttendanceRecord
+from desktop_app.utils.utils import current_datetime_utc
+
+ABSENTEE_CHUNK_SIZE = 1000
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def mark_absentees(postgres_db, mongo_db, marked_by: str = "System",
+                   chunk_size: int = ABSENTEE_CHUNK_SIZE, restart: bool = False,
+                   on_step: Optional[Callable[[str], None]] = None,
+                   on_progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+    """
+    Mark every employee without a record today as absent, resuming from today's
+    checkpoint unless restart=True.
+    Returns {"total", "present", "absent_to_mark", "inserted", "skipped", "errors",
+    "resumed_after"} for this run; "total" counts the employees examined.
+    """
+    step = on_step or (lambda message: None)
+    progress = on_progress or (lambda percent: None)
+
+    timestamp = current_datetime_utc()
+    date_key = timestamp.date().isoformat()
+    checkpoint = None if restart else mongo_db.get_absentee_checkpoint(date_key)
+    after_id = None
+    if checkpoint:
+        after_id = checkpoint.get("last_employee_id")
+        # one marking time per day, however many runs it takes; Mongo hands datetimes back naive
+        timestamp = checkpoint["timestamp"].replace(tzinfo=timezone.utc)
+        step(f"Resuming absentee marking after employee {after_id}...")
+
+    step("Checking today's attendance records...")
+    total = postgres_db.count_employees(after_id=after_id)
+    present_ids = mongo_db.get_present_employee_ids()
+    progress(10)
+
+    summary: Dict[str, Any] = {"total": 0, "present": len(present_ids), "absent_to_mark": 0,
+                               "inserted": 0, "skipped": 0, "errors": [], "resumed_after": after_id}
+    state = {"timestamp": timestamp, "marked_by": marked_by, "status": "running"}
+    if after_id is not None:
+        state["last_employee_id"] = after_id
+
+    step("Marking absentees...")
+    employees = postgres_db.iter_employees_for_attendance(batch_size=chunk_size, after_id=after_id)
+    for chunk in chunked(employees, chunk_size):
+        summary["total"] += len(chunk)
+        absentees = [emp for emp in chunk if str(emp.employee_id) not in present_ids]
+        if absentees:
+            summary["absent_to_mark"] += len(absentees)
+            docs = AttendanceRecord.bulk_documents(absentees, status="absent", marked_by=marked_by,
+                                                   timestamp=timestamp, with_id=False)
+            result = mongo_db.upsert_absentees_bulk(docs, chunk_size=chunk_size)
+            summary["inserted"] += result["inserted"]
+            summary["skipped"] += result["skipped"]
+            if result["errors"]:
+                # leave the checkpoint before this chunk so the next run retries it
+                summary["errors"].extend(result["errors"])
+                mongo_db.save_absentee_checkpoint(date_key, {**state, "status": "failed"})
+                return summary
+
+        state["last_employee_id"] = chunk[-1].employee_id
+        mongo_db.save_absentee_checkpoint(date_key, state)
+        progress(min(99, 10 + 90 * summary["total"] // max(total, 1)))
+
+    mongo_db.save_absentee_checkpoint(date_key, {**state, "status": "done"})
+
+    # absentee upserts don't $inc the summaries; recompute the day now that it is complete
+    step("Updating daily attendance summary...")
+    mongo_db.rollup_daily_summary(timestamp.replace(hour=0, minute=0, second=0, microsecond=0))
+    progress(100)
+    return summary
@@ -1,18 +1,51 @@
+from datetime import datetime, time, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import struct
+
+import bson
 from bson import ObjectId
-from desktop_app.utils.utils import current_date_utc_midnight, current_datetime_utc
-from desktop_app.config import DEFAULT_SHIFT_POLICY
+from bson.raw_bson import RawBSONDocument
+from desktop_app.utils.utils import (
+    current_date_utc_midnight, current_datetime_utc, normalize_department, normalize_name
+)
+from desktop_app import config
+from desktop_app.services.shift_policy import ShiftPolicyIndex
+
+_INT32 = struct.Struct("<i")
+
+# Default shift plus the per-employee / per-site overrides of config.py, resolved per record.
+# Kiosk records carry no site, so site shifts apply where it is known (backend, remarks_backfill).
+SHIFT_POLICIES = ShiftPolicyIndex.from_rows(config.DEFAULT_SHIFT_POLICY,
+                                            getattr(config, "SHIFT_POLICY_OVERRIDES", ()))
+
+
+def _utc_midnight(timestamp: datetime) -> datetime:
+    return datetime.combine(timestamp.astimezone(timezone.utc).date(), time(0, 0, 0, tzinfo=timezone.utc))
+
 
 class AttendanceRecord:
-    def __init__(self, employee_id: str, name: str, department: str, status: str, marked_by: str):
+    __slots__ = ("employee_id", "name", "department", "date", "timestamp", "status", "marked_by", "remarks")
+
+    def __init__(self, employee_id: str, name: str, department: str, status: str, marked_by: str,
+                 timestamp: Optional[datetime] = None, date: Optional[datetime] = None,
+                 remarks: Optional[str] = None):
         self.employee_id = employee_id
         self.name = name
         self.department = department
-        self.date = current_date_utc_midnight()
-        self.timestamp = current_datetime_utc()
+        if timestamp is None:
+            self.timestamp = current_datetime_utc()
+            self.date = date or current_date_utc_midnight()
+        else:
+            self.timestamp = timestamp
+            self.date = date or _utc_midnight(timestamp)
         self.status = status.lower()
         self.marked_by = marked_by
 
-        self.remarks = DEFAULT_SHIFT_POLICY.get_remarks(self.timestamp) if self.status == "present" else self.status
+        if remarks is None:
+            remarks = (SHIFT_POLICIES.get_remarks(self.timestamp, employee_id)
+                       if self.status == "present" else self.status)
+        self.remarks = remarks
 
     def to_dict(self):
         """
@@ -23,14 +56,133 @@ class AttendanceRecord:
             "employee": {
                 "id": self.employee_id,
                 "name": self.name,
+                "name_lc": normalize_name(self.name),
                 "department": self.department,
+                "department_lc": normalize_department(self.department),
             },
             "attendance": {
                 "date": self.date,
                 "status": self.status,
                 "remarks": self.remarks,
-                "marked_by": self.marked_by, 
+                "marked_by": self.marked_by,
             },
             "timestamp": self.timestamp,
         }
-        
\ No newline at end of file
+
+
+
+    def to_api_dict(self):
+        """
+        JSON-serializable punch for POST /api/v1/attendance/batch.
+        The server derives attendance.date from the timestamp.
+        """
+        return {
+            "employee_id": str(self.employee_id),
+            "name": self.name,
+            "department": self.department,
+            "status": self.status,
+            "remarks": self.remarks,
+            "marked_by": self.marked_by,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
+    @classmethod
+    def bulk_documents(cls, employees: Iterable[Any], status: str, marked_by: str,
+                       timestamp: Optional[datetime] = None, raw: bool = False,
+                       with_id: bool = True) -> List[Any]:
+        """
+        Insert-ready documents for many employees marked in one pass (e.g. absentees),
+        without building an AttendanceRecord per employee.
+
+        employees: rows with employee_id / name / department attributes
+        (postgres_db.AttendanceEmployee). employee.id keeps the Postgres int, as punches
+        do, so both hit the same unique (employee.id, attendance.date) key.
+        One timestamp and date is shared by the whole batch, so the clock is read once and
+        the remark is classified once per distinct shift policy rather than per record
+        (a non-present status is its own remark). With raw=True each
+        document is returned pre-encoded as a RawBSONDocument, which insert_many sends
+        without re-encoding; those carry no _id and get one from the server.
+        with_id=False leaves _id out of dict documents too (e.g. for $setOnInsert upserts).
+        """
+        status = status.lower()
+        timestamp = timestamp or current_datetime_utc()
+        date = _utc_midnight(timestamp)
+        remark_of = _remarks_for(status, timestamp)
+
+        if raw:
+            return _raw_documents(employees, remark_of, lambda remarks: {
+                "attendance": {"date": date, "status": status, "remarks": remarks, "marked_by": marked_by},
+                "timestamp": timestamp,
+            })
+
+        docs = [
+            {
+                "employee": {
+                    "id": emp.employee_id,
+                    "name": emp.name,
+                    "name_lc": normalize_name(emp.name),
+                    "department": emp.department,
+                    "department_lc": normalize_department(emp.department),
+                },
+                "attendance": {
+                    "date": date,
+                    "status": status,
+                    "remarks": remark_of(emp),
+                    "marked_by": marked_by,
+                },
+                "timestamp": timestamp,
+            }
+            for emp in employees
+        ]
+        if with_id:
+            for doc in docs:
+                doc["_id"] = ObjectId()
+        return docs
+
+def _remarks_for(status: str, timestamp: datetime) -> Callable[[Any], str]:
+    """employee -> remark at `timestamp`, classifying once per distinct shift policy."""
+    if status != "present":
+        return lambda emp: status
+    by_policy: Dict[int, str] = {}
+
+    def remark_of(emp) -> str:
+        policy = SHIFT_POLICIES.policy_for(emp.employee_id)
+        remark = by_policy.get(id(policy))
+        if remark is None:
+            remark = by_policy[id(policy)] = policy.get_remarks(timestamp)
+        return remark
+
+    return remark_of
+
+
+def _raw_documents(employees: Iterable[Any], remark_of: Callable[[Any], str],
+                   shared: Callable[[str], Dict[str, Any]]) -> List[RawBSONDocument]:
+    """
+    Encode {employee, <shared fields>} per employee. The shared fields only vary with the
+    remark, so they are encoded once per remark and their bytes appended to each document
+    instead of being re-encoded per employee. No _id is set: pymongo leaves raw
+    documents untouched and the server assigns one on insert.
+    """
+    # element bytes of the shared fields (and the closing NUL), without the int32 length prefix
+    tails: Dict[str, bytes] = {}
+    encode = bson.encode
+    pack = _INT32.pack
+    docs = []
+    for emp in employees:
+        remarks = remark_of(emp)
+        tail = tails.get(remarks)
+        if tail is None:
+            tail = tails[remarks] = encode(shared(remarks))[4:]
+        body = b"".join((
+            b"\x03employee\x00", encode({
+                "id": emp.employee_id,
+                "name": emp.name,
+                "name_lc": normalize_name(emp.name),
+                "department": emp.department,
+                "department_lc": normalize_department(emp.department),
+            }),
+            tail,
+        ))
+        docs.append(RawBSONDocument(pack(len(body) + 4) + body))
+    return docs
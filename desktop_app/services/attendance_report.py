@@ -0,0 +1,171 @@
+# desktop_app/services/attendance_report.py
+"""
+Monthly per-employee attendance reports (days present, days absent, late count,
+average arrival time), payroll style.
+
+One aggregation walks the month's logs in attendance.date index order (only the
+month's range of the index) and groups them by employee, returning per-employee
+arrays of status flags and punch times. The statistics are then computed over all employees at once with
+NumPy: the arrays are flattened and reduced per employee with np.add.reduceat, so
+the Python work per employee is a few tuple builds.
+
+A month is immutable once it is over (see month_finished), so finished reports are
+cached for the life of the process; the current month is recomputed on each call.
+"""
+import threading
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from desktop_app.services.shift_policy import IST_OFFSET
+from desktop_app.utils.utils import current_date_utc_midnight, current_datetime_utc
+
+_IST_OFFSET_MS = int(IST_OFFSET.total_seconds()) * 1000
+_MS_PER_DAY = 86_400_000
+
+# the (attendance.date, attendance.status, employee.id) index from migration v6: its date
+# prefix bounds the scan to the month. (The v1 attendance.date index is a redundant prefix of it.)
+DATE_INDEX = [("attendance.date", 1), ("attendance.status", 1), ("employee.id", 1)]
+
+
+class EmployeeMonthlyStats(NamedTuple):
+    employee_id: str
+    name: str
+    department: str
+    days_present: int
+    days_absent: int
+    late_count: int
+    # mean IST punch time of the present days with a timestamp, as seconds since midnight;
+    # None if there are none
+    avg_arrival_seconds: Optional[float]
+
+    @property
+    def avg_arrival(self) -> str:
+        """Average arrival as IST HH:MM, or "" if the employee was never present."""
+        if self.avg_arrival_seconds is None:
+            return ""
+        minutes = int(round(self.avg_arrival_seconds / 60))
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class MonthlyReport(NamedTuple):
+    year: int
+    month: int
+    rows: Tuple[EmployeeMonthlyStats, ...]
+    generated_at: datetime
+    final: bool
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """[start, end) of a calendar month as UTC midnights, matching attendance.date."""
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def month_finished(year: int, month: int, today: Optional[datetime] = None) -> bool:
+    """
+    True once a full day has passed since the month's last day, leaving time for the
+    absentee job and late kiosk syncs to land.
+    """
+    _, end = month_range(year, month)
+    return end < (today or current_date_utc_midnight())
+
+
+def monthly_report_pipeline(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """
+    Per-employee arrays for [start, end): present/late flags and punch times as epoch ms
+    (null for logs without a timestamp). The $sort is served by DATE_INDEX, so each
+    employee's days arrive in date order and $last picks the latest name/department.
+    Employees are grouped by their id as a string: punches store it as an int, older
+    absentee logs as a str, and both must land in the same row.
+    """
+    return [
+        {"$match": {"attendance.date": {"$gte": start, "$lt": end}}},
+        {"$sort": {"attendance.date": 1}},
+        {"$group": {
+            "_id": {"$toString": "$employee.id"},
+            "name": {"$last": "$employee.name"},
+            "department": {"$last": "$employee.department"},
+            "present": {"$push": {"$eq": ["$attendance.status", "present"]}},
+            "late": {"$push": {"$eq": ["$attendance.remarks", "late"]}},
+            "punched_ms": {"$push": {"$toLong": "$timestamp"}},
+        }},
+        {"$sort": {"_id": 1}},
+    ]
+
+
+def compute_monthly_stats(groups: Iterable[Dict[str, Any]]) -> Tuple[EmployeeMonthlyStats, ...]:
+    """
+    Reduce the monthly_report_pipeline output to one EmployeeMonthlyStats per employee.
+    """
+    groups = list(groups)
+    if not groups:
+        return ()
+
+    lengths = np.fromiter((len(g["present"]) for g in groups), dtype=np.int64, count=len(groups))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    total = int(lengths.sum())
+
+    present = np.fromiter(chain.from_iterable(g["present"] for g in groups), dtype=bool, count=total)
+    late = np.fromiter(chain.from_iterable(g["late"] for g in groups), dtype=bool, count=total)
+    # a missing timestamp (null) becomes -1: no arrival time, rather than a 1970-01-01 punch
+    punched = chain.from_iterable(g["punched_ms"] for g in groups)
+    punched_ms = np.fromiter((-1 if ms is None else ms for ms in punched), dtype=np.int64, count=total)
+
+    timed = present & (punched_ms >= 0)
+    arrival_seconds = ((punched_ms + _IST_OFFSET_MS) % _MS_PER_DAY) / 1000.0
+    days_present = np.add.reduceat(present.astype(np.int64), offsets)
+    late_count = np.add.reduceat((late & present).astype(np.int64), offsets)
+    days_timed = np.add.reduceat(timed.astype(np.int64), offsets)
+    arrival_sum = np.add.reduceat(np.where(timed, arrival_seconds, 0.0), offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_arrival = arrival_sum / days_timed
+    days_absent = lengths - days_present
+
+    return tuple(
+        EmployeeMonthlyStats(
+            str(g["_id"]), g.get("name") or "", g.get("department") or "",
+            int(p), int(a), int(l), None if t == 0 else float(avg)
+        )
+        for g, p, a, l, t, avg in zip(groups, days_present.tolist(), days_absent.tolist(),
+                                      late_count.tolist(), days_timed.tolist(), avg_arrival.tolist())
+    )
+
+
+class AttendanceReportEngine:
+    """
+    Builds MonthlyReports from the kiosk's MongoDB, caching finished months.
+    Safe to share between the GUI thread and workers.
+    """
+
+    def __init__(self, mongo_db):
+        self.mongo_db = mongo_db
+        self._finished: Dict[Tuple[int, int], MonthlyReport] = {}
+        self._lock = threading.Lock()
+
+    def monthly_report(self, year: int, month: int) -> MonthlyReport:
+        key = (year, month)
+        with self._lock:
+            cached = self._finished.get(key)
+        if cached is not None:
+            return cached
+
+        start, end = month_range(year, month)
+        final = month_finished(year, month)
+        groups = self.mongo_db.aggregate_logs(monthly_report_pipeline(start, end), hint=DATE_INDEX)
+        report = MonthlyReport(year, month, compute_monthly_stats(groups), current_datetime_utc(), final)
+        if final:
+            with self._lock:
+                report = self._finished.setdefault(key, report)
+        return report
+
+    def invalidate(self, year: Optional[int] = None, month: Optional[int] = None) -> None:
+        """Drop a cached month (e.g. after correcting old logs), or every month if none is given."""
+        with self._lock:
+            if year is None:
+                self._finished.clear()
+            else:
+                self._finished.pop((year, month), None)
@@ -0,0 +1,169 @@
+# desktop_app/services/attendance_uploader.py
+"""
+Buffers attendance punches on the kiosk and ships them to the backend in batches
+(POST /api/v1/attendance/batch), so the kiosk needs no Mongo credentials.
+
+Punches are spooled to a local sqlite file as they are submitted and removed only
+once the server has accepted them, so a crash, power loss or long outage loses
+nothing; resent punches are treated as duplicates by the server.
+
+A background thread flushes when `batch_size` punches are waiting or every
+`flush_interval` seconds, whichever comes first. A batch that failed on the network,
+a 5xx or a 401 (expired session, see set_session) stays at the head of the spool and
+is retried; one the server rejects outright (other 4xx) would never be accepted, so
+it is moved to the dead_letters table and reported instead of blocking the rest.
+"""
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from desktop_app.api.api_client import ApiClient
+from desktop_app.services.attendance_record import AttendanceRecord
+
+
+class AttendanceUploader:
+    SPOOL_PATH = "attendance_spool.sqlite3"
+
+    def __init__(self, api_client: ApiClient, device_uuid: str, device_token: str,
+                 session_token: str, batch_size: int = 50, flush_interval: float = 5.0,
+                 warn_queued: int = 10_000, spool_path: Optional[str] = None):
+        self.api = api_client
+        self.device_uuid = device_uuid
+        self.device_token = device_token
+        self.session_token = session_token
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.warn_queued = warn_queued
+
+        self._db = sqlite3.connect(spool_path or self.SPOOL_PATH, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS punches (id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                id INTEGER PRIMARY KEY, body TEXT NOT NULL, error TEXT NOT NULL,
+                failed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="attendance-uploader", daemon=True)
+            self._thread.start()
+
+
+    def stop(self, flush: bool = True):
+        """
+        Stop the background thread and, with flush=True, send everything spooled until
+        the spool is empty or a send fails (what is left is sent on the next start).
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        if flush:
+            self._drain(lambda: True)
+        with self._lock:
+            self._db.close()
+
+
+    def set_session(self, session_token: str):
+        self.session_token = session_token
+
+
+    def submit(self, record: AttendanceRecord):
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO punches (body) VALUES (?)", (json.dumps(record.to_api_dict()),))
+            queued = self._pending()
+        if queued >= self.warn_queued and queued % self.batch_size == 0:
+            print(f"Attendance upload backlog: {queued} punches spooled and not yet accepted by the server")
+        if queued >= self.batch_size:
+            self._wake.set()
+
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending()
+
+
+    def dead_letters(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+
+
+    def _pending(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM punches").fetchone()[0]
+
+
+    def _head(self) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, body FROM punches ORDER BY id LIMIT ?", (self.batch_size,)
+            ).fetchall()
+
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        message = str(error)
+        return (message.startswith("Network error") or message.startswith("HTTP 5")
+                or message.startswith("HTTP 401"))
+
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Send up to batch_size spooled punches, oldest first. Returns the server summary;
+        {"received", "rejected", "errors"} if the server refused the batch (it is moved
+        to dead_letters); or None if there was nothing to send or the failure is
+        transient (the punches stay spooled).
+        """
+        with self._flush_lock:
+            rows = self._head()
+            if not rows:
+                return None
+            ids = [(row_id,) for row_id, _ in rows]
+
+            try:
+                result = self.api.upload_attendance_batch(
+                    [json.loads(body) for _, body in rows],
+                    session_token=self.session_token,
+                    device_uuid=self.device_uuid,
+                    device_token=self.device_token,
+                )
+            except Exception as e:
+                if self._is_transient(e):
+                    print(f"Attendance upload failed ({len(rows)} punches kept for retry): {e}")
+                    return None
+                print(f"Attendance batch rejected ({len(rows)} punches moved to dead_letters): {e}")
+                with self._lock, self._db:
+                    self._db.executemany(
+                        "INSERT INTO dead_letters (id, body, error) VALUES (?, ?, ?)",
+                        [(row_id, body, str(e)) for row_id, body in rows],
+                    )
+                    self._db.executemany("DELETE FROM punches WHERE id = ?", ids)
+                return {"received": len(rows), "rejected": len(rows), "errors": [str(e)]}
+
+            with self._lock, self._db:
+                self._db.executemany("DELETE FROM punches WHERE id = ?", ids)
+            for err in result.get("errors", []):
+                print(f"Attendance punch rejected by server: {err}")
+            return result
+
+
+    def _drain(self, keep_going) -> None:
+        while self.pending() and keep_going():
+            if self.flush() is None:
+                break
+
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            # drain full batches first, then whatever is left
+            self._drain(lambda: not self._stopped.is_set())
@@ -0,0 +1,84 @@
+# desktop_app/services/gallery_sync.py
+"""
+Keeps the kiosk's in-memory face gallery in sync with GET /api/v1/gallery.
+
+The first sync downloads the full gallery; later syncs send the held revision
+(`since`) and ETag, so an unchanged gallery costs one empty 304 and a changed one
+only transfers the rows that changed. The server only sends employees allowed at
+this kiosk's site, so matching scans a site-sized gallery rather than the company.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from desktop_app.api.api_client import ApiClient
+from desktop_app.utils.gallery_codec import decode_gallery, decompress, zstandard, ENCODING_DIM
+
+
+class GallerySync:
+    def __init__(self, api_client: ApiClient, device_uuid: str, device_token: str,
+                 dtype: str = "float16"):
+        self.api = api_client
+        self.device_uuid = device_uuid
+        self.device_token = device_token
+        self.dtype = dtype
+        self.compression = "zstd" if zstandard is not None else "none"
+
+        self.revision: Optional[int] = None
+        self.etag: Optional[str] = None
+        # server's token for this kiosk's site; a mismatch makes the server send a full gallery
+        self.scope: Optional[str] = None
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._meta: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+
+    def sync(self) -> bool:
+        """
+        Pull changes from the server. Returns True if the gallery changed.
+        """
+        resp = self.api.get_gallery(
+            device_uuid=self.device_uuid,
+            device_token=self.device_token,
+            since=self.revision,
+            etag=self.etag,
+            dtype=self.dtype,
+            compression=self.compression,
+            scope=self.scope,
+        )
+        if resp is None:
+            return False
+
+        blob = resp.content
+        if resp.headers.get("X-Gallery-Encoding") == "zstd":
+            blob = decompress(blob)
+        gallery = decode_gallery(blob)
+
+        with self._lock:
+            if gallery["base_revision"] is None:
+                self._vectors.clear()
+                self._meta.clear()
+            for emp_id in gallery["removed"]:
+                self._vectors.pop(emp_id, None)
+                self._meta.pop(emp_id, None)
+            for row, (emp_id, meta) in enumerate(zip(gallery["ids"], gallery["meta"])):
+                self._vectors[emp_id] = gallery["encodings"][row]
+                self._meta[emp_id] = meta
+
+            self.revision = gallery["revision"]
+            self.etag = resp.headers.get("ETag")
+            self.scope = resp.headers.get("X-Gallery-Scope")
+        return True
+
+
+    def snapshot(self) -> Tuple[List[int], np.ndarray, Dict[int, Dict[str, Any]]]:
+        """
+        (ids, encodings[N, 128] float32, meta-by-id): the shape AttendanceWindow matches against.
+        """
+        with self._lock:
+            ids = sorted(self._vectors)
+            encodings = (np.stack([self._vectors[i] for i in ids]).astype(np.float32)
+                         if ids else np.empty((0, ENCODING_DIM), dtype=np.float32))
+            meta = {i: dict(self._meta[i]) for i in ids}
+        return ids, encodings, meta
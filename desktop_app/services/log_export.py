@@ -0,0 +1,99 @@
+# desktop_app/services/log_export.py
+"""
+Streaming export of attendance logs to CSV or XLSX.
+
+Rows are read from a Mongo cursor in batches and written as they arrive, so memory
+use does not depend on how many logs match. XLSX uses openpyxl's write-only
+workbook, which streams rows to disk; openpyxl is optional and only needed for
+.xlsx exports.
+"""
+import csv
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from desktop_app.utils.log_format import COLUMNS, log_row
+
+try:
+    import openpyxl
+except ImportError:     # optional: without it only CSV export is offered
+    openpyxl = None
+
+EXPORT_BATCH_SIZE = 1000
+FORMATS = ("csv", "xlsx") if openpyxl is not None else ("csv",)
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def export_format(path: str) -> str:
+    fmt = os.path.splitext(path)[1].lower().lstrip(".")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'; expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        # utf-8-sig so Excel detects the encoding of non-ASCII names
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+
+    def write(self, row) -> None:
+        self._writer.writerow(row)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path: str):
+        self._path = path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Attendance")
+
+    def write(self, row) -> None:
+        self._sheet.append(row)
+
+    def close(self) -> None:
+        self._workbook.save(self._path)
+
+
+def export_logs(db, query: Dict[str, Any], path: str,
+                on_progress: Optional[Callable[[int, int], None]] = None,
+                cancelled: Optional[threading.Event] = None,
+                batch_size: int = EXPORT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Write every log matching query to path (.csv or .xlsx), newest first.
+    on_progress(rows_written, total) is called after each batch. If `cancelled` is
+    set the partial file is removed and ExportCancelled is raised.
+    Returns {"path", "rows"}.
+    """
+    fmt = export_format(path)
+    total = db.count_logs(query)
+    writer = _XlsxWriter(path) if fmt == "xlsx" else _CsvWriter(path)
+    rows = 0
+    try:
+        writer.write([label for label, _ in COLUMNS])
+        with db.iter_logs(query, batch_size=batch_size) as cursor:
+            for doc in cursor:
+                writer.write(log_row(doc))
+                rows += 1
+                if rows % batch_size == 0:
+                    if cancelled is not None and cancelled.is_set():
+                        raise ExportCancelled()
+                    if on_progress:
+                        on_progress(rows, total)
+        writer.close()
+    except BaseException:
+        try:
+            writer.close()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if on_progress:
+        on_progress(rows, max(total, rows))
+    return {"path": path, "rows": rows}
@@ -0,0 +1,90 @@
+# desktop_app/services/remarks_backfill.py
+"""
+Recompute the early/on-time/late remarks of stored present punches, e.g. after the
+shift changed or per-employee / per-site shifts were added (SHIFT_POLICY_OVERRIDES
+in config.py). New punches are classified with the same shifts when recorded; their
+remarks are otherwise never revisited.
+
+Punches are streamed in batches and classified with ShiftPolicyIndex.get_remarks_bulk,
+one vectorized pass per distinct policy per batch. Only changed remarks are written
+back, and the daily summaries of the range are rolled up again if anything changed:
+
+    python -m desktop_app.services.remarks_backfill --from 2026-01-01 [--to 2026-02-01]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from desktop_app.services.shift_policy import ShiftPolicyIndex
+from desktop_app.utils.utils import current_date_utc_midnight
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+class BackfillResult(NamedTuple):
+    scanned: int
+    changed: int
+
+
+def _changed_remarks(batch: List[Dict[str, Any]], policies: ShiftPolicyIndex) -> List[tuple]:
+    remarks = policies.get_remarks_bulk(
+        [doc["timestamp"] for doc in batch],
+        [doc["employee"]["id"] for doc in batch],
+        [(doc.get("source") or {}).get("site") for doc in batch],
+    )
+    return [(doc["_id"], remark) for doc, remark in zip(batch, remarks.tolist())
+            if doc["attendance"].get("remarks") != remark]
+
+
+def backfill_remarks(mongo_db, start: datetime, end: datetime, policies: ShiftPolicyIndex,
+                     batch_size: int = BACKFILL_BATCH_SIZE) -> BackfillResult:
+    """
+    Bring the remarks of the present punches of [start, end) (attendance dates) in line
+    with `policies`. Punches without a timestamp are left alone.
+    """
+    scanned = changed = 0
+    batch: List[Dict[str, Any]] = []
+    for doc in mongo_db.iter_present_punches(start, end, batch_size):
+        if doc.get("timestamp") is None:
+            continue
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            scanned += len(batch)
+            changed += mongo_db.set_remarks_bulk(_changed_remarks(batch, policies))
+            batch = []
+    if batch:
+        scanned += len(batch)
+        changed += mongo_db.set_remarks_bulk(_changed_remarks(batch, policies))
+
+    if changed:
+        mongo_db.rollup_daily_summary(start, end)
+    return BackfillResult(scanned, changed)
+
+
+def _utc_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute early/on-time/late remarks of stored punches")
+    parser.add_argument("--from", dest="start", type=_utc_date, required=True, help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=_utc_date, default=None,
+                        help="end date (exclusive), YYYY-MM-DD; default: tomorrow")
+    args = parser.parse_args(argv)
+
+    from desktop_app.database.mongo_db import MongoDB
+    from desktop_app.services.attendance_record import SHIFT_POLICIES
+
+    mongo_db = MongoDB()
+    try:
+        end = args.end or current_date_utc_midnight() + timedelta(days=1)
+        result = backfill_remarks(mongo_db, args.start, end, SHIFT_POLICIES)
+        print(f"Remarks: {result.scanned} present punches checked, {result.changed} updated")
+        return 0
+    finally:
+        mongo_db.client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
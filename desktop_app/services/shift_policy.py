@@ -1,4 +1,42 @@
 from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+IST_OFFSET = timedelta(hours=5, minutes=30)
+IST = timezone(IST_OFFSET)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_IST_OFFSET_US = IST_OFFSET // _ONE_US
+_US_PER_DAY = 86_400_000_000
+
+# Remark codes used by the bulk path; REMARK_LABELS[code] is the string remark.
+EARLY, ON_TIME, LATE = 0, 1, 2
+REMARK_LABELS = np.array(["early", "on-time", "late"])
+
+Timestamps = Union[np.ndarray, Sequence[datetime]]
+
+
+def _epoch_us(timestamp: datetime) -> int:
+    # naive datetimes are UTC, as stored by AttendanceRecord and returned by pymongo
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - _EPOCH) // _ONE_US
+
+
+def to_epoch_micros(timestamps: Timestamps) -> np.ndarray:
+    """
+    Exact int64 UTC epoch microseconds for a datetime64 array (taken as UTC) or a
+    sequence of datetimes (aware ones are converted; naive ones are treated as UTC).
+    """
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype("datetime64[us]").astype(np.int64)
+    return np.fromiter((_epoch_us(ts) for ts in timestamps), dtype=np.int64, count=len(timestamps))
+
+
+def _ist_micros_of_day(epoch_us):
+    return (epoch_us + _IST_OFFSET_US) % _US_PER_DAY
+
 
 class ShiftPolicy:
     """
@@ -11,23 +49,107 @@ class ShiftPolicy:
         self.shift_start_time = time(hour=start_hour, minute=start_minute)
         self.grace_minutes = grace_minutes
 
+        # Thresholds as microseconds since IST midnight. IST has no DST, so the same
+        # thresholds hold for every day and need computing only once.
+        self._start_us = (start_hour * 3600 + start_minute * 60) * 1_000_000
+        self._grace_end_us = self._start_us + grace_minutes * 60 * 1_000_000
+
+    def _classify_micros(self, micros_of_day) -> Any:
+        # on-time window is inclusive at both ends, matching the original comparison
+        return np.where(
+            micros_of_day < self._start_us, EARLY,
+            np.where(micros_of_day <= self._grace_end_us, ON_TIME, LATE)
+        ).astype(np.int8)
+
     def get_remarks(self, timestamp: datetime) -> str:
         """
-        Given a timestamp, determine the remark: early, on-time, late.
+        Given a UTC timestamp (naive = UTC), determine the remark: early, on-time, late.
+        Same integer-microsecond arithmetic as get_remark_codes, so both always agree.
         """
-        # convert utc timstamp to IST
-        ist_offset = timedelta(hours=5, minutes=30)
-        ist_time = timestamp.astimezone(timezone(ist_offset)).time()
-
-        # Define start and grace_end window
-        shift_start = self.shift_start_time
-        shift_grace_end = (
-            datetime.combine(datetime.today(), shift_start) + timedelta(minutes=self.grace_minutes)
-        ).time()
-
-        if ist_time < shift_start:
+        micros = _ist_micros_of_day(_epoch_us(timestamp))
+        if micros < self._start_us:
             return "early"
-        elif shift_start <= ist_time <= shift_grace_end:
+        elif micros <= self._grace_end_us:
             return "on-time"
         else:
-            return "late"
\ No newline at end of file
+            return "late"
+
+    def get_remark_codes(self, timestamps: Timestamps) -> np.ndarray:
+        """
+        Vectorized get_remarks; returns int8 codes (EARLY / ON_TIME / LATE).
+        """
+        return self._classify_micros(_ist_micros_of_day(to_epoch_micros(timestamps)))
+
+    def get_remarks_bulk(self, timestamps: Timestamps) -> np.ndarray:
+        """
+        get_remarks for many timestamps in one pass; returns an array of remark strings.
+        """
+        return REMARK_LABELS[self.get_remark_codes(timestamps)]
+
+
+class ShiftPolicyIndex:
+    """
+    In-memory lookup of the shift policy that applies to an employee:
+    employee override, else site policy, else the default. Employee ids are matched
+    as strings, since logs carry them as int or str.
+    """
+
+    def __init__(self, default: ShiftPolicy,
+                 by_employee: Optional[Dict[Hashable, ShiftPolicy]] = None,
+                 by_site: Optional[Dict[str, ShiftPolicy]] = None):
+        self.default = default
+        self.by_employee = {str(emp): policy for emp, policy in (by_employee or {}).items()}
+        self.by_site = dict(by_site or {})
+
+    @classmethod
+    def from_rows(cls, default: ShiftPolicy, rows: Iterable[Dict[str, Any]]) -> "ShiftPolicyIndex":
+        """
+        rows: [{"employee_id"|"site": ..., "start_hour", "start_minute", "grace_minutes"}, ...]
+        """
+        index = cls(default)
+        for row in rows:
+            policy = ShiftPolicy(row.get("start_hour", 9), row.get("start_minute", 0),
+                                 row.get("grace_minutes", 1))
+            if row.get("employee_id") is not None:
+                index.by_employee[str(row["employee_id"])] = policy
+            elif row.get("site"):
+                index.by_site[row["site"]] = policy
+        return index
+
+    def policy_for(self, employee_id: Hashable = None, site: Optional[str] = None) -> ShiftPolicy:
+        policy = self.by_employee.get(str(employee_id)) if employee_id is not None else None
+        if policy is None and site is not None:
+            policy = self.by_site.get(site)
+        return policy or self.default
+
+    def get_remarks(self, timestamp: datetime, employee_id: Hashable = None, site: Optional[str] = None) -> str:
+        return self.policy_for(employee_id, site).get_remarks(timestamp)
+
+    def get_remarks_bulk(self, timestamps: Timestamps, employee_ids: Sequence[Hashable],
+                         sites: Optional[Sequence[Optional[str]]] = None) -> np.ndarray:
+        """
+        Remarks for parallel arrays of timestamps / employee ids (/ sites). Records are
+        grouped by resolved policy so each distinct policy runs one vectorized pass.
+        """
+        micros_of_day = _ist_micros_of_day(to_epoch_micros(timestamps))
+
+        if not self.by_employee and not self.by_site:
+            return REMARK_LABELS[self.default._classify_micros(micros_of_day)]
+
+        sites = sites if sites is not None else [None] * len(employee_ids)
+        groups = []                 # distinct policies, in first-seen order
+        group_of: Dict[int, int] = {}
+        slot = np.empty(len(employee_ids), dtype=np.int32)
+        for i, (emp, site) in enumerate(zip(employee_ids, sites)):
+            policy = self.policy_for(emp, site)
+            key = group_of.get(id(policy))
+            if key is None:
+                key = group_of[id(policy)] = len(groups)
+                groups.append(policy)
+            slot[i] = key
+
+        codes = np.empty(len(micros_of_day), dtype=np.int8)
+        for key, policy in enumerate(groups):
+            mask = slot == key
+            codes[mask] = policy._classify_micros(micros_of_day[mask])
+        return REMARK_LABELS[codes]
@@ -0,0 +1,82 @@
+# desktop_app/tests/test_absentee_upsert.py
+# An absentee upsert must find the day's punch whatever type its employee id has, so an
+# employee never ends up both present and absent on one day.
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from desktop_app.database.mongo_db import MongoDB
+from desktop_app.database.postgres_db import AttendanceEmployee
+from desktop_app.services.attendance_record import AttendanceRecord
+
+PUNCH = datetime(2026, 1, 7, 3, 30, tzinfo=timezone.utc)
+
+
+def _get(doc, path):
+    for key in path.split("."):
+        doc = (doc or {}).get(key)
+    return doc
+
+
+def _matches(doc, query):
+    for path, cond in query.items():
+        value = _get(doc, path)
+        if isinstance(cond, dict) and "$in" in cond:
+            if value not in cond["$in"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeCollection:
+    """Just enough of bulk_write for upserts with $setOnInsert."""
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    def bulk_write(self, ops, ordered=True):
+        upserted, matched = 0, 0
+        for op in ops:
+            if any(_matches(doc, op._filter) for doc in self.docs):
+                matched += 1
+            elif op._upsert:
+                self.docs.append(dict(op._doc["$setOnInsert"]))
+                upserted += 1
+        return SimpleNamespace(upserted_count=upserted, matched_count=matched)
+
+
+def _mongo(docs):
+    mongo = MongoDB.__new__(MongoDB)
+    mongo.collection = FakeCollection(docs)
+    return mongo
+
+
+def _absentees(*employee_ids):
+    employees = [AttendanceEmployee(emp_id, f"Employee {emp_id}", "Ops") for emp_id in employee_ids]
+    return AttendanceRecord.bulk_documents(employees, status="absent", marked_by="System",
+                                           timestamp=PUNCH.replace(hour=12), with_id=False)
+
+
+def test_absentee_does_not_duplicate_an_int_keyed_punch():
+    punch = AttendanceRecord(employee_id=17, name="Employee 17", department="Ops", status="Present",
+                             marked_by="System", timestamp=PUNCH).to_dict()
+    mongo = _mongo([punch])
+
+    result = mongo.upsert_absentees_bulk(_absentees(17, 18))
+
+    assert (result["inserted"], result["skipped"], result["errors"]) == (1, 1, [])
+    assert [(_get(d, "employee.id"), _get(d, "attendance.status")) for d in mongo.collection.docs] == [
+        (17, "present"), (18, "absent")]
+
+
+def test_rerun_matches_absentees_stored_with_str_ids():
+    legacy = _absentees(17)[0]
+    legacy["employee"]["id"] = "17"
+    mongo = _mongo([legacy])
+
+    result = mongo.upsert_absentees_bulk(_absentees(17))
+
+    assert (result["inserted"], result["skipped"]) == (0, 1)
@@ -0,0 +1,100 @@
+# desktop_app/tests/test_attendance_report.py
+# Monthly statistics from the report pipeline's per-employee arrays.
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from desktop_app.services.attendance_report import (
+    DATE_INDEX, compute_monthly_stats, month_range, monthly_report_pipeline
+)
+
+BASE_MS = int(datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp() * 1000)
+DAY_MS = 86_400_000
+
+
+def test_pipeline_reads_the_month_in_date_index_order():
+    start, end = month_range(2026, 1)
+
+    pipeline = monthly_report_pipeline(start, end)
+
+    assert pipeline[0] == {"$match": {"attendance.date": {"$gte": start, "$lt": end}}}
+    assert list(pipeline[1]["$sort"].items()) == DATE_INDEX[:1]
+
+
+def test_missing_timestamps_do_not_count_as_arrivals():
+    groups = [
+        # 09:00 and 09:30 IST (03:30 / 04:00 UTC) on two present days, plus one without a timestamp
+        {"_id": 7, "name": "Asha", "department": "Ops",
+         "present": [True, True, True, False], "late": [False, True, False, False],
+         "punched_ms": [BASE_MS + 12_600_000, BASE_MS + DAY_MS + 14_400_000, None, BASE_MS + 3 * DAY_MS]},
+        {"_id": "8", "name": "Ravi", "department": None,
+         "present": [True, False], "late": [True, False], "punched_ms": [None, None]},
+    ]
+
+    asha, ravi = compute_monthly_stats(groups)
+
+    assert (asha.employee_id, asha.days_present, asha.days_absent, asha.late_count) == ("7", 3, 1, 1)
+    assert asha.avg_arrival == "09:15"
+    assert (ravi.days_present, ravi.days_absent, ravi.late_count) == (1, 1, 1)
+    assert ravi.avg_arrival_seconds is None
+
+
+def _field(doc, path):
+    for key in path.lstrip("$").split("."):
+        doc = (doc or {}).get(key)
+    return doc
+
+
+def _eval(expr, doc):
+    """The handful of aggregation expressions monthly_report_pipeline uses."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _field(doc, expr)
+    (op, arg), = expr.items()
+    if op == "$toString":
+        return str(_eval(arg, doc))
+    if op == "$toLong":
+        value = _eval(arg, doc)
+        return None if value is None else int(value.timestamp() * 1000)
+    if op == "$eq":
+        field, value = arg
+        return _eval(field, doc) == value
+    raise AssertionError(f"unexpected expression {expr}")
+
+
+def _run_pipeline(pipeline, docs):
+    match, sort, group, _ = pipeline
+    (path, bounds), = match["$match"].items()
+    docs = sorted((d for d in docs if bounds["$gte"] <= _field(d, path) < bounds["$lt"]),
+                  key=lambda d: _field(d, path))
+    groups = {}
+    for doc in docs:
+        key = _eval(group["$group"]["_id"], doc)
+        out = groups.setdefault(key, {"_id": key})
+        for name, acc in group["$group"].items():
+            if name == "_id":
+                continue
+            (op, expr), = acc.items()
+            if op == "$last":
+                out[name] = _eval(expr, doc)
+            else:
+                out.setdefault(name, []).append(_eval(expr, doc))
+    return [groups[key] for key in sorted(groups, key=str)]
+
+
+def test_int_and_str_ids_of_one_employee_share_a_row():
+    start, end = month_range(2026, 1)
+    day = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    docs = [
+        # kiosk punch (int id) and an absentee log (str id) of employee 17
+        {"employee": {"id": 17, "name": "Asha", "department": "Ops"}, "timestamp": day.replace(hour=3, minute=30),
+         "attendance": {"date": day, "status": "present", "remarks": "on-time"}},
+        {"employee": {"id": "17", "name": "Asha", "department": "Ops"}, "timestamp": day.replace(day=6, hour=12),
+         "attendance": {"date": day.replace(day=6), "status": "absent", "remarks": "absent"}},
+    ]
+
+    groups = _run_pipeline(monthly_report_pipeline(start, end), docs)
+    stats = compute_monthly_stats(groups)
+
+    assert [(s.employee_id, s.days_present, s.days_absent) for s in stats] == [("17", 1, 1)]
@@ -0,0 +1,73 @@
+# desktop_app/tests/test_attendance_uploader.py
+# Spooled punches survive restarts and are only dropped once the server has taken them;
+# a batch the server refuses goes to dead_letters instead of blocking the spool.
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("requests")
+
+from desktop_app.services.attendance_record import AttendanceRecord
+from desktop_app.services.attendance_uploader import AttendanceUploader
+
+
+class FakeApi:
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.batches = []
+
+    def upload_attendance_batch(self, records, **headers):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.batches.append([r["employee_id"] for r in records])
+        return {"received": len(records), "inserted": len(records), "duplicates": 0, "errors": []}
+
+
+def _record(employee_id):
+    return AttendanceRecord(employee_id=employee_id, name="Asha Rao", department="Ops", status="Present",
+                            marked_by="System", timestamp=datetime(2026, 1, 7, 3, 30, tzinfo=timezone.utc))
+
+
+def _uploader(api, tmp_path, batch_size=2):
+    return AttendanceUploader(api, "uuid-1", "device-token", "session", batch_size=batch_size,
+                              spool_path=str(tmp_path / "spool.sqlite3"))
+
+
+def test_stop_drains_every_batch(tmp_path):
+    api = FakeApi()
+    uploader = _uploader(api, tmp_path)
+    for emp_id in range(5):
+        uploader.submit(_record(emp_id))
+
+    uploader.stop(flush=True)
+
+    assert api.batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_spool_survives_a_restart_and_a_network_error(tmp_path):
+    uploader = _uploader(FakeApi(RuntimeError("Network error: timed out")), tmp_path)
+    for emp_id in range(3):
+        uploader.submit(_record(emp_id))
+
+    uploader.stop(flush=True)    # the first send fails: nothing is lost, nothing more is tried
+
+    api = FakeApi()
+    restarted = _uploader(api, tmp_path)
+    assert restarted.pending() == 3
+    restarted.stop(flush=True)
+    assert api.batches == [["0", "1"], ["2"]]
+
+
+def test_rejected_batch_is_dead_lettered_not_retried(tmp_path):
+    api = FakeApi(RuntimeError("HTTP 422: employee_id: field required"), RuntimeError("HTTP 503: down"))
+    uploader = _uploader(api, tmp_path)
+    for emp_id in range(4):
+        uploader.submit(_record(emp_id))
+
+    rejected = uploader.flush()
+    assert rejected["rejected"] == 2
+    assert uploader.flush() is None       # 5xx: kept for retry
+    assert uploader.flush()["inserted"] == 2
+
+    assert api.batches == [["2", "3"]]
+    assert (uploader.pending(), uploader.dead_letters()) == (0, 2)
@@ -0,0 +1,53 @@
+# desktop_app/tests/test_daily_summary.py
+# A failed summary increment must name the summaries it left short, so their days can be
+# rolled up again.
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo.errors import BulkWriteError
+
+from desktop_app.database.mongo_db import MongoDB
+
+DAY = datetime(2026, 1, 7, tzinfo=timezone.utc)
+
+
+class FailingCollection:
+    def __init__(self, error):
+        self.error = error
+
+    def bulk_write(self, ops, ordered=True):
+        raise self.error
+
+
+def _log(department, day=DAY):
+    return {"employee": {"id": 7, "department": department},
+            "attendance": {"date": day, "status": "present", "remarks": "late"}}
+
+
+def _increment(error, records):
+    mongo = MongoDB.__new__(MongoDB)
+    mongo.daily_summary = FailingCollection(error)
+    return mongo.increment_daily_summary(records)
+
+
+def test_bulk_write_error_names_only_the_failed_summaries():
+    error = BulkWriteError({"writeErrors": [{"index": 1, "code": 2, "errmsg": "bad $inc"}]})
+
+    result = _increment(error, [_log("Ops"), _log("Sales"), _log("Ops")])
+
+    assert result == {"updated": 1, "errors": [
+        {"date": DAY, "department": "Sales", "site": "", "error": "bad $inc"}]}
+
+
+def test_other_errors_name_every_summary(capsys):
+    day2 = DAY.replace(day=8)
+
+    result = _increment(RuntimeError("connection reset"), [_log("Ops"), _log("Ops", day2)])
+
+    assert result["updated"] == 0
+    assert [(err["date"], err["error"]) for err in result["errors"]] == [
+        (DAY, "connection reset"), (day2, "connection reset")]
+    assert "2026-01-07, 2026-01-08" in capsys.readouterr().out
@@ -0,0 +1,117 @@
+# desktop_app/tests/test_log_query_plans.py
+# Every logs query shape, search box included, must be served by an index: no COLLSCAN,
+# no in-memory sort for paged queries that index order can serve, and no FETCH for
+# covered ones. The plan checks need a MongoDB
+# server (MONGO_TEST_URI); they run against a throwaway, fully migrated database.
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+from desktop_app.database.log_queries import (
+    QueryShape, build_log_search_query, explain_shape, plan_summary, query_shapes, redundant_indexes
+)
+from desktop_app.database.mongo_migrations import migrate
+
+MONGO_TEST_URI = os.environ.get("MONGO_TEST_URI")
+DAY = datetime(2026, 1, 7, tzinfo=timezone.utc)
+DEPARTMENTS = ["Sales", "Operations", "Human Resources", "Finance"]
+
+needs_mongo = pytest.mark.skipif(not MONGO_TEST_URI, reason="set MONGO_TEST_URI to a MongoDB server")
+
+
+@pytest.fixture(scope="module")
+def logs():
+    client = pymongo.MongoClient(MONGO_TEST_URI, serverSelectionTimeoutMS=2000)
+    db = client[f"attendance_plans_{uuid.uuid4().hex[:8]}"]
+    try:
+        migrate(db)
+        docs = []
+        for day in range(14):
+            date = DAY - timedelta(days=day)
+            for emp in range(50):
+                present = (emp + day) % 5 != 0
+                docs.append({
+                    "employee": {"id": emp if emp % 2 else str(emp), "name": f"Employee {emp}",
+                                 "name_lc": f"employee {emp}", "department": DEPARTMENTS[emp % 4],
+                                 "department_lc": DEPARTMENTS[emp % 4].lower()},
+                    "attendance": {"date": date, "status": "present" if present else "absent",
+                                   "remarks": ("late" if emp % 3 == 0 else "on-time") if present else "absent",
+                                   "marked_by": "test"},
+                    "timestamp": date + timedelta(hours=3, minutes=emp),
+                })
+        db["logs"].insert_many(docs)
+        yield db["logs"]
+    finally:
+        client.drop_database(db.name)
+        client.close()
+
+
+@needs_mongo
+@pytest.mark.parametrize("shape", query_shapes(DAY), ids=lambda shape: shape.name)
+def test_query_shape_uses_index(logs, shape):
+    plan = explain_shape(logs, shape)
+
+    assert plan.problems(shape) == [], f"{shape.name}: {' <- '.join(plan.stages)}"
+
+
+def test_plan_summary_walks_nested_stages():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "PROJECTION_COVERED",
+        "inputStage": {"stage": "IXSCAN", "indexName": "attendance.date_1_attendance.status_1_employee.id_1"},
+    }}}
+
+    plan = plan_summary(explain)
+
+    assert plan.stages == ("PROJECTION_COVERED", "IXSCAN")
+    assert plan.problems(QueryShape("covered", {}, covered=True)) == []
+
+
+def test_plan_summary_flags_collscan_and_sort():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "SORT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "COLLSCAN"}},
+    }}}
+
+    problems = plan_summary(explain).problems(QueryShape("paged", {}, sort=[("timestamp", -1)], covered=True))
+
+    assert problems == ["collection scan", "fetches documents (not covered)", "in-memory sort"]
+
+
+def test_search_shapes_come_from_the_search_box():
+    shapes = {shape.name: shape for shape in query_shapes(DAY)}
+
+    assert {"logs search, department", "logs search, name prefix", "logs search, employee id"} <= set(shapes)
+    assert shapes["logs search, department"].filter["$and"][1] == {"employee.department_lc": "sales"}
+    assert shapes["logs search, employee id"].filter["$and"][1] == {"employee.id": {"$in": ["1", 1]}}
+
+
+def test_non_ascii_digits_are_not_employee_numbers():
+    assert build_log_search_query("id:²") == {"employee.id": "²"}
+    assert build_log_search_query("id:١٢") == {"employee.id": "١٢"}
+    assert build_log_search_query("id:12") == {"employee.id": {"$in": ["12", 12]}}
+    assert "employee.id" not in str(build_log_search_query("²"))
+
+
+def test_unindexed_sort_allowed_only_where_declared():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "SORT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+    }}}
+    plan = plan_summary(explain)
+
+    assert plan.problems(QueryShape("prefix", {}, sort=[("timestamp", -1)], indexed_sort=False)) == []
+    assert plan.problems(QueryShape("paged", {}, sort=[("timestamp", -1)])) == ["in-memory sort"]
+
+
+def test_redundant_indexes_reports_only_plain_prefixes():
+    info = {
+        "_id_": {"key": [("_id", 1)], "v": 2},
+        "employee.id_1": {"key": [("employee.id", 1)], "v": 2},
+        "employee.id_1_attendance.date_1": {"key": [("employee.id", 1), ("attendance.date", 1)],
+                                            "v": 2, "unique": True},
+        "updated_at_1": {"key": [("updated_at", 1)], "v": 2, "expireAfterSeconds": 60},
+    }
+
+    assert redundant_indexes(info) == [("employee.id_1", "employee.id_1_attendance.date_1")]
@@ -0,0 +1,125 @@
+# desktop_app/tests/test_shift_policy.py
+# The bulk remark paths must agree with get_remarks exactly, including at the window
+# edges, and the policy index must resolve employee, then site, then default.
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from desktop_app.services import attendance_record
+from desktop_app.services.attendance_record import AttendanceRecord
+from desktop_app.services.remarks_backfill import backfill_remarks
+from desktop_app.services.shift_policy import IST, ShiftPolicy, ShiftPolicyIndex
+
+POLICY = ShiftPolicy(start_hour=9, start_minute=0, grace_minutes=1)
+START_IST = datetime(2026, 1, 7, 9, 0, tzinfo=IST)
+GRACE_END_IST = START_IST + timedelta(minutes=1)
+US = timedelta(microseconds=1)
+
+# early / on-time / late edges, each as IST-aware, UTC-aware and naive (= UTC) datetimes
+EDGES = [START_IST - US, START_IST, GRACE_END_IST, GRACE_END_IST + US,
+         GRACE_END_IST + timedelta(milliseconds=999), datetime(2026, 1, 7, 23, 59, 59, 999999, tzinfo=IST)]
+TIMESTAMPS = (EDGES + [ts.astimezone(timezone.utc) for ts in EDGES]
+              + [ts.astimezone(timezone.utc).replace(tzinfo=None) for ts in EDGES])
+
+
+def test_scalar_edges():
+    assert [POLICY.get_remarks(ts) for ts in EDGES[:4]] == ["early", "on-time", "on-time", "late"]
+    # naive timestamps are UTC, not host-local time
+    assert POLICY.get_remarks(START_IST.astimezone(timezone.utc).replace(tzinfo=None)) == "on-time"
+
+
+def test_bulk_matches_scalar_at_edges():
+    assert POLICY.get_remarks_bulk(TIMESTAMPS).tolist() == [POLICY.get_remarks(ts) for ts in TIMESTAMPS]
+
+
+def test_bulk_accepts_datetime64():
+    naive_utc = [ts.astimezone(timezone.utc).replace(tzinfo=None) for ts in EDGES]
+    stamps = np.array(naive_utc, dtype="datetime64[us]")
+
+    assert POLICY.get_remarks_bulk(stamps).tolist() == [POLICY.get_remarks(ts) for ts in naive_utc]
+
+
+def _index():
+    return ShiftPolicyIndex.from_rows(POLICY, [
+        {"employee_id": 7, "start_hour": 10, "start_minute": 0, "grace_minutes": 0},
+        {"site": "north", "start_hour": 8, "start_minute": 30, "grace_minutes": 5},
+    ])
+
+
+def test_index_resolves_employee_then_site_then_default():
+    index = _index()
+    punch = datetime(2026, 1, 7, 8, 40, tzinfo=IST)
+
+    assert index.get_remarks(punch, employee_id="7", site="north") == "early"
+    assert index.get_remarks(punch, employee_id=7) == "early"
+    assert index.get_remarks(punch, employee_id=8, site="north") == "late"
+    assert index.get_remarks(punch, employee_id=8, site="south") == "early"
+    assert index.get_remarks(punch + timedelta(minutes=20), employee_id=8) == "on-time"
+
+
+def test_new_punches_use_the_employee_shift(monkeypatch):
+    monkeypatch.setattr(attendance_record, "SHIFT_POLICIES", _index())
+    punch = datetime(2026, 1, 7, 9, 30, tzinfo=IST)
+    employees = [SimpleNamespace(employee_id=emp_id, name=f"Employee {emp_id}", department="Ops")
+                 for emp_id in (7, 8, 9)]
+
+    record = AttendanceRecord(employee_id=7, name="Asha", department="Ops", status="Present",
+                              marked_by="System", timestamp=punch)
+    docs = AttendanceRecord.bulk_documents(employees, "present", "Admin", timestamp=punch)
+    raw = AttendanceRecord.bulk_documents(employees, "present", "Admin", timestamp=punch, raw=True)
+
+    assert record.remarks == "early"
+    assert [doc["attendance"]["remarks"] for doc in docs] == ["early", "late", "late"]
+    assert [doc["attendance"]["remarks"] for doc in raw] == ["early", "late", "late"]
+    assert [doc["employee"]["id"] for doc in raw] == [7, 8, 9]
+
+
+def test_index_bulk_matches_scalar():
+    index = _index()
+    rows = [(ts, emp, site) for ts in TIMESTAMPS + [datetime(2026, 1, 7, 8, 33, tzinfo=IST),
+                                                   datetime(2026, 1, 7, 10, 0, 0, 1, tzinfo=IST)]
+            for emp, site in ((7, None), ("7", "north"), (8, "north"), (8, None), (None, "south"))]
+    timestamps, employees, sites = zip(*rows)
+
+    bulk = index.get_remarks_bulk(list(timestamps), list(employees), list(sites)).tolist()
+
+    assert bulk == [index.get_remarks(ts, emp, site) for ts, emp, site in rows]
+
+
+class FakeMongo:
+    def __init__(self, docs):
+        self.docs = docs
+        self.rollups = []
+
+    def iter_present_punches(self, start, end, batch_size):
+        return iter(self.docs)
+
+    def set_remarks_bulk(self, remarks):
+        by_id = {doc["_id"]: doc for doc in self.docs}
+        for _id, remark in remarks:
+            by_id[_id]["attendance"]["remarks"] = remark
+        return len(remarks)
+
+    def rollup_daily_summary(self, start, end=None):
+        self.rollups.append((start, end))
+
+
+def test_backfill_writes_only_changed_remarks():
+    punch = datetime(2026, 1, 7, 3, 35)    # naive UTC: 09:05 IST
+    docs = [
+        {"_id": 1, "employee": {"id": 7}, "timestamp": punch, "attendance": {"remarks": "late"}},
+        {"_id": 2, "employee": {"id": "8"}, "timestamp": punch, "attendance": {"remarks": "late"}},
+        {"_id": 3, "employee": {"id": 9}, "source": {"site": "north"}, "timestamp": punch - timedelta(minutes=32),
+         "attendance": {"remarks": "early"}},
+    ]
+    mongo = FakeMongo(docs)
+    start, end = datetime(2026, 1, 7, tzinfo=timezone.utc), datetime(2026, 1, 8, tzinfo=timezone.utc)
+
+    result = backfill_remarks(mongo, start, end, _index(), batch_size=2)
+
+    assert tuple(result) == (3, 2)
+    assert [doc["attendance"]["remarks"] for doc in docs] == ["early", "late", "on-time"]
+    assert mongo.rollups == [(start, end)]
@@ -0,0 +1,39 @@
+import threading
+import traceback
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+from desktop_app.services.log_export import export_logs, ExportCancelled
+
+
+class LogExportSignals(QObject):
+    progress = pyqtSignal(int, int)     # rows written, total rows
+    done = pyqtSignal(dict)             # {"path", "rows"}
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+
+class LogExportWorker(QRunnable):
+    """
+    Writes the logs matching a query to CSV/XLSX in the thread pool
+    (see services.log_export), reporting progress after every batch.
+    """
+    def __init__(self, db, query, path):
+        super().__init__()
+        self.db = db
+        self.query = query
+        self.path = path
+        self.signals = LogExportSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            summary = export_logs(self.db, self.query, self.path,
+                                  on_progress=self.signals.progress.emit, cancelled=self._cancelled)
+            self.signals.done.emit(summary)
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            trace = traceback.format_exc()
+            self.signals.error.emit(f"{str(e)}\n{trace}")
@@ -0,0 +1,63 @@
+import threading
+import traceback
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+
+class LogLoaderSignals(QObject):
+    batch = pyqtSignal(int, list)               # generation, display rows
+    finished = pyqtSignal(int, object, bool)    # generation, keyset of the last row (or None), exhausted
+    error = pyqtSignal(int, str)                # generation, message
+
+
+class LogLoaderWorker(QRunnable):
+    """
+    Loads one keyset page of attendance logs off the GUI thread.
+    Rows are converted with row_factory and emitted in batches as the cursor
+    delivers them. Every signal carries the generation the model requested, so
+    results of a worker made stale by a new filter are dropped; cancel() also stops
+    the cursor early.
+    """
+    def __init__(self, db, generation, query, sort_field, descending, after, limit,
+                 row_factory, key_factory, batch_size=50):
+        super().__init__()
+        self.db = db
+        self.generation = generation
+        self.query = query
+        self.sort_field = sort_field
+        self.descending = descending
+        self.after = after
+        self.limit = limit
+        self.row_factory = row_factory
+        self.key_factory = key_factory
+        self.batch_size = batch_size
+        self.signals = LogLoaderSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            cursor = self.db.logs_page_cursor(self.query, self.sort_field, self.descending,
+                                              self.after, self.limit, batch_size=self.batch_size)
+            rows, count, last = [], 0, None
+            with cursor:
+                for doc in cursor:
+                    if self._cancelled.is_set():
+                        return
+                    rows.append(self.row_factory(doc))
+                    count += 1
+                    last = doc
+                    if len(rows) >= self.batch_size:
+                        self.signals.batch.emit(self.generation, rows)
+                        rows = []
+
+            if self._cancelled.is_set():
+                return
+            if rows:
+                self.signals.batch.emit(self.generation, rows)
+            after = self.key_factory(last) if last is not None else self.after
+            self.signals.finished.emit(self.generation, after, count < self.limit)
+        except Exception as e:
+            trace = traceback.format_exc()
+            self.signals.error.emit(self.generation, f"{str(e)}\n{trace}")
@@ -1,8 +1,9 @@
 # desktop_app/threads/provisioning_thread.py
 from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+import random
 import time
 import traceback
-from typing import Optional
+from typing import Optional, Dict, Any
 
 from desktop_app.api.api_client import ApiClient
 from desktop_app.utils.device_info import (
@@ -24,27 +25,78 @@ class ProvisioningSignals(QObject):
 
 class ProvisioningThread(QRunnable):
     """
-    QRunnable that registers device and then polls device status endpoint and 
+    QRunnable that registers device and then long-polls the device status endpoint
+    (the server answers as soon as an admin acts, or after long_poll_timeout) and
     when status == 'active' it calls fetch-credential endpoint once. Uses basic requests.
     Emits signals.step to update UI messages, success on token, error on final failure.
+
+    Against servers without the long-poll endpoint it polls /status with If-None-Match,
+    backing off exponentially (poll_interval doubling up to max_poll_interval, with
+    jitter) while the status stays the same. Network/5xx errors back off the same way.
     """
     def __init__(
             self,
             api_client: ApiClient, 
             poll_interval: float = 5.0, 
-            max_attempts: Optional[int] = 120
+            max_attempts: Optional[int] = 120,
+            long_poll_timeout: float = 30.0,
+            max_poll_interval: float = 300.0
         ):
         super().__init__()
         self.signals = ProvisioningSignals()
         self.api = api_client
         self.poll_interval = poll_interval
         self.max_attempts = max_attempts
+        self.long_poll_timeout = long_poll_timeout
+        self.max_poll_interval = max_poll_interval
+        self._long_poll = True
+        self._idle_polls = 0
         self._stopped = False
         self.device_uuid = None
 
     def stop(self):
         self._stopped = True
 
+
+    def _backoff_delay(self) -> float:
+        """
+        Capped exponential backoff with "equal jitter": half the window is fixed,
+        the other half random, so hundreds of kiosks don't poll in lockstep.
+        """
+        ceiling = min(self.max_poll_interval, self.poll_interval * (2 ** min(self._idle_polls, 16)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+    def _sleep(self, seconds: float):
+        # sleep in short slices so stop() takes effect promptly
+        deadline = time.monotonic() + seconds
+        while not self._stopped and time.monotonic() < deadline:
+            time.sleep(min(0.5, deadline - time.monotonic()))
+
+
+    def _next_status(self, last_status: Optional[str], first: bool) -> Dict[str, Any]:
+        """
+        Long-poll when the server supports it; otherwise fall back to a conditional
+        status call preceded by a backoff sleep.
+        """
+        if self._long_poll:
+            try:
+                return self.api.wait_for_status(self.device_uuid, since=last_status,
+                                                wait=self.long_poll_timeout)
+            except RuntimeError as e:
+                if not str(e).startswith("HTTP 404") and not str(e).startswith("HTTP 405"):
+                    raise
+                self._long_poll = False
+        elif not first:
+            self._sleep(self._backoff_delay())
+        return self.api.get_status(device_uuid=self.device_uuid)
+
+
+    @staticmethod
+    def _is_transient(error: RuntimeError) -> bool:
+        message = str(error)
+        return message.startswith("Network error") or message.startswith("HTTP 5")
+
     
     def run(self):
         try:
@@ -77,13 +129,28 @@ class ProvisioningThread(QRunnable):
             # 2) POLLING LOOP
             # ----------------------------------------------------    
             attempts = 0
+            last_status = None
             self.signals.step.emit("Waiting for admin approval...")
 
             while not self._stopped and (self.max_attempts is None or attempts < self.max_attempts):
                 attempts += 1
 
-                status_resp = self.api.get_status(device_uuid=self.device_uuid)
+                try:
+                    status_resp = self._next_status(last_status, first=(attempts == 1))
+                except RuntimeError as e:
+                    if not self._is_transient(e):
+                        raise
+                    self._idle_polls += 1
+                    self.signals.step.emit(f"Server unreachable ({e}) - retrying...")
+                    self._sleep(self._backoff_delay())
+                    continue
+
                 status = (status_resp.get("status") or "").lower()
+                if status != last_status:
+                    self._idle_polls = 0
+                else:
+                    self._idle_polls += 1
+                last_status = status or None
 
                 # ------------------------------------------------
                 # ACTIVE → FETCH TOKEN
@@ -115,7 +182,6 @@ class ProvisioningThread(QRunnable):
                 elif status in ("pending", "unknown", ""):
                     self.signals.step.emit(f"Device status is {status} - Awaiting admin approval \
                                            - (attempt {attempts}) -- retrying...")
-                    time.sleep(self.poll_interval)
                     continue
                 
                 # ------------------------------------------------
@@ -139,7 +205,6 @@ class ProvisioningThread(QRunnable):
                 # ------------------------------------------------
                 else:
                     self.signals.step.emit(f"Waiting for approval... (attempt {attempts})")
-                    time.sleep(self.poll_interval)
                     continue
                 
             # TIMEOUT
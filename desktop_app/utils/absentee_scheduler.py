@@ -1,7 +1,7 @@
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from threads.absentee_marker import AbsenteeWorker
+from services.absentee_marking import mark_absentees
 from utils.logger_config import setup_scheduler_logger
 from database.mongo_db import MongoDB
 from database.postgres_db import PostgresDB
@@ -29,12 +29,15 @@ class SchedulerManager:
         self.logger.info("Scheduler started successfully and absentee job added.")
 
     def mark_absentees_daily(self):
-        """Automatically mark absentees."""
+        """Automatically mark absentees. Resumes today's checkpoint if an earlier run stopped partway."""
         try:
             self.logger.info(f"Running automatic absentee marking at {datetime.now()}")
-            service = AbsenteeWorker(self.postgres_db, self.mongo_db, marked_by="System")
-            service.run()
-            self.logger.info("Automatic absentee marking completed successfully.")
+            summary = mark_absentees(self.postgres_db, self.mongo_db, marked_by="System",
+                                     on_step=self.logger.info)
+            if summary["errors"]:
+                self.logger.error(f"Absentee marking stopped with errors; the next run resumes it: {summary}")
+            else:
+                self.logger.info(f"Automatic absentee marking completed successfully: {summary}")
             
         except Exception as e:
             self.logger.error(f"Error while marking absentee automatically: {e}", exc_info=True)
@@ -0,0 +1,87 @@
+# desktop_app/utils/gallery_codec.py
+"""
+Compact binary container for face-encoding galleries (GET /api/v1/gallery).
+
+Layout (little-endian):
+
+    b"SAG1" | uint32 header_len | header JSON (utf-8) | int32 ids[count] | dtype matrix[count, dim]
+
+Header keys: revision, base_revision (None for a full snapshot), count, dim, dtype
+("float32" or "float16"), removed (employee ids dropped since base_revision) and
+meta ([{employee_id, name, department}] in row order).
+
+Shared by the backend (encode) and the kiosk (decode) so both sides agree on the format.
+"""
+import json
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"SAG1"
+MEDIA_TYPE = "application/x-sa-gallery"
+ENCODING_DIM = 128
+DTYPES = {"float32": np.float32, "float16": np.float16}
+
+try:
+    import zstandard
+except ImportError:     # optional: without it galleries are served uncompressed
+    zstandard = None
+
+
+def encode_gallery(ids: List[int], matrix: np.ndarray, meta: List[Dict[str, Any]], revision: int,
+                   base_revision: Optional[int] = None, removed: Optional[List[int]] = None,
+                   dtype: str = "float32") -> bytes:
+    if dtype not in DTYPES:
+        raise ValueError(f"unsupported dtype {dtype}")
+    matrix = np.ascontiguousarray(matrix.reshape(len(ids), ENCODING_DIM), dtype=DTYPES[dtype])
+    header = json.dumps({
+        "revision": revision,
+        "base_revision": base_revision,
+        "count": len(ids),
+        "dim": ENCODING_DIM,
+        "dtype": dtype,
+        "removed": removed or [],
+        "meta": meta,
+    }, separators=(",", ":")).encode("utf-8")
+    return b"".join((
+        MAGIC,
+        struct.pack("<I", len(header)),
+        header,
+        np.asarray(ids, dtype="<i4").tobytes(),
+        matrix.astype(matrix.dtype.newbyteorder("<"), copy=False).tobytes(),
+    ))
+
+
+def decode_gallery(blob: bytes) -> Dict[str, Any]:
+    """
+    Returns the header dict plus "ids" (list[int]) and "encodings" (float32 ndarray [count, dim]).
+    """
+    if blob[:4] != MAGIC:
+        raise ValueError("not a gallery blob")
+    (header_len,) = struct.unpack_from("<I", blob, 4)
+    offset = 8 + header_len
+    header = json.loads(blob[8:offset].decode("utf-8"))
+
+    count, dim = header["count"], header["dim"]
+    ids = np.frombuffer(blob, dtype="<i4", count=count, offset=offset)
+    offset += ids.nbytes
+    matrix = np.frombuffer(blob, dtype=np.dtype(DTYPES[header["dtype"]]).newbyteorder("<"),
+                           count=count * dim, offset=offset)
+
+    header["ids"] = ids.tolist()
+    header["encodings"] = matrix.reshape(count, dim).astype(np.float32)
+    return header
+
+
+def compress(blob: bytes) -> Optional[bytes]:
+    """zstd-compress, or None if zstandard is not installed."""
+    if zstandard is None:
+        return None
+    return zstandard.ZstdCompressor(level=3).compress(blob)
+
+
+def decompress(blob: bytes) -> bytes:
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to read zstd galleries")
+    return zstandard.ZstdDecompressor().decompress(blob)
@@ -0,0 +1,54 @@
+# desktop_app/utils/log_format.py
+"""
+Display form of attendance log documents, shared by the logs table and exports.
+"""
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from desktop_app.utils.utils import get_ist_time_from_utc, get_ist_date_from_utc
+
+# (header label, flattened key), in display order
+COLUMNS = [
+    ("Employee ID", "employee_id"),
+    ("Name", "name"),
+    ("Department", "department"),
+    ("Date", "date"),
+    ("Status", "status"),
+    ("Timestamp", "timestamp"),
+    ("Remarks", "remarks"),
+    ("Marked By", "marked_by"),
+]
+
+Row = Tuple[str, ...]
+
+
+def flatten_log(log: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten nested MongoDB log document for display/export."""
+    employee = log.get("employee", {})
+    attendance = log.get("attendance", {})
+    timestamp = log.get("timestamp", "")
+
+    flattened = {
+        "employee_id": employee.get("id", ""),
+        "name": employee.get("name", ""),
+        "department": employee.get("department", ""),
+        "date": attendance.get("date", ""),
+        "status": attendance.get("status", ""),
+        "remarks": attendance.get("remarks", ""),
+        "marked_by": attendance.get("marked_by", ""),
+        "timestamp": timestamp
+    }
+
+    # Convert UTC -> IST for display
+    if isinstance(flattened["timestamp"], datetime):
+        flattened["timestamp"] = get_ist_time_from_utc(flattened["timestamp"])
+    if isinstance(flattened["date"], datetime):
+        flattened["date"] = get_ist_date_from_utc(flattened["date"])
+
+    return flattened
+
+
+def log_row(log: Dict[str, Any]) -> Row:
+    """A log document as display strings in COLUMNS order."""
+    flat = flatten_log(log)
+    return tuple("" if flat[key] is None else str(flat[key]) for _, key in COLUMNS)
@@ -61,6 +61,14 @@ def current_date_utc_midnight() -> datetime:
     midnight_utc = datetime.combine(now_utc.date(), time(0, 0, 0, tzinfo=timezone.utc))
     return midnight_utc
 
+def normalize_name(name: str | None) -> str | None:
+    """employee.name_lc in attendance logs: the lowercased name log search matches prefixes against."""
+    return name.strip().lower() if name else None
+
+def normalize_department(department: str | None) -> str | None:
+    """employee.department_lc in attendance logs: what dept: searches compare for equality."""
+    return department.strip().lower() if department else None
+
 def _ensure_utc_aware(dt: datetime) -> datetime:
     """Return tz-aware datetime in UTC. If dt is naive, treat it as UTC."""
     if dt is None: